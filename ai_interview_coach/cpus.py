@@ -0,0 +1,15 @@
+"""
+CPU count shared by gunicorn.conf.py and the benchmark commands
+
+Only imports the standard library, so gunicorn.conf.py can use it before the
+app is loaded.
+"""
+import os
+
+
+def cpu_count():
+    """CPUs this process may run on, which respects container CPU limits"""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
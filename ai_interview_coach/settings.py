@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import json
 import os
 from pathlib import Path
 from dotenv import load_dotenv
@@ -29,6 +30,36 @@ SECRET_KEY = os.getenv('SECRET_KEY', "django-insecure-^&p^nhr6zut)$cr^j%t$^6w415
 # OpenAI API Key
 OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
 
+# LLM providers (see core/providers.py). AI_PROVIDER_ORDER lists the ones to
+# use, most preferred first; unconfigured providers are skipped, and with none
+# left the app serves its built-in fallback content. 'logprobs' marks the
+# providers that accept the logprobs option the cascade routing policy asks for.
+AI_PROVIDERS = {
+    'openai': {
+        'type': 'openai',
+        'api_key': OPENAI_API_KEY,
+        'base_url': os.getenv('OPENAI_BASE_URL'),
+        'logprobs': os.getenv('OPENAI_LOGPROBS', 'True') == 'True',
+    },
+    # An OpenAI-compatible server on this host, e.g. llama.cpp's llama-server
+    'local': {
+        'type': 'openai',
+        'base_url': os.getenv('LOCAL_LLM_BASE_URL', 'http://127.0.0.1:8080/v1'),
+        'api_key': os.getenv('LOCAL_LLM_API_KEY'),
+        'model': os.getenv('LOCAL_LLM_MODEL'),
+        'timeout': float(os.getenv('LOCAL_LLM_TIMEOUT', '120')),
+        'logprobs': os.getenv('LOCAL_LLM_LOGPROBS', 'False') == 'True',
+    },
+    # Deterministic in-process responses for tests and benchmarks
+    'stub': {
+        'type': 'stub',
+        'latency': float(os.getenv('AI_STUB_LATENCY', '0')),
+    },
+}
+AI_PROVIDER_ORDER = [name.strip() for name in os.getenv('AI_PROVIDER_ORDER', 'openai').split(',') if name.strip()]
+# How long a failing provider is skipped before it is tried again
+AI_PROVIDER_RETRY_SECONDS = int(os.getenv('AI_PROVIDER_RETRY_SECONDS', '30'))
+
 # SECURITY WARNING: don't run with debug turned on in production!
 DEBUG = os.getenv('DEBUG', 'True') == 'True'
 
@@ -48,14 +79,16 @@ INSTALLED_APPS = [
     "django.contrib.staticfiles",
 
     #third party apps
-    #"rest_framework",
-    #"corsheaders",
+    "rest_framework",
+    "rest_framework.authtoken",
+    "corsheaders",
 
     #local apps
     "interview",
     "resume",
     "roadmap",
     "core",
+    "api",
 ]
 
 
@@ -63,6 +96,7 @@ MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
+    "corsheaders.middleware.CorsMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
@@ -95,11 +129,46 @@ WSGI_APPLICATION = "ai_interview_coach.wsgi.application"
 
 DATABASES = {
     "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
+        "ENGINE": os.getenv('DATABASE_ENGINE', "django.db.backends.sqlite3"),
+        "NAME": os.getenv('DATABASE_NAME', BASE_DIR / "db.sqlite3"),
+        "USER": os.getenv('DATABASE_USER', ''),
+        "PASSWORD": os.getenv('DATABASE_PASSWORD', ''),
+        "HOST": os.getenv('DATABASE_HOST', ''),
+        "PORT": os.getenv('DATABASE_PORT', ''),
+        "CONN_MAX_AGE": int(os.getenv('DATABASE_CONN_MAX_AGE', '0')),
+    }
+}
+
+# "multi" is for several nodes behind a load balancer without sticky
+# sessions, where sessions, cache and media must live in backends every node
+# shares. See the README's multi-node section.
+DEPLOYMENT_MODE = os.getenv('DEPLOYMENT_MODE', 'single')
+MULTI_NODE = DEPLOYMENT_MODE == 'multi'
+
+# Rate limits, token quota flags, prewarm budgets and prewarmed content live in
+# the cache. CACHE_URL (e.g. redis://localhost:6379/0) shares them between
+# gunicorn workers and nodes through Redis; without it each process keeps its
+# own local-memory cache, which suits a single-node setup. CACHE_BACKEND and
+# CACHE_LOCATION select any other backend.
+CACHE_URL = os.getenv('CACHE_URL')
+CACHES = {
+    "default": {
+        "BACKEND": os.getenv('CACHE_BACKEND', "django.core.cache.backends.redis.RedisCache" if CACHE_URL
+                             else "django.core.cache.backends.locmem.LocMemCache"),
+        "LOCATION": os.getenv('CACHE_LOCATION', CACHE_URL or ""),
     }
 }
 
+# Database-backed by default, so already shared; cached_db also keeps a copy in the shared cache
+SESSION_ENGINE = os.getenv('SESSION_ENGINE', 'django.contrib.sessions.backends.cached_db' if MULTI_NODE
+                           else 'django.contrib.sessions.backends.db')
+# Session data is compressed against a preset dictionary (see core/sessions.py);
+# rows written with Django's JSON serializer are still readable
+SESSION_SERIALIZER = 'core.sessions.CompressedJSONSerializer'
+# Expired sessions are deleted in the background at most this often (seconds, 0 disables)
+SESSION_GC_INTERVAL = int(os.getenv('SESSION_GC_INTERVAL', '3600'))
+SESSION_GC_BATCH_SIZE = int(os.getenv('SESSION_GC_BATCH_SIZE', '500'))
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -119,6 +188,27 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Password hashing (see core/hashers.py). New passwords use the policy's
+# hasher; hashes from the other hashers, or with other costs, still verify and
+# are upgraded at the user's next login. Compare policies with
+# `manage.py login_benchmark` before changing costs.
+PASSWORD_HASH_POLICIES = {
+    'argon2': 'core.hashers.TunedArgon2PasswordHasher',
+    'pbkdf2': 'core.hashers.TunedPBKDF2PasswordHasher',
+    'scrypt': 'django.contrib.auth.hashers.ScryptPasswordHasher',
+}
+PASSWORD_HASH_POLICY = os.getenv('PASSWORD_HASH_POLICY', 'argon2')
+PASSWORD_HASHERS = [PASSWORD_HASH_POLICIES[PASSWORD_HASH_POLICY]] + [
+    hasher for policy, hasher in PASSWORD_HASH_POLICIES.items() if policy != PASSWORD_HASH_POLICY
+] + ['django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher']
+# Argon2id costs: OWASP's minimum of 19 MiB, 2 passes, 1 lane. Every login in
+# flight holds ARGON2_MEMORY_COST KiB, so workers x threads bounds the peak.
+ARGON2_TIME_COST = int(os.getenv('ARGON2_TIME_COST', '2'))
+ARGON2_MEMORY_COST = int(os.getenv('ARGON2_MEMORY_COST', '19456'))
+ARGON2_PARALLELISM = int(os.getenv('ARGON2_PARALLELISM', '1'))
+# 0 keeps Django's default iteration count
+PBKDF2_ITERATIONS = int(os.getenv('PBKDF2_ITERATIONS', '0'))
+
 
 # Internationalization
 # https://docs.djangoproject.com/en/5.2/topics/i18n/
@@ -137,16 +227,66 @@ USE_TZ = True
 
 STATIC_URL = "/static/"
 STATICFILES_DIRS = [BASE_DIR / "static"]
-STATIC_ROOT = BASE_DIR / "staticfiles"
+STATIC_ROOT = os.getenv('STATIC_ROOT', BASE_DIR / "staticfiles")
 
-# Whitenoise configuration for static files
-STATICFILES_STORAGE = "whitenoise.storage.CompressedManifestStaticFilesStorage"
+STORAGES = {
+    # Uploaded resumes; on several nodes point MEDIA_ROOT at a shared volume
+    # or MEDIA_STORAGE_BACKEND at an object storage backend
+    "default": {
+        "BACKEND": os.getenv('MEDIA_STORAGE_BACKEND', "django.core.files.storage.FileSystemStorage"),
+    },
+    # Whitenoise configuration for static files
+    "staticfiles": {
+        "BACKEND": "whitenoise.storage.CompressedManifestStaticFilesStorage",
+    },
+}
 
-MEDIA_URL = "/media/"
-MEDIA_ROOT = BASE_DIR / "media"
+MEDIA_URL = os.getenv('MEDIA_URL', "/media/")
+MEDIA_ROOT = os.getenv('MEDIA_ROOT', BASE_DIR / "media")
 
 # CORS for local frontends (adjust in prod)
 CORS_ALLOW_ALL_ORIGINS = True
+CORS_URLS_REGEX = r"^/api/.*$"
+
+# JSON API (see api/)
+REST_FRAMEWORK = {
+    "DEFAULT_AUTHENTICATION_CLASSES": [
+        "rest_framework.authentication.TokenAuthentication",
+        "rest_framework.authentication.SessionAuthentication",
+    ],
+    "DEFAULT_PERMISSION_CLASSES": [
+        "rest_framework.permissions.IsAuthenticated",
+    ],
+    "DEFAULT_RENDERER_CLASSES": [
+        "rest_framework.renderers.JSONRenderer",
+    ],
+    "DEFAULT_PAGINATION_CLASS": "api.pagination.NewestFirstPagination",
+    "PAGE_SIZE": 20,
+}
+
+# Resumes per page on resume:home
+RESUMES_PER_PAGE = int(os.getenv('RESUMES_PER_PAGE', '12'))
+# Admin changelists of unfiltered tables at least this big show an estimated
+# row count from database statistics instead of COUNT(*) (see core/pagination.py)
+ESTIMATED_COUNT_THRESHOLD = int(os.getenv('ESTIMATED_COUNT_THRESHOLD', '100000'))
+
+# How many of a user's latest interview scores the dashboard trend shows
+# (kept on their ScoreSummary row, see interview/progress.py)
+SCORE_TREND_LENGTH = int(os.getenv('SCORE_TREND_LENGTH', '20'))
+
+# Weak-area recommendations (see interview/recommender.py): how many topics
+# become focus areas for new interviews and target skills for roadmaps the
+# user leaves blank, and how much each later interview fades a weakness
+RECOMMENDER_ENABLED = os.getenv('RECOMMENDER_ENABLED', 'True') == 'True'
+RECOMMENDED_TOPICS = int(os.getenv('RECOMMENDED_TOPICS', '3'))
+WEAKNESS_DECAY = float(os.getenv('WEAKNESS_DECAY', '0.85'))
+
+# Opt-in memory growth diagnostics for live workers (see core/memwatch.py):
+# SIGUSR2 to a gunicorn worker and staff-only /metrics/memory/
+MEMWATCH_ENABLED = os.getenv('MEMWATCH_ENABLED', 'False') == 'True'
+# Stack frames kept per traced allocation, and growth sites reported
+MEMWATCH_FRAMES = int(os.getenv('MEMWATCH_FRAMES', '5'))
+MEMWATCH_TOP = int(os.getenv('MEMWATCH_TOP', '15'))
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
@@ -157,3 +297,79 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 LOGIN_REDIRECT_URL = 'dashboard'
 LOGOUT_REDIRECT_URL = 'home'
 LOGIN_URL = 'login'
+
+# Prewarming of likely next question sets and roadmaps (see core/prewarm.py)
+PREWARM_ENABLED = os.getenv('PREWARM_ENABLED', 'True') == 'True'
+PREWARM_MAX_WORKERS = int(os.getenv('PREWARM_MAX_WORKERS', '2'))
+PREWARM_MAX_PENDING = int(os.getenv('PREWARM_MAX_PENDING', '8'))
+PREWARM_HOURLY_BUDGET = int(os.getenv('PREWARM_HOURLY_BUDGET', '200'))
+PREWARM_TIMEOUT = int(os.getenv('PREWARM_TIMEOUT', '3600'))
+
+# Downloadable reports (see core/reports.py), rendered by a thread pool per
+# process and stored under reports/ in the default storage
+REPORT_WORKERS = int(os.getenv('REPORT_WORKERS', '2'))
+# Seconds a queued report keeps other requests from queueing it again
+REPORT_RENDER_TIMEOUT = int(os.getenv('REPORT_RENDER_TIMEOUT', '300'))
+
+# Rate limits for AI endpoints (see core/ratelimit.py): (burst capacity, refill seconds)
+RATELIMIT_ENABLED = os.getenv('RATELIMIT_ENABLED', 'True') == 'True'
+RATELIMIT_TRUST_X_FORWARDED_FOR = os.getenv('RATELIMIT_TRUST_X_FORWARDED_FOR', 'False') == 'True'
+AI_RATE_LIMITS = {
+    'interview': {'user': (5, 300), 'ip': (30, 300)},
+    'evaluation': {'user': (5, 300), 'ip': (30, 300)},
+    'roadmap': {'user': (5, 300), 'ip': (30, 300)},
+}
+# Prompt + completion tokens each user may spend per day
+AI_DAILY_TOKEN_QUOTA = int(os.getenv('AI_DAILY_TOKEN_QUOTA', '50000'))
+
+# Model routing for AI tasks (see core/routing.py). Each task lists input-size
+# bands; the first band whose max_input_chars covers the prompt is used.
+AI_MODEL_ROUTES = {
+    'questions': [
+        {'max_input_chars': None, 'model': 'gpt-3.5-turbo', 'temperature': 0.7, 'max_tokens': 2000},
+    ],
+    'roadmap': [
+        {'max_input_chars': None, 'model': 'gpt-3.5-turbo', 'temperature': 0.7, 'max_tokens': 2500},
+    ],
+    # One module regenerated on its own (roadmap/services.py)
+    'roadmap_module': [
+        {'max_input_chars': None, 'model': 'gpt-3.5-turbo', 'temperature': 0.7, 'max_tokens': 700},
+    ],
+    'resume_feedback': [
+        {'max_input_chars': 12000, 'model': 'gpt-3.5-turbo', 'temperature': 0.7, 'max_tokens': 2000},
+        # Long resumes need a larger context window
+        {'max_input_chars': None, 'model': 'gpt-4o-mini', 'temperature': 0.7, 'max_tokens': 2000},
+    ],
+    'evaluation': [
+        {'max_input_chars': 12000, 'model': 'gpt-3.5-turbo', 'temperature': 0.7, 'max_tokens': 2500},
+        {'max_input_chars': None, 'model': 'gpt-4o-mini', 'temperature': 0.7, 'max_tokens': 3500},
+    ],
+    # Several question sets or roadmaps per completion (core/batching.py)
+    'questions_batch': [
+        {'max_input_chars': None, 'model': 'gpt-3.5-turbo', 'temperature': 0.7, 'max_tokens': 4000},
+    ],
+    'roadmap_batch': [
+        {'max_input_chars': None, 'model': 'gpt-3.5-turbo', 'temperature': 0.7, 'max_tokens': 4000},
+    ],
+    'roadmap_module_batch': [
+        {'max_input_chars': None, 'model': 'gpt-3.5-turbo', 'temperature': 0.7, 'max_tokens': 3000},
+    ],
+}
+# Requests packed into one batched completion; keep within the batch max_tokens
+AI_BATCH_SIZE = int(os.getenv('AI_BATCH_SIZE', '4'))
+# Per-environment overrides, e.g. AI_MODEL_OVERRIDES='{"evaluation": {"model": "gpt-4o"}}'
+AI_MODEL_OVERRIDES = json.loads(os.getenv('AI_MODEL_OVERRIDES', '{}'))
+# "single" uses the routed model; "cascade" tries AI_CASCADE's fast model first
+AI_ROUTING_POLICY = os.getenv('AI_ROUTING_POLICY', 'single')
+AI_CASCADE = {
+    'fast_model': os.getenv('AI_CASCADE_FAST_MODEL', 'gpt-4o-mini'),
+    'min_confidence': float(os.getenv('AI_CASCADE_MIN_CONFIDENCE', '0.6')),
+}
+# USD per 1K tokens (input, output), used by the routing benchmark
+AI_MODEL_PRICING = {
+    'gpt-3.5-turbo': (0.0005, 0.0015),
+    'gpt-4o-mini': (0.00015, 0.0006),
+    'gpt-4o': (0.0025, 0.01),
+}
+# Append every AI call to this JSONL file for `manage.py routing_benchmark`
+AI_WORKLOAD_RECORD_PATH = os.getenv('AI_WORKLOAD_RECORD_PATH')
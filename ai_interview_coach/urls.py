@@ -26,6 +26,7 @@ urlpatterns = [
     path('interview/', include('interview.urls')),
     path('resume/', include('resume.urls')),
     path('roadmap/', include('roadmap.urls')),
+    path('api/v1/', include('api.urls')),
     path('login/', auth_views.LoginView.as_view(template_name='login.html'), name='login'),
     path('logout/', auth_views.LogoutView.as_view(next_page='home'), name='logout'),
 ]
@@ -0,0 +1,12 @@
+from rest_framework.pagination import CursorPagination
+
+
+class NewestFirstPagination(CursorPagination):
+    """Cursor pagination keeps page fetches on the (user, -created_at) index however deep the client pages"""
+    ordering = "-created_at"
+    page_size_query_param = "page_size"
+    max_page_size = 100
+
+
+class NewestResumeFirstPagination(NewestFirstPagination):
+    ordering = "-uploaded_at"
@@ -0,0 +1,55 @@
+from rest_framework import serializers
+
+from interview.models import InterviewSession
+from interview.services import MAX_ANSWER_LENGTH
+from resume.models import Resume
+from roadmap.models import Roadmap
+
+INTERVIEW_TYPES = ["technical", "behavioral", "system-design", "mixed"]
+EXPERIENCE_LEVELS = ["entry", "mid", "senior"]
+
+
+class InterviewSessionSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = InterviewSession
+        fields = ["id", "role", "interview_type", "experience_level", "created_at", "updated_at", "completed_at"]
+
+
+class InterviewSessionDetailSerializer(InterviewSessionSerializer):
+    class Meta(InterviewSessionSerializer.Meta):
+        fields = InterviewSessionSerializer.Meta.fields + ["questions", "answers", "evaluation"]
+
+
+class InterviewStartSerializer(serializers.Serializer):
+    role = serializers.CharField(max_length=255)
+    interview_type = serializers.ChoiceField(choices=INTERVIEW_TYPES, default="mixed")
+    experience_level = serializers.ChoiceField(choices=EXPERIENCE_LEVELS, default="mid")
+
+
+class AnswersSerializer(serializers.Serializer):
+    answers = serializers.ListField(
+        child=serializers.CharField(allow_blank=True, max_length=MAX_ANSWER_LENGTH)
+    )
+
+
+class RoadmapSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Roadmap
+        fields = ["id", "job_role", "experience_years", "target_skills", "created_at", "updated_at"]
+
+
+class RoadmapDetailSerializer(RoadmapSerializer):
+    class Meta(RoadmapSerializer.Meta):
+        fields = RoadmapSerializer.Meta.fields + ["content", "completed_modules"]
+
+
+class RoadmapCreateSerializer(serializers.Serializer):
+    job_role = serializers.CharField(max_length=255)
+    experience_years = serializers.IntegerField(min_value=0, max_value=50, default=0)
+    target_skills = serializers.ListField(child=serializers.CharField(max_length=100), required=False, default=list)
+
+
+class ResumeSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Resume
+        fields = ["id", "title", "file", "uploaded_at"]
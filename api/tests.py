@@ -0,0 +1,110 @@
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from interview.models import InterviewSession
+
+
+def _interviews(user, count):
+    now = timezone.now()
+    interviews = []
+    for i in range(count):
+        interview = InterviewSession.objects.create(user=user, role=f"Role {i}", interview_type="mixed",
+                                                    experience_level="mid")
+        # Distinct creation times, oldest first
+        InterviewSession.objects.filter(pk=interview.pk).update(created_at=now - timedelta(minutes=count - i))
+        interviews.append(interview)
+    return interviews
+
+
+@override_settings(SESSION_GC_INTERVAL=0)
+class ConditionalGetTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("client")
+        self.client.force_login(self.user)
+        self.interview = _interviews(self.user, 1)[0]
+
+    def test_an_unchanged_list_returns_not_modified(self):
+        url = reverse("api:interview_list")
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        etag = response["ETag"]
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+
+        _interviews(self.user, 1)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(len(response.json()["results"]), 2)
+
+    def test_changing_a_row_changes_its_etag(self):
+        url = reverse("api:interview_detail", args=[self.interview.pk])
+        etag = self.client.get(url)["ETag"]
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        self.interview.answers = [{"question_index": 0, "answer": "Indexes"}]
+        self.interview.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["answers"][0]["answer"], "Indexes")
+
+    def test_other_users_rows_are_not_found(self):
+        self.client.force_login(User.objects.create_user("other"))
+        self.assertEqual(self.client.get(reverse("api:interview_detail", args=[self.interview.pk])).status_code, 404)
+        self.assertEqual(self.client.get(reverse("api:interview_list")).json()["results"], [])
+
+    def test_responses_are_compressed_for_clients_that_accept_gzip(self):
+        _interviews(self.user, 5)
+        response = self.client.get(reverse("api:interview_list"), HTTP_ACCEPT_ENCODING="gzip")
+        self.assertEqual(response["Content-Encoding"], "gzip")
+
+
+@override_settings(SESSION_GC_INTERVAL=0)
+class CursorPaginationTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("client")
+        self.client.force_login(self.user)
+        self.interviews = _interviews(self.user, 7)
+
+    def _page(self, url):
+        data = self.client.get(url).json()
+        return [row["id"] for row in data["results"]], data["next"]
+
+    def test_pages_return_every_row_once_newest_first(self):
+        ids, url = self._page(reverse("api:interview_list") + "?page_size=3")
+        self.assertEqual(len(ids), 3)
+        # Rows added while paging do not shift the later pages
+        _interviews(self.user, 1)
+        while url:
+            page, url = self._page(url)
+            ids += page
+        self.assertEqual(ids, [interview.pk for interview in reversed(self.interviews)])
+
+
+@override_settings(AI_PROVIDER_ORDER=["stub"], RATELIMIT_ENABLED=False, PREWARM_ENABLED=False, SESSION_GC_INTERVAL=0)
+class InterviewAnswersTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("client")
+        self.client.force_login(self.user)
+        self.interview = _interviews(self.user, 1)[0]
+        self.interview.questions = [{"question": "What is an index?", "key_points": ["B-tree"]}]
+        self.interview.save()
+
+    def test_answers_are_evaluated_once_and_served_from_the_evaluation_endpoint(self):
+        url = reverse("api:interview_evaluation", args=[self.interview.pk])
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+        answers_url = reverse("api:interview_answers", args=[self.interview.pk])
+        self.assertEqual(self.client.post(answers_url, {"answers": []}, content_type="application/json").status_code,
+                         400)
+        response = self.client.post(answers_url, {"answers": ["A B-tree"]}, content_type="application/json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.client.get(url).json(), response.json())
+        response = self.client.post(answers_url, {"answers": ["Again"]}, content_type="application/json")
+        self.assertEqual(response.status_code, 409)
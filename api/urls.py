@@ -0,0 +1,16 @@
+from django.urls import path
+from rest_framework.authtoken.views import obtain_auth_token
+from . import views
+
+app_name = "api"
+
+urlpatterns = [
+    path("auth/token/", obtain_auth_token, name="token"),
+    path("interviews/", views.InterviewList.as_view(), name="interview_list"),
+    path("interviews/<int:pk>/", views.InterviewDetail.as_view(), name="interview_detail"),
+    path("interviews/<int:pk>/answers/", views.InterviewAnswers.as_view(), name="interview_answers"),
+    path("interviews/<int:pk>/evaluation/", views.InterviewEvaluation.as_view(), name="interview_evaluation"),
+    path("roadmaps/", views.RoadmapList.as_view(), name="roadmap_list"),
+    path("roadmaps/<int:pk>/", views.RoadmapDetail.as_view(), name="roadmap_detail"),
+    path("resumes/", views.ResumeList.as_view(), name="resume_list"),
+]
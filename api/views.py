@@ -0,0 +1,201 @@
+"""
+Version 1 of the JSON API
+
+Every GET answers conditional requests: list ETags are built from the row count
+and newest updated_at of the user's rows (one aggregate query), detail ETags
+from the row's id and updated_at, so unchanged resources return 304 without
+serializing anything. Responses are gzip-compressed when the client accepts it.
+"""
+import hashlib
+from calendar import timegm
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.decorators import method_decorator
+from django.utils.http import http_date, quote_etag
+from django.views.decorators.gzip import gzip_page
+from rest_framework import status
+from rest_framework.generics import GenericAPIView
+from rest_framework.response import Response
+
+from core.ratelimit import charging, check_rate_limits
+from interview.models import InterviewSession
+from interview.services import finish_interview, start_interview
+from resume.models import Resume
+from roadmap.models import Roadmap
+from roadmap.services import update_roadmap
+from .pagination import NewestFirstPagination, NewestResumeFirstPagination
+from .serializers import (
+    AnswersSerializer,
+    InterviewSessionDetailSerializer,
+    InterviewSessionSerializer,
+    InterviewStartSerializer,
+    ResumeSerializer,
+    RoadmapCreateSerializer,
+    RoadmapDetailSerializer,
+    RoadmapSerializer,
+)
+
+
+def _etag(*parts):
+    return quote_etag(hashlib.md5(":".join(str(part) for part in parts).encode()).hexdigest())
+
+
+def conditional(request, etag, last_modified, build_response):
+    """
+    Return 304/412 when the client's validators match, otherwise build_response()
+
+    Args:
+        request: The API request
+        etag: Quoted ETag of the current representation
+        last_modified: datetime of the last change, or None
+        build_response: Callable producing the full response
+    """
+    last_modified = timegm(last_modified.utctimetuple()) if last_modified else None
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        response = build_response()
+    response["ETag"] = etag
+    if last_modified:
+        response["Last-Modified"] = http_date(last_modified)
+    # Let clients cache but always revalidate, which is cheap thanks to the ETag
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+@method_decorator(gzip_page, name="dispatch")
+class ConditionalListView(GenericAPIView):
+    """
+    Cursor-paginated list of the requesting user's rows
+
+    Subclasses set serializer_class and override get_queryset to filter by
+    the user, as with any DRF GenericAPIView.
+    """
+    pagination_class = NewestFirstPagination
+    updated_field = "updated_at"
+
+    def get(self, request):
+        queryset = self.filter_queryset(self.get_queryset())
+        state = queryset.aggregate(count=Count("id"), latest=Max(self.updated_field))
+        etag = _etag(request.get_full_path(), state["count"], state["latest"])
+
+        def build_response():
+            page = self.paginate_queryset(queryset)
+            return self.get_paginated_response(self.get_serializer(page, many=True).data)
+
+        return conditional(request, etag, state["latest"], build_response)
+
+
+@method_decorator(gzip_page, name="dispatch")
+class ConditionalDetailView(GenericAPIView):
+    """One of the requesting user's rows, looked up by pk in get_queryset()"""
+
+    def serialize(self, obj):
+        return self.get_serializer(obj).data
+
+    def get(self, request, pk):
+        obj = self.get_object()
+        return conditional(
+            request, _etag(obj.pk, obj.updated_at), obj.updated_at,
+            lambda: Response(self.serialize(obj)),
+        )
+
+
+class InterviewList(ConditionalListView):
+    """GET: the user's interviews. POST: start an interview and generate its questions"""
+    serializer_class = InterviewSessionSerializer
+
+    def get_queryset(self):
+        # Question and evaluation blobs are only needed on the detail endpoint
+        return InterviewSession.objects.filter(user=self.request.user).defer("questions", "answers", "evaluation")
+
+    def post(self, request):
+        serializer = InterviewStartSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        limited = check_rate_limits(request, "interview")
+        if limited is not None:
+            return limited
+        with charging(request.user):
+            interview = start_interview(request.user, **serializer.validated_data)
+        return Response(InterviewSessionDetailSerializer(interview).data, status=status.HTTP_201_CREATED)
+
+
+class InterviewDetail(ConditionalDetailView):
+    serializer_class = InterviewSessionDetailSerializer
+
+    def get_queryset(self):
+        return InterviewSession.objects.filter(user=self.request.user)
+
+
+class InterviewAnswers(InterviewDetail):
+    """POST all answers at once; the evaluation is returned and stored"""
+
+    def post(self, request, pk):
+        interview = self.get_object()
+        if interview.evaluation is not None:
+            return Response({"detail": "This interview has already been evaluated."}, status=status.HTTP_409_CONFLICT)
+
+        serializer = AnswersSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        answers = serializer.validated_data["answers"]
+        if len(answers) != len(interview.questions):
+            return Response(
+                {"answers": [f"Expected {len(interview.questions)} answers."]},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        limited = check_rate_limits(request, "evaluation")
+        if limited is not None:
+            return limited
+        with charging(request.user):
+            evaluation = finish_interview(
+                interview, [{"question_index": i, "answer": answer} for i, answer in enumerate(answers)]
+            )
+        return Response(evaluation)
+
+
+class InterviewEvaluation(ConditionalDetailView):
+    def get_queryset(self):
+        return InterviewSession.objects.filter(user=self.request.user, evaluation__isnull=False).only(
+            "id", "updated_at", "evaluation"
+        )
+
+    def serialize(self, interview):
+        return interview.evaluation
+
+
+class RoadmapList(ConditionalListView):
+    """GET: the user's roadmaps. POST: generate a roadmap, or update the one for that role"""
+    serializer_class = RoadmapSerializer
+
+    def get_queryset(self):
+        return Roadmap.objects.filter(user=self.request.user).defer("content")
+
+    def post(self, request):
+        serializer = RoadmapCreateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        limited = check_rate_limits(request, "roadmap")
+        if limited is not None:
+            return limited
+        with charging(request.user):
+            roadmap, created = update_roadmap(request.user, **serializer.validated_data)
+        return Response(RoadmapDetailSerializer(roadmap).data,
+                        status=status.HTTP_201_CREATED if created else status.HTTP_200_OK)
+
+
+class RoadmapDetail(ConditionalDetailView):
+    serializer_class = RoadmapDetailSerializer
+
+    def get_queryset(self):
+        return Roadmap.objects.filter(user=self.request.user)
+
+
+class ResumeList(ConditionalListView):
+    serializer_class = ResumeSerializer
+    pagination_class = NewestResumeFirstPagination
+    updated_field = "uploaded_at"
+
+    def get_queryset(self):
+        return Resume.objects.filter(owner=self.request.user)
@@ -1,4 +1,25 @@
 from django.contrib import admin
+from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
+from django.contrib.auth.models import User
+from .bulk import export_action
 from .models import Profile
+from .pagination import EstimatedCountPaginator
 
-admin.site.register(Profile)
+admin.site.unregister(User)
+
+@admin.register(User)
+class UserAdmin(BaseUserAdmin):
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    actions = [export_action("users", "csv"), export_action("users", "jsonl")]
+
+@admin.register(Profile)
+class ProfileAdmin(admin.ModelAdmin):
+    list_display = ("user", "job_role", "experience_years")
+    list_select_related = ("user",)
+    search_fields = ("user__username__exact",)
+    raw_id_fields = ("user",)
+    ordering = ("-id",)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    actions = [export_action("profiles", "csv"), export_action("profiles", "jsonl")]
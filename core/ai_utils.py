@@ -1,15 +1,21 @@
 """
 AI utilities for generating interview questions and roadmaps using OpenAI
 """
-import openai
-from django.conf import settings
 import json
 
-# Set OpenAI API key
-openai.api_key = settings.OPENAI_API_KEY
+from . import offline
+from .providers import ai_enabled
+from .routing import complete_json
 
 
-def generate_interview_questions(role, interview_type, experience_level, num_questions=5):
+def experience_level_for_years(experience_years):
+    """Map years of experience onto the entry/mid/senior levels used in prompts"""
+    experience_years = experience_years or 0
+    return "entry" if experience_years < 3 else "mid" if experience_years < 5 else "senior"
+
+
+def generate_interview_questions(role, interview_type, experience_level, num_questions=5, focus_areas=None,
+                                 attempts=None):
     """
     Generate interview questions based on user input using OpenAI
     
@@ -18,12 +24,14 @@ def generate_interview_questions(role, interview_type, experience_level, num_que
         interview_type: Type of interview (technical, behavioral, system-design, mixed)
         experience_level: Experience level (entry, mid, senior)
         num_questions: Number of questions to generate
+        focus_areas: Optional list of topics the candidate is weak in
+        attempts: Optional list that receives complete_json()'s attempts
         
     Returns:
         List of interview questions with expected answers
     """
-    if not openai.api_key:
-        return generate_fallback_questions(role, interview_type, experience_level)
+    if not ai_enabled():
+        return generate_fallback_questions(role, interview_type, experience_level, num_questions, focus_areas)
     
     prompt = f"""Generate {num_questions} {interview_type} interview questions for a {experience_level} level {role} position.
 
@@ -33,36 +41,24 @@ For each question, provide:
 3. A sample good answer structure
 
 Format the response as a JSON array with objects containing: question, key_points (array), sample_answer_structure"""
+    if focus_areas:
+        prompt += f"\n\nAt least half of the questions should probe these weaker areas: {', '.join(focus_areas)}."
 
     try:
-        response = openai.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                {"role": "system", "content": "You are an expert technical interviewer and career coach."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.7,
-            max_tokens=2000
+        questions_data = complete_json(
+            "questions",
+            "You are an expert technical interviewer and career coach.",
+            prompt,
+            attempts=attempts
         )
-        
-        content = response.choices[0].message.content
-        
-        # Try to extract JSON from markdown code blocks if present
-        if "```json" in content:
-            content = content.split("```json")[1].split("```")[0].strip()
-        elif "```" in content:
-            content = content.split("```")[1].split("```")[0].strip()
-        
-        # Try to parse JSON from the response
-        questions_data = json.loads(content)
         return questions_data
         
     except Exception as e:
         print(f"Error generating questions with OpenAI: {e}")
-        return generate_fallback_questions(role, interview_type, experience_level)
+        return generate_fallback_questions(role, interview_type, experience_level, num_questions, focus_areas)
 
 
-def generate_learning_roadmap(job_role, experience_years, target_skills=None):
+def generate_learning_roadmap(job_role, experience_years, target_skills=None, attempts=None):
     """
     Generate a personalized learning roadmap using OpenAI
     
@@ -70,15 +66,16 @@ def generate_learning_roadmap(job_role, experience_years, target_skills=None):
         job_role: Target job role
         experience_years: Years of experience
         target_skills: Optional list of skills to focus on
+        attempts: Optional list that receives complete_json()'s attempts
         
     Returns:
         List of learning modules with resources
     """
-    if not openai.api_key:
-        return generate_fallback_roadmap(job_role)
+    if not ai_enabled():
+        return generate_fallback_roadmap(job_role, experience_years, target_skills)
     
     skills_text = f" focusing on {', '.join(target_skills)}" if target_skills else ""
-    experience_level = "entry" if experience_years < 3 else "mid" if experience_years < 5 else "senior"
+    experience_level = experience_level_for_years(experience_years)
     
     prompt = f"""Create a comprehensive learning roadmap for a {experience_level} level professional 
 targeting a {job_role} position{skills_text}.
@@ -92,41 +89,101 @@ Provide a structured learning path with:
 
 Format as JSON array with objects: title, weeks, topics (array), resources (array), projects (array)
 Provide 5-7 modules."""
+    if target_skills:
+        prompt += f"\n\n{roadmap_skills_instruction(target_skills)}"
 
     try:
-        response = openai.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                {"role": "system", "content": "You are an expert career development coach and technical educator."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.7,
-            max_tokens=2500
+        roadmap_data = complete_json(
+            "roadmap",
+            "You are an expert career development coach and technical educator.",
+            prompt,
+            attempts=attempts
         )
+        return normalize_roadmap(roadmap_data)
         
-        content = response.choices[0].message.content
-        
-        # Try to extract JSON from markdown code blocks if present
-        if "```json" in content:
-            content = content.split("```json")[1].split("```")[0].strip()
-        elif "```" in content:
-            content = content.split("```")[1].split("```")[0].strip()
-        
-        roadmap_data = json.loads(content)
-        
-        # Ensure consistent format - wrap in modules key if it's a list
-        if isinstance(roadmap_data, list):
-            # Also normalize field names: weeks -> timeline
-            for module in roadmap_data:
-                if 'weeks' in module:
-                    module['timeline'] = f"{module.pop('weeks')} weeks"
-            roadmap_data = {"modules": roadmap_data}
+    except Exception as e:
+        print(f"Error generating roadmap with OpenAI: {e}")
+        return generate_fallback_roadmap(job_role, experience_years, target_skills)
+
+
+def generate_roadmap_module(job_role, experience_years, skill=None, module=None, attempts=None):
+    """
+    Generate a single roadmap module with a small targeted prompt
+    
+    Args:
+        job_role: Target job role
+        experience_years: Years of experience
+        skill: Skill the module is dedicated to, for a new skill module
+        module: Existing module to adapt to the experience level instead
+        attempts: Optional list that receives complete_json()'s attempts
         
-        return roadmap_data
+    Returns:
+        Module dictionary with title, timeline, topics, resources and projects
+    """
+    if not ai_enabled():
+        return generate_fallback_module(job_role, experience_years, skill, module)
+    
+    try:
+        module_data = complete_json(
+            "roadmap_module",
+            "You are an expert career development coach and technical educator.",
+            roadmap_module_prompt(job_role, experience_years, skill, module),
+            attempts=attempts
+        )
+        return normalize_module(module_data)
         
     except Exception as e:
-        print(f"Error generating roadmap with OpenAI: {e}")
-        return generate_fallback_roadmap(job_role)
+        print(f"Error generating roadmap module with OpenAI: {e}")
+        return generate_fallback_module(job_role, experience_years, skill, module)
+
+
+def roadmap_skills_instruction(target_skills):
+    """Asks for one module per target skill, shared by the single and batched roadmap prompts"""
+    # Lets roadmap/services.py find, replace or drop one skill's module later
+    return ("Dedicate one module to each of these skills and give it a \"skill\" field with the "
+            f"skill's exact name: {', '.join(target_skills)}. Other modules have \"skill\": null.")
+
+
+def roadmap_module_item(job_role, experience_years, skill=None, module=None):
+    """One-line description of a module request, shared by the single and batched prompts"""
+    experience_level = experience_level_for_years(experience_years)
+    if module is not None:
+        return (f"the learning roadmap module \"{module.get('title')}\" (topics: {', '.join(module.get('topics', []))}) "
+                f"rewritten for a {experience_level} level professional targeting a {job_role} position")
+    return f"one learning roadmap module on {skill} for a {experience_level} level professional targeting a {job_role} position"
+
+
+def roadmap_module_prompt(job_role, experience_years, skill=None, module=None):
+    """Prompt for generate_roadmap_module()"""
+    return f"""Write {roadmap_module_item(job_role, experience_years, skill, module)}.
+
+Provide:
+1. Module name/title
+2. Estimated weeks to complete
+3. Key topics to cover
+4. Recommended resources (online courses, books, practice platforms)
+5. Practice project ideas
+
+Format as a JSON object: title, weeks, topics (array), resources (array), projects (array)"""
+
+
+def normalize_module(module_data):
+    """Same field names as normalize_roadmap() gives each module"""
+    if isinstance(module_data, dict) and 'weeks' in module_data:
+        module_data['timeline'] = f"{module_data.pop('weeks')} weeks"
+    return module_data
+
+
+def normalize_roadmap(roadmap_data):
+    """Ensure consistent format - wrap in modules key if it's a list"""
+    if isinstance(roadmap_data, list):
+        # Also normalize field names: weeks -> timeline
+        for module in roadmap_data:
+            if 'weeks' in module:
+                module['timeline'] = f"{module.pop('weeks')} weeks"
+        roadmap_data = {"modules": roadmap_data}
+    
+    return roadmap_data
 
 
 def generate_resume_feedback(resume_text, target_role):
@@ -140,8 +197,8 @@ def generate_resume_feedback(resume_text, target_role):
     Returns:
         Dictionary with score, strengths, improvements, and suggestions
     """
-    if not openai.api_key:
-        return generate_fallback_resume_feedback()
+    if not ai_enabled():
+        return generate_fallback_resume_feedback(resume_text, target_role)
     
     prompt = f"""Analyze this resume for a {target_role} position:
 
@@ -157,26 +214,12 @@ Provide:
 Format as JSON: {{"score": number, "strengths": [], "improvements": [], "suggestions": [], "missing_keywords": []}}"""
 
     try:
-        response = openai.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                {"role": "system", "content": "You are an expert resume reviewer and career advisor."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.7,
-            max_tokens=2000
+        feedback_data = complete_json(
+            "resume_feedback",
+            "You are an expert resume reviewer and career advisor.",
+            prompt
         )
         
-        content = response.choices[0].message.content
-        
-        # Try to extract JSON from markdown code blocks if present
-        if "```json" in content:
-            content = content.split("```json")[1].split("```")[0].strip()
-        elif "```" in content:
-            content = content.split("```")[1].split("```")[0].strip()
-        
-        feedback_data = json.loads(content)
-        
         # Normalize field names: score -> overall_score
         if 'score' in feedback_data:
             feedback_data['overall_score'] = feedback_data.pop('score')
@@ -185,92 +228,28 @@ Format as JSON: {{"score": number, "strengths": [], "improvements": [], "suggest
         
     except Exception as e:
         print(f"Error generating resume feedback with OpenAI: {e}")
-        return generate_fallback_resume_feedback()
-
-
-# Fallback functions when OpenAI is not available
-def generate_fallback_questions(role, interview_type, experience_level):
-    """Generate basic questions when OpenAI is unavailable"""
-    questions = [
-        {
-            "question": f"Tell me about your experience with {role} responsibilities.",
-            "key_points": ["Relevant experience", "Specific examples", "Impact and results"],
-            "sample_answer_structure": "Start with your most relevant experience, provide specific examples, and highlight measurable outcomes."
-        },
-        {
-            "question": "Describe a challenging project you worked on. How did you overcome obstacles?",
-            "key_points": ["Problem-solving skills", "Teamwork", "Results achieved"],
-            "sample_answer_structure": "Use the STAR method: Situation, Task, Action, Result."
-        },
-        {
-            "question": f"What technologies or tools are you most proficient in for {role}?",
-            "key_points": ["Technical depth", "Practical experience", "Continuous learning"],
-            "sample_answer_structure": "List your strongest skills with examples of how you've used them."
-        },
-        {
-            "question": "Where do you see yourself in 3-5 years in your career?",
-            "key_points": ["Career goals", "Alignment with role", "Growth mindset"],
-            "sample_answer_structure": "Discuss your career aspirations and how this role fits your path."
-        },
-        {
-            "question": f"What interests you most about this {role} position?",
-            "key_points": ["Research on company", "Genuine interest", "Value alignment"],
-            "sample_answer_structure": "Show you've researched the company and explain why you're excited."
-        }
-    ]
-    return questions
-
-
-def generate_fallback_roadmap(job_role):
-    """Generate basic roadmap when OpenAI is unavailable"""
-    return {
-        "modules": [
-            {
-                "title": "Fundamentals & Core Concepts",
-                "timeline": "4 weeks",
-                "topics": ["Basic principles", "Essential theory", "Industry standards"],
-                "resources": ["Online tutorials", "Documentation", "Beginner courses"],
-                "projects": ["Build a basic portfolio project"]
-            },
-            {
-                "title": "Advanced Skills Development",
-                "timeline": "6 weeks",
-                "topics": ["Advanced techniques", "Best practices", "Design patterns"],
-                "resources": ["Advanced courses", "Books", "Technical blogs"],
-                "projects": ["Intermediate complexity project"]
-            },
-            {
-                "title": "Practical Application",
-                "timeline": "8 weeks",
-                "topics": ["Real-world scenarios", "Problem-solving", "Optimization"],
-                "resources": ["Practice platforms", "Code challenges", "Open source"],
-                "projects": ["Contribute to open source or build capstone project"]
-            }
-        ]
-    }
-
-
-def generate_fallback_resume_feedback():
-    """Generate basic feedback when OpenAI is unavailable"""
-    return {
-        "overall_score": 70,
-        "strengths": [
-            "Resume structure is clear",
-            "Contact information is provided",
-            "Experience section is present"
-        ],
-        "improvements": [
-            "Add more quantifiable achievements",
-            "Include relevant keywords",
-            "Tailor resume to specific role"
-        ],
-        "suggestions": [
-            "Use action verbs to start bullet points",
-            "Keep resume to 1-2 pages",
-            "Proofread for errors"
-        ],
-        "missing_keywords": ["Add role-specific technical skills"]
-    }
+        return generate_fallback_resume_feedback(resume_text, target_role)
+
+
+# Fallback functions when OpenAI is not available (see core/offline.py)
+def generate_fallback_questions(role, interview_type, experience_level, num_questions=5, focus_areas=None):
+    """Generate role- and level-specific questions from the offline dataset"""
+    return offline.questions(role, interview_type, experience_level, num_questions, focus_areas)
+
+
+def generate_fallback_roadmap(job_role, experience_years=0, target_skills=None):
+    """Generate a roadmap for the role's family and level from the offline dataset"""
+    return offline.roadmap(job_role, experience_level_for_years(experience_years), target_skills)
+
+
+def generate_fallback_module(job_role, experience_years=0, skill=None, module=None):
+    """Generate a skill module, or adapt a module to the level, from the offline dataset"""
+    return offline.roadmap_module(job_role, experience_level_for_years(experience_years), skill, module)
+
+
+def generate_fallback_resume_feedback(resume_text="", target_role=""):
+    """Review the resume with the offline heuristics"""
+    return offline.resume_feedback(resume_text, target_role)
 
 
 def evaluate_interview_answers(questions, answers, role, interview_type):
@@ -286,10 +265,6 @@ def evaluate_interview_answers(questions, answers, role, interview_type):
     Returns:
         Dictionary with overall score, question-wise feedback, and tips
     """
-    if not openai.api_key:
-        return generate_fallback_evaluation(len(answers))
-    
-    # Prepare the evaluation prompt
     qa_pairs = []
     for i, answer_data in enumerate(answers):
         q_index = answer_data['question_index']
@@ -299,6 +274,9 @@ def evaluate_interview_answers(questions, answers, role, interview_type):
                 'expected_points': questions[q_index]['key_points'],
                 'user_answer': answer_data['answer']
             })
+
+    if not ai_enabled():
+        return generate_fallback_evaluation(qa_pairs, interview_type)
     
     prompt = f"""Evaluate these interview answers for a {role} ({interview_type} interview):
 
@@ -325,60 +303,18 @@ Format as JSON: {{
 }}"""
 
     try:
-        response = openai.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                {"role": "system", "content": "You are an expert interview coach providing constructive feedback."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.7,
-            max_tokens=2500
+        evaluation_data = complete_json(
+            "evaluation",
+            "You are an expert interview coach providing constructive feedback.",
+            prompt
         )
-        
-        content = response.choices[0].message.content
-        
-        # Try to extract JSON from markdown code blocks if present
-        if "```json" in content:
-            content = content.split("```json")[1].split("```")[0].strip()
-        elif "```" in content:
-            content = content.split("```")[1].split("```")[0].strip()
-        
-        evaluation_data = json.loads(content)
         return evaluation_data
         
     except Exception as e:
         print(f"Error evaluating answers with OpenAI: {e}")
-        return generate_fallback_evaluation(len(answers))
-
-
-def generate_fallback_evaluation(num_questions):
-    """Generate basic evaluation when OpenAI is unavailable"""
-    question_feedback = []
-    for i in range(num_questions):
-        question_feedback.append({
-            "score": 7,
-            "good_points": ["You provided a response", "Clear communication"],
-            "improvements": ["Add more specific examples", "Include measurable outcomes"],
-            "tips": ["Use the STAR method", "Be more concise"]
-        })
-    
-    return {
-        "overall_score": 7.0,
-        "overall_feedback": {
-            "strengths": [
-                "You completed all questions",
-                "Demonstrated effort in your responses"
-            ],
-            "improvements": [
-                "Provide more specific examples",
-                "Include quantifiable achievements",
-                "Structure answers more clearly"
-            ],
-            "tips": [
-                "Practice the STAR method (Situation, Task, Action, Result)",
-                "Prepare specific examples before the interview",
-                "Keep answers concise (2-3 minutes)"
-            ]
-        },
-        "question_feedback": question_feedback
-    }
+        return generate_fallback_evaluation(qa_pairs, interview_type)
+
+
+def generate_fallback_evaluation(qa_pairs, interview_type=None):
+    """Score the answers with the offline heuristics"""
+    return offline.evaluate(qa_pairs, interview_type)
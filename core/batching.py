@@ -0,0 +1,180 @@
+"""
+Batched generation: several question sets or roadmaps in one completion
+
+Bulk jobs (warming content for many roles, a cohort starting interviews for
+many combinations) would otherwise pay one round trip and one copy of the
+system prompt and instructions per combination. generate_batch packs up to
+batch_size requests into a single prompt that asks for one JSON object keyed by
+request id, splits the answer back per key, and retries only the keys whose
+part was missing or failed the schema check.
+"""
+from django.conf import settings
+
+from . import ai_utils
+from .providers import ai_enabled
+from .routing import VALIDATORS, complete_json
+
+
+def _questions_item(request):
+    return (
+        f"{request.get('num_questions', 5)} {request['interview_type']} interview questions "
+        f"for a {request['experience_level']} level {request['role']} position"
+    )
+
+
+def _roadmap_item(request):
+    experience_level = ai_utils.experience_level_for_years(request.get("experience_years", 0))
+    skills = request.get("target_skills")
+    if not skills:
+        return f"a learning roadmap for a {experience_level} level professional targeting a {request['job_role']} position"
+    return (
+        f"a learning roadmap for a {experience_level} level professional targeting a {request['job_role']} position "
+        f"focusing on {', '.join(skills)}. {ai_utils.roadmap_skills_instruction(skills)}"
+    )
+
+
+BATCH_TASKS = {
+    "questions": {
+        "system": "You are an expert technical interviewer and career coach.",
+        "item": _questions_item,
+        "instructions": """For each question, provide:
+1. The question text
+2. Key points the interviewer is looking for
+3. A sample good answer structure""",
+        "result_shape": "a JSON array of objects containing: question, key_points (array), sample_answer_structure",
+        "normalize": lambda data: data,
+        "single": lambda r, attempts: ai_utils.generate_interview_questions(
+            r["role"], r["interview_type"], r["experience_level"], r.get("num_questions", 5), attempts=attempts
+        ),
+        "fallback": lambda r: ai_utils.generate_fallback_questions(
+            r["role"], r["interview_type"], r["experience_level"], r.get("num_questions", 5)
+        ),
+    },
+    "roadmap": {
+        "system": "You are an expert career development coach and technical educator.",
+        "item": _roadmap_item,
+        "instructions": """Each roadmap is a structured learning path of 5-7 modules with:
+1. Module name/title
+2. Estimated weeks to complete
+3. Key topics to cover
+4. Recommended resources (online courses, books, practice platforms)
+5. Practice project ideas""",
+        "result_shape": "a JSON array of objects: title, weeks, topics (array), resources (array), projects (array)",
+        "normalize": ai_utils.normalize_roadmap,
+        "single": lambda r, attempts: ai_utils.generate_learning_roadmap(
+            r["job_role"], r.get("experience_years", 0), r.get("target_skills") or None, attempts=attempts
+        ),
+        "fallback": lambda r: ai_utils.generate_fallback_roadmap(
+            r["job_role"], r.get("experience_years", 0), r.get("target_skills") or None
+        ),
+    },
+    "roadmap_module": {
+        "system": "You are an expert career development coach and technical educator.",
+        "item": lambda r: ai_utils.roadmap_module_item(
+            r["job_role"], r.get("experience_years", 0), r.get("skill"), r.get("module")
+        ),
+        "instructions": """Each module has:
+1. Module name/title
+2. Estimated weeks to complete
+3. Key topics to cover
+4. Recommended resources (online courses, books, practice platforms)
+5. Practice project ideas""",
+        "result_shape": "a JSON object: title, weeks, topics (array), resources (array), projects (array)",
+        "normalize": ai_utils.normalize_module,
+        "single": lambda r, attempts: ai_utils.generate_roadmap_module(
+            r["job_role"], r.get("experience_years", 0), r.get("skill"), r.get("module"), attempts=attempts
+        ),
+        "fallback": lambda r: ai_utils.generate_fallback_module(
+            r["job_role"], r.get("experience_years", 0), r.get("skill"), r.get("module")
+        ),
+    },
+}
+
+
+def build_batch_prompt(task, keyed_requests):
+    """
+    Build one prompt covering several requests
+
+    Args:
+        task: Key of BATCH_TASKS
+        keyed_requests: List of (key, request) pairs
+
+    Returns:
+        The prompt text
+    """
+    spec = BATCH_TASKS[task]
+    items = "\n".join(f"{key}: {spec['item'](request)}" for key, request in keyed_requests)
+    keys = ", ".join(f'"{key}"' for key, _ in keyed_requests)
+    return f"""Complete each of the following {len(keyed_requests)} requests independently.
+
+{items}
+
+{spec['instructions']}
+
+Respond with a single JSON object with exactly the keys {keys}. The value for each key is {spec['result_shape']}."""
+
+
+def generate_batch(task, requests, batch_size=None, max_retries=1, stats=None):
+    """
+    Generate results for many requests, batch_size per completion
+
+    Args:
+        task: "questions" (requests take role, interview_type, experience_level,
+            num_questions), "roadmap" (job_role, experience_years, target_skills)
+            or "roadmap_module" (job_role, experience_years, and skill for a new
+            module or module for one to adapt)
+        requests: List of request dictionaries
+        batch_size: Requests per completion, default settings.AI_BATCH_SIZE
+        max_retries: Batched retries for keys that failed before falling back
+            to one call per key
+        stats: Optional dictionary that receives counts of batched completions,
+            single-request fallback calls, and the tokens of both
+
+    Returns:
+        List of results in the same order as requests
+    """
+    spec = BATCH_TASKS[task]
+    batch_size = batch_size or settings.AI_BATCH_SIZE
+    stats = {} if stats is None else stats
+    for counter in ("completions", "tokens", "single_calls"):
+        stats.setdefault(counter, 0)
+
+    if not ai_enabled():
+        return [spec["fallback"](request) for request in requests]
+
+    results = {}
+    pending = [(f"r{i}", request) for i, request in enumerate(requests)]
+    for _ in range(1 + max_retries):
+        failed = []
+        for start in range(0, len(pending), batch_size):
+            chunk = pending[start:start + batch_size]
+            attempts = []
+            try:
+                data = complete_json(
+                    f"{task}_batch", spec["system"], build_batch_prompt(task, chunk), attempts=attempts
+                )
+            except Exception as e:
+                print(f"Error generating {task} batch: {e}")
+                data = {}
+            finally:
+                stats["completions"] += len(attempts)
+                stats["tokens"] += sum(a["prompt_tokens"] + a["completion_tokens"] for a in attempts)
+
+            for key, request in chunk:
+                value = data.get(key)
+                if value is not None and VALIDATORS[task](value):
+                    results[key] = spec["normalize"](value)
+                else:
+                    failed.append((key, request))
+        pending = failed
+        if not pending:
+            break
+
+    # Whatever still failed gets a regular single-request generation
+    for key, request in pending:
+        attempts = []
+        results[key] = spec["single"](request, attempts)
+        stats["single_calls"] += 1
+        stats["tokens"] += sum(a["prompt_tokens"] + a["completion_tokens"] for a in attempts)
+
+    return [results[f"r{i}"] for i in range(len(requests))]
@@ -0,0 +1,298 @@
+"""
+Streaming export and import of users, profiles and resume metadata
+
+Exports read rows with QuerySet.iterator(chunk_size) and yield one CSV or
+JSONL line at a time, so a command can write them to a file and an admin
+action can hand them to a StreamingHttpResponse without holding the export in
+memory. Imports read one row at a time and write batches with
+bulk_create/bulk_update, matching users by username, profiles by their user
+and resumes by owner and file name, so importing the same file twice updates
+rows instead of duplicating them. Resume files themselves are not copied.
+"""
+import csv
+import json
+from datetime import date, datetime
+
+from django.contrib import admin
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.http import StreamingHttpResponse
+from django.utils.dateparse import parse_datetime
+
+from resume.models import Resume
+from .models import Profile
+
+FORMATS = ("csv", "jsonl")
+
+# Column name -> field lookup used when exporting
+DATASETS = {
+    "users": {
+        "model": User,
+        "columns": {
+            "username": "username",
+            "email": "email",
+            "first_name": "first_name",
+            "last_name": "last_name",
+            "is_active": "is_active",
+            "is_staff": "is_staff",
+            "date_joined": "date_joined",
+        },
+    },
+    "profiles": {
+        "model": Profile,
+        "columns": {
+            "username": "user__username",
+            "job_role": "job_role",
+            "experience_years": "experience_years",
+            "daily_token_quota": "daily_token_quota",
+            "resume": "resume",
+        },
+    },
+    "resumes": {
+        "model": Resume,
+        "columns": {
+            "owner": "owner__username",
+            "title": "title",
+            "file": "file",
+            "uploaded_at": "uploaded_at",
+        },
+    },
+}
+
+
+# Fields an import may change on existing rows
+USER_FIELDS = ["email", "first_name", "last_name", "is_active", "is_staff", "date_joined", "password"]
+PROFILE_FIELDS = ["job_role", "experience_years", "daily_token_quota", "resume"]
+RESUME_FIELDS = ["title", "uploaded_at"]
+
+
+class _Echo:
+    """File-like object whose write returns the line, for csv.writer in a generator"""
+
+    def write(self, value):
+        return value
+
+
+def _plain(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def export_lines(dataset, fmt, queryset=None, chunk_size=2000, include_password_hashes=False):
+    """
+    Yield a dataset as CSV (with a header line) or JSONL, one line at a time
+
+    Args:
+        dataset: "users", "profiles" or "resumes"
+        fmt: "csv" or "jsonl"
+        queryset: Rows to export, default all of them
+        chunk_size: Rows fetched from the database at a time
+        include_password_hashes: Add a password column to users, so imported
+            users can keep logging in with their current passwords
+
+    Yields:
+        Lines of text, each ending with a newline
+    """
+    spec = DATASETS[dataset]
+    columns = dict(spec["columns"])
+    if include_password_hashes and dataset == "users":
+        columns["password"] = "password"
+    if queryset is None:
+        queryset = spec["model"].objects.all()
+    rows = queryset.order_by("pk").values_list(*columns.values()).iterator(chunk_size=chunk_size)
+
+    if fmt == "csv":
+        writer = csv.writer(_Echo(), lineterminator="\n")
+        yield writer.writerow(columns)
+        for row in rows:
+            yield writer.writerow(["" if value is None else _plain(value) for value in row])
+    else:
+        for row in rows:
+            yield json.dumps(dict(zip(columns, map(_plain, row)))) + "\n"
+
+
+def read_rows(file, fmt):
+    """Yield dictionaries from an open CSV or JSONL file"""
+    if fmt == "csv":
+        yield from csv.DictReader(file)
+    else:
+        for line in file:
+            if line.strip():
+                yield json.loads(line)
+
+
+def _bool(value, default):
+    if value in (None, ""):
+        return default
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in ("1", "true", "yes")
+
+
+def _int(value, default=None):
+    return default if value in (None, "") else int(value)
+
+
+def _datetime(value):
+    return parse_datetime(value) if value else None
+
+
+def _assign(obj, values):
+    """Set field values on obj and report whether any of them changed"""
+    changed = False
+    for field, value in values.items():
+        if getattr(obj, field) != value:
+            setattr(obj, field, value)
+            changed = True
+    return changed
+
+
+def _user_ids(usernames):
+    return dict(User.objects.filter(username__in=usernames).values_list("username", "pk"))
+
+
+def _import_users(rows, counts):
+    rows = {row["username"]: row for row in rows}
+    existing = {user.username: user for user in User.objects.filter(username__in=rows)}
+    created, updated = [], []
+    for username, row in rows.items():
+        user = existing.get(username) or User(username=username)
+        values = {
+            "email": row.get("email") or "",
+            "first_name": row.get("first_name") or "",
+            "last_name": row.get("last_name") or "",
+            "is_active": _bool(row.get("is_active"), True),
+            "is_staff": _bool(row.get("is_staff"), False),
+            "date_joined": _datetime(row.get("date_joined")) or user.date_joined,
+        }
+        if row.get("password"):
+            values["password"] = row["password"]
+        elif user.pk is None:
+            user.set_unusable_password()
+        changed = _assign(user, values)
+        if user.pk is None:
+            created.append(user)
+        elif changed:
+            updated.append(user)
+        else:
+            counts["unchanged"] += 1
+    User.objects.bulk_create(created)
+    User.objects.bulk_update(updated, USER_FIELDS)
+    counts["created"] += len(created)
+    counts["updated"] += len(updated)
+
+
+def _import_profiles(rows, counts):
+    user_ids = _user_ids({row["username"] for row in rows})
+    existing = {p.user_id: p for p in Profile.objects.filter(user_id__in=user_ids.values())}
+    created, updated = {}, {}
+    for row in rows:
+        user_id = user_ids.get(row["username"])
+        if user_id is None:
+            counts["skipped"] += 1
+            continue
+        profile = existing.get(user_id) or created.get(user_id) or Profile(user_id=user_id)
+        changed = _assign(profile, {
+            "job_role": row.get("job_role") or "",
+            "experience_years": _int(row.get("experience_years"), 0),
+            "daily_token_quota": _int(row.get("daily_token_quota")),
+            "resume": row.get("resume") or "",
+        })
+        if profile.pk is None:
+            created[user_id] = profile
+        elif changed:
+            updated[user_id] = profile
+        else:
+            counts["unchanged"] += 1
+    Profile.objects.bulk_create(created.values())
+    Profile.objects.bulk_update(updated.values(), PROFILE_FIELDS)
+    counts["created"] += len(created)
+    counts["updated"] += len(updated)
+
+
+def _import_resumes(rows, counts):
+    user_ids = _user_ids({row["owner"] for row in rows})
+    existing = {
+        (r.owner_id, r.file.name): r
+        for r in Resume.objects.filter(owner_id__in=user_ids.values(), file__in={row["file"] for row in rows})
+    }
+    created, updated = {}, {}
+    for row in rows:
+        owner_id = user_ids.get(row["owner"])
+        if owner_id is None or not row.get("file"):
+            counts["skipped"] += 1
+            continue
+        key = (owner_id, row["file"])
+        resume = existing.get(key) or created.get(key) or Resume(owner_id=owner_id, file=row["file"])
+        changed = _assign(resume, {
+            "title": row.get("title") or "",
+            "uploaded_at": _datetime(row.get("uploaded_at")) or resume.uploaded_at,
+        })
+        if resume.pk is None:
+            created[key] = resume
+        elif changed:
+            updated[key] = resume
+        else:
+            counts["unchanged"] += 1
+
+    # bulk_create stamps uploaded_at with the current time (auto_now_add);
+    # put the exported timestamps back afterwards
+    uploaded_at = {key: resume.uploaded_at for key, resume in created.items()}
+    Resume.objects.bulk_create(created.values())
+    restamped = []
+    for key, resume in created.items():
+        if uploaded_at[key] is not None:
+            resume.uploaded_at = uploaded_at[key]
+            restamped.append(resume)
+    Resume.objects.bulk_update(restamped + list(updated.values()), RESUME_FIELDS)
+    counts["created"] += len(created)
+    counts["updated"] += len(updated)
+
+
+IMPORTERS = {
+    "users": _import_users,
+    "profiles": _import_profiles,
+    "resumes": _import_resumes,
+}
+
+
+def import_rows(dataset, rows, batch_size=1000):
+    """
+    Create or update a dataset from an iterable of row dictionaries, a batch at a time
+
+    Args:
+        dataset: "users", "profiles" or "resumes"
+        rows: Iterable of dictionaries keyed by the export column names
+        batch_size: Rows written per transaction
+
+    Returns:
+        Dictionary with created, updated, unchanged and skipped (unknown
+        user) counts
+    """
+    counts = {"created": 0, "updated": 0, "unchanged": 0, "skipped": 0}
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            with transaction.atomic():
+                IMPORTERS[dataset](batch, counts)
+            batch = []
+    if batch:
+        with transaction.atomic():
+            IMPORTERS[dataset](batch, counts)
+    return counts
+
+
+def export_action(dataset, fmt):
+    """Admin action that streams the selected rows as a CSV or JSONL download"""
+    content_types = {"csv": "text/csv", "jsonl": "application/x-ndjson"}
+
+    @admin.action(description=f"Export selected {dataset} as {fmt.upper()}", permissions=["view"])
+    def export(modeladmin, request, queryset):
+        response = StreamingHttpResponse(export_lines(dataset, fmt, queryset), content_type=content_types[fmt])
+        response["Content-Disposition"] = f'attachment; filename="{dataset}.{fmt}"'
+        return response
+
+    export.__name__ = f"export_{dataset}_{fmt}"
+    return export
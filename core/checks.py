@@ -0,0 +1,80 @@
+"""
+System checks for state that must be shared between processes and nodes
+
+Each warning names per-process or per-node state that would break when
+consecutive requests from one user land on different gunicorn workers or,
+with DEPLOYMENT_MODE=multi, on different nodes.
+"""
+import os
+from pathlib import Path
+
+from django.conf import settings
+from django.core.checks import Warning, register
+
+NODE_LOCAL_CACHES = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+# Caches whose incr is a separate get and set rather than one atomic operation
+NON_ATOMIC_INCR_CACHES = (
+    "django.core.cache.backends.db.DatabaseCache",
+    "django.core.cache.backends.filebased.FileBasedCache",
+)
+
+
+# Local-memory is the default cache, so this only runs with check --deploy
+@register("deployment", deploy=True)
+def check_worker_cache(app_configs, **kwargs):
+    if settings.MULTI_NODE or settings.CACHES["default"]["BACKEND"] not in NODE_LOCAL_CACHES:
+        return []
+    # gunicorn.conf.py starts one worker per CPU plus one unless WEB_CONCURRENCY says otherwise
+    if os.getenv("WEB_CONCURRENCY", "") == "1":
+        return []
+    return [Warning(
+        "The default cache is local to each process, but gunicorn runs several workers.",
+        hint="Rate limits, token quotas, the prewarm budget and prewarmed content are counted and "
+             "stored per worker; set CACHE_URL to a Redis server, or set WEB_CONCURRENCY=1.",
+        id="core.W004",
+    )]
+
+
+@register("deployment")
+def check_ratelimit_cache(app_configs, **kwargs):
+    if not settings.RATELIMIT_ENABLED or settings.CACHES["default"]["BACKEND"] not in NON_ATOMIC_INCR_CACHES:
+        return []
+    return [Warning(
+        "Rate limiting is enabled, but the default cache has no atomic increment.",
+        hint="Concurrent requests can take more tokens than a limit allows (see core/ratelimit.py); "
+             "use the local-memory cache on a single process or a Redis cache.",
+        id="core.W005",
+    )]
+
+
+@register("deployment")
+def check_multi_node(app_configs, **kwargs):
+    if not settings.MULTI_NODE:
+        return []
+
+    errors = []
+    if settings.CACHES["default"]["BACKEND"] in NODE_LOCAL_CACHES:
+        errors.append(Warning(
+            "The default cache is local to each process.",
+            hint="Rate limits, token quota flags and prewarmed content would not be shared; "
+                 "set CACHE_URL to a Redis server every node uses.",
+            id="core.W001",
+        ))
+    if settings.SESSION_ENGINE == "django.contrib.sessions.backends.file":
+        errors.append(Warning(
+            "Sessions are stored in files on each node.",
+            hint="Use the db or cached_db SESSION_ENGINE so an interview can continue on any node.",
+            id="core.W002",
+        ))
+    media_storage = settings.STORAGES["default"]["BACKEND"]
+    if media_storage == "django.core.files.storage.FileSystemStorage" and \
+            Path(settings.MEDIA_ROOT).resolve().is_relative_to(Path(settings.BASE_DIR).resolve()):
+        errors.append(Warning(
+            "Uploaded media is stored inside the project directory on each node.",
+            hint="Point MEDIA_ROOT at a shared volume or MEDIA_STORAGE_BACKEND at object storage.",
+            id="core.W003",
+        ))
+    return errors
@@ -0,0 +1,26 @@
+"""
+Password hashers whose costs come from settings
+
+settings.PASSWORD_HASH_POLICY picks the hasher used for new passwords. The
+others stay listed in PASSWORD_HASHERS so existing hashes still verify, and
+Django rehashes a password with the current policy and costs the next time
+its owner logs in. `manage.py login_benchmark` measures each policy.
+"""
+from django.conf import settings
+from django.contrib.auth.hashers import Argon2PasswordHasher, PBKDF2PasswordHasher
+
+
+class TunedArgon2PasswordHasher(Argon2PasswordHasher):
+    """Argon2id with time, memory (KiB) and parallelism from settings.ARGON2_*"""
+
+    def __init__(self):
+        self.time_cost = settings.ARGON2_TIME_COST
+        self.memory_cost = settings.ARGON2_MEMORY_COST
+        self.parallelism = settings.ARGON2_PARALLELISM
+
+
+class TunedPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """PBKDF2-SHA256 with settings.PBKDF2_ITERATIONS (0 keeps Django's default)"""
+
+    def __init__(self):
+        self.iterations = settings.PBKDF2_ITERATIONS or PBKDF2PasswordHasher.iterations
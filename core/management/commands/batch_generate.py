@@ -0,0 +1,71 @@
+"""
+Generate question sets or roadmaps for many combinations from a CSV file
+
+    python manage.py batch_generate combos.csv --task questions --output questions.jsonl
+
+Question CSVs need role, interview_type and experience_level columns (and
+optionally num_questions); roadmap CSVs need job_role and experience_years
+(and optionally target_skills, separated by semicolons).
+"""
+import csv
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.batching import generate_batch
+
+REQUIRED_COLUMNS = {
+    "questions": {"role", "interview_type", "experience_level"},
+    "roadmap": {"job_role", "experience_years"},
+}
+
+
+def _parse_row(task, row):
+    if task == "questions":
+        request = {key: row[key].strip() for key in REQUIRED_COLUMNS[task]}
+        if row.get("num_questions"):
+            request["num_questions"] = int(row["num_questions"])
+        return request
+    return {
+        "job_role": row["job_role"].strip(),
+        "experience_years": int(row["experience_years"] or 0),
+        "target_skills": [s.strip() for s in (row.get("target_skills") or "").split(";") if s.strip()],
+    }
+
+
+class Command(BaseCommand):
+    help = "Generate content for many combinations with batched completions and report throughput"
+
+    def add_arguments(self, parser):
+        parser.add_argument("csv_file")
+        parser.add_argument("--task", choices=sorted(REQUIRED_COLUMNS), default="questions")
+        parser.add_argument("--batch-size", type=int, default=None)
+        parser.add_argument("--output", help="Write one JSON line per combination to this file")
+
+    def handle(self, *args, **options):
+        task = options["task"]
+        with open(options["csv_file"], newline="", encoding="utf-8") as f:
+            reader = csv.DictReader(f)
+            missing = REQUIRED_COLUMNS[task] - set(reader.fieldnames or [])
+            if missing:
+                raise CommandError(f"Missing columns: {', '.join(sorted(missing))}")
+            requests = [_parse_row(task, row) for row in reader]
+        if not requests:
+            raise CommandError("No combinations in the CSV file")
+
+        stats = {}
+        started = time.perf_counter()
+        results = generate_batch(task, requests, batch_size=options["batch_size"], stats=stats)
+        elapsed = time.perf_counter() - started
+
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as f:
+                for request, result in zip(requests, results):
+                    f.write(json.dumps({"request": request, "result": result}) + "\n")
+
+        self.stdout.write(
+            f"{len(requests)} {task} items in {elapsed:.2f}s ({len(requests) / elapsed:.2f} items/s), "
+            f"{stats['completions']} batched completions, {stats['single_calls']} single-request fallbacks, "
+            f"{stats['tokens'] / len(requests):.0f} tokens/item"
+        )
@@ -0,0 +1,83 @@
+"""
+Rows per second and peak memory of export_data/import_data at several sizes
+
+    python manage.py bulk_benchmark --rows 1000 100000
+
+For each size, generates users, profiles and resumes files, imports them into
+a throwaway SQLite database (creating rows), imports them again (updating
+rows) and exports them, each step in its own process. Peak RSS should stay
+about the same however many rows there are.
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+def _write_files(directory, rows, fmt):
+    generators = {
+        "users": lambda i: {"username": f"user{i}", "email": f"user{i}@example.com", "is_active": True},
+        "profiles": lambda i: {"username": f"user{i}", "job_role": "Backend Engineer", "experience_years": i % 15},
+        "resumes": lambda i: {"owner": f"user{i}", "title": f"Resume {i}", "file": f"resumes/user{i}.pdf",
+                              "uploaded_at": "2024-01-01T00:00:00+00:00"},
+    }
+    paths = {}
+    for dataset, make in generators.items():
+        path = directory / f"{dataset}.{fmt}"
+        with open(path, "w", encoding="utf-8") as f:
+            if fmt == "csv":
+                f.write(",".join(make(0)) + "\n")
+            for i in range(rows):
+                row = make(i)
+                f.write(json.dumps(row) + "\n" if fmt == "jsonl" else ",".join(str(v) for v in row.values()) + "\n")
+        paths[dataset] = path
+    return paths
+
+
+class Command(BaseCommand):
+    help = "Benchmark streaming export and import throughput and memory"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, nargs="+", default=[1000, 100000])
+        parser.add_argument("--format", choices=("csv", "jsonl"), default="csv")
+
+    def handle(self, *args, **options):
+        manage = [sys.executable, str(Path(settings.BASE_DIR) / "manage.py")]
+        self.stdout.write(f"{'rows':>8}  {'step':<24}{'seconds':>9}{'rows/s':>10}{'peak RSS MB':>13}")
+        for rows in options["rows"]:
+            with tempfile.TemporaryDirectory(prefix="bulk-") as tmp:
+                tmp = Path(tmp)
+                # DEBUG would keep every (large) bulk query in memory
+                env = dict(os.environ, DATABASE_NAME=str(tmp / "db.sqlite3"), DEBUG="False")
+                subprocess.run(manage + ["migrate", "--noinput"], env=env, check=True, capture_output=True)
+                paths = _write_files(tmp, rows, options["format"])
+
+                steps = []
+                for dataset in ("users", "profiles", "resumes"):
+                    steps.append((f"import {dataset}", ["import_data", dataset, str(paths[dataset])]))
+                for dataset in ("users", "profiles", "resumes"):
+                    steps.append((f"re-import {dataset}", ["import_data", dataset, str(paths[dataset])]))
+                for dataset in ("users", "profiles", "resumes"):
+                    steps.append((f"export {dataset}", ["export_data", dataset,
+                                                        "--output", str(tmp / f"out-{dataset}.{options['format']}")]))
+
+                for name, command in steps:
+                    seconds, peak_mb = self.run_step(manage + command, env)
+                    self.stdout.write(f"{rows:>8}  {name:<24}{seconds:>9.2f}{rows / seconds:>10.0f}{peak_mb:>13.1f}")
+
+    def run_step(self, command, env):
+        started = time.perf_counter()
+        process = subprocess.Popen(command, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        # wait4 reports the peak RSS of this child alone (in KB on Linux)
+        _, status, usage = os.wait4(process.pid, 0)
+        seconds = time.perf_counter() - started
+        if os.waitstatus_to_exitcode(status) != 0:
+            raise CommandError(f"{' '.join(command[2:])} failed:\n{process.stderr.read().decode()[-2000:]}")
+        process.returncode = os.waitstatus_to_exitcode(status)
+        return seconds, usage.ru_maxrss / 1024
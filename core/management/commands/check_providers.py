@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.providers import check_health, get_providers
+
+
+class Command(BaseCommand):
+    help = "Probe every configured LLM provider and report which ones are up"
+
+    def handle(self, *args, **options):
+        if not get_providers():
+            raise CommandError("No AI provider is configured; the app is serving fallback content")
+
+        results = check_health()
+        for name, error in results.items():
+            if error is None:
+                self.stdout.write(self.style.SUCCESS(f"{name}: up"))
+            else:
+                self.stdout.write(self.style.ERROR(f"{name}: down ({error})"))
+        if all(error is not None for error in results.values()):
+            raise CommandError("Every provider is down")
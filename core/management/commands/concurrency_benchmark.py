@@ -0,0 +1,174 @@
+"""
+Compare gunicorn worker classes on LLM-bound traffic: concurrent users per GB of RAM
+
+    python manage.py concurrency_benchmark --latency 2 --users 8 32 128
+    python manage.py concurrency_benchmark --worker-class gthread gevent --workers 2
+
+Starts a fake OpenAI server (core/management/fake_openai.py) that answers every
+chat completion after --latency seconds, then for each worker class runs
+gunicorn (with gunicorn.conf.py, on a throwaway database) pointed at it as the
+"local" provider. Each level of concurrent users keeps starting interviews
+through the JSON API for --duration seconds. A level counts as served if
+nothing failed and the 95th percentile stays within --slo seconds of the
+injected latency; the largest served level is divided by the memory (PSS, or
+RSS without smaps) of the master and its workers.
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from ..fake_openai import fake_openai_env, start_fake_openai
+from .startup_benchmark import _child_pids, _free_port, _pss_kb, _rss_kb
+
+WORKER_CLASSES = ("sync", "gthread", "gevent")
+
+
+def _memory_mb(pid):
+    total_kb = 0
+    for p in [pid] + _child_pids(pid):
+        total_kb += _pss_kb(p) or _rss_kb(p) or 0
+    return total_kb / 1024
+
+
+class Command(BaseCommand):
+    help = "Measure concurrent users served per GB of RAM for sync, gthread and gevent workers"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--worker-class", nargs="+", choices=WORKER_CLASSES, default=list(WORKER_CLASSES))
+        parser.add_argument("--workers", type=int, default=2)
+        parser.add_argument("--users", type=int, nargs="+", default=[4, 16, 64])
+        parser.add_argument("--latency", type=float, default=2.0, help="Seconds the fake OpenAI server takes per completion")
+        parser.add_argument("--duration", type=float, default=10.0, help="Seconds of load per level")
+        parser.add_argument("--slo", type=float, default=1.0, help="Allowed p95 latency above the injected latency")
+
+    def handle(self, *args, **options):
+        fake = start_fake_openai(options["latency"])
+
+        with tempfile.TemporaryDirectory(prefix="concurrency-") as tmp:
+            env = dict(
+                os.environ,
+                DATABASE_NAME=str(Path(tmp) / "db.sqlite3"),
+                DEBUG="False",
+                PREWARM_ENABLED="False",
+                RATELIMIT_ENABLED="False",
+                WEB_CONCURRENCY=str(options["workers"]),
+                **fake_openai_env(fake, ["questions"]),
+            )
+            token = self.create_user(env)
+
+            results = []
+            for worker_class in options["worker_class"]:
+                results.append(self.run_worker_class(worker_class, env, token, options))
+        fake.shutdown()
+
+        self.stdout.write("")
+        self.stdout.write(f"{'worker class':<14}{'users served':>14}{'memory MB':>12}{'users/GB':>10}")
+        for worker_class, served, memory in results:
+            per_gb = served / (memory / 1024) if memory else 0
+            self.stdout.write(f"{worker_class:<14}{served:>14}{memory:>12.0f}{per_gb:>10.0f}")
+
+    def create_user(self, env):
+        manage = [sys.executable, str(Path(settings.BASE_DIR) / "manage.py")]
+        subprocess.run(manage + ["migrate", "--noinput"], env=env, check=True, capture_output=True)
+        subprocess.run(
+            manage + ["createsuperuser", "--noinput", "--username", "benchmark", "--email", "benchmark@example.com"],
+            env=dict(env, DJANGO_SUPERUSER_PASSWORD="benchmark-password"), check=True, capture_output=True,
+        )
+        output = subprocess.run(
+            manage + ["drf_create_token", "benchmark"], env=env, check=True, capture_output=True, text=True,
+        ).stdout
+        return output.split()[2]
+
+    def run_worker_class(self, worker_class, env, token, options):
+        if worker_class == "gevent":
+            try:
+                import gevent  # noqa: F401
+            except ImportError:
+                self.stdout.write(self.style.WARNING("gevent is not installed, skipping"))
+                return worker_class, 0, 0
+
+        port = _free_port()
+        server = subprocess.Popen(
+            [sys.executable, "-m", "gunicorn", "-c", str(Path(settings.BASE_DIR) / "gunicorn.conf.py"),
+             "--bind", f"127.0.0.1:{port}", "ai_interview_coach.wsgi:application"],
+            cwd=settings.BASE_DIR, env=dict(env, GUNICORN_WORKER_CLASS=worker_class),
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        served, memory = 0, 0
+        try:
+            self.wait_for(server, port)
+            self.stdout.write(self.style.MIGRATE_HEADING(f"{worker_class} ({options['workers']} workers)"))
+            # Keep up some load for a while first, so every worker has imported
+            # the OpenAI SDK before anything is measured
+            self.run_level(port, token, options["workers"] * 4, options["latency"] * 3)
+            for users in options["users"]:
+                latencies, errors = self.run_level(port, token, users, options["duration"])
+                level_memory = _memory_mb(server.pid)
+                p95 = statistics.quantiles(latencies, n=20)[-1] if len(latencies) >= 2 else float("inf")
+                ok = not errors and p95 <= options["latency"] + options["slo"]
+                self.stdout.write(
+                    f"  {users:>4} users: {len(latencies) / options['duration']:6.1f} req/s, "
+                    f"p95 {p95:6.2f}s, {errors} errors, {level_memory:.0f} MB"
+                    f"{'' if ok else '  (over SLO)'}"
+                )
+                if not ok:
+                    break
+                served, memory = users, level_memory
+        finally:
+            server.terminate()
+            server.wait(timeout=30)
+        return worker_class, served, memory
+
+    def wait_for(self, server, port, timeout=60):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if server.poll() is not None:
+                raise CommandError("gunicorn exited early")
+            try:
+                urllib.request.urlopen(f"http://127.0.0.1:{port}/api/v1/", timeout=2).close()
+                return
+            except urllib.error.HTTPError:
+                # Any status means Django answered
+                return
+            except OSError:
+                time.sleep(0.2)
+        raise CommandError(f"gunicorn did not start within {timeout}s")
+
+    def run_level(self, port, token, users, duration):
+        body = json.dumps({"role": "Backend Engineer", "interview_type": "technical", "experience_level": "mid"}).encode()
+        latencies, errors = [], []
+        deadline = time.monotonic() + duration
+
+        def user():
+            while True:
+                request = urllib.request.Request(
+                    f"http://127.0.0.1:{port}/api/v1/interviews/", data=body,
+                    headers={"Authorization": f"Token {token}", "Content-Type": "application/json"},
+                )
+                started = time.monotonic()
+                try:
+                    with urllib.request.urlopen(request, timeout=120) as response:
+                        response.read()
+                    latencies.append(time.monotonic() - started)
+                except OSError as e:
+                    errors.append(e)
+                if time.monotonic() >= deadline:
+                    return
+
+        threads = [threading.Thread(target=user) for _ in range(users)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return latencies, len(errors)
@@ -0,0 +1,39 @@
+"""
+Create or update users, profiles or resume metadata from CSV or JSONL
+
+    python manage.py import_data users users.csv
+    python manage.py import_data profiles profiles.jsonl --batch-size 2000
+
+Import users before their profiles and resumes; rows for unknown usernames
+are skipped. Users without a password column get an unusable password.
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.bulk import DATASETS, FORMATS, import_rows, read_rows
+
+
+class Command(BaseCommand):
+    help = "Import users, profiles or resume metadata in batches"
+
+    def add_arguments(self, parser):
+        parser.add_argument("dataset", choices=sorted(DATASETS))
+        parser.add_argument("path")
+        parser.add_argument("--format", choices=FORMATS, help="Default: from the file extension")
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        fmt = options["format"] or ("jsonl" if options["path"].endswith(".jsonl") else "csv")
+
+        started = time.perf_counter()
+        with open(options["path"], encoding="utf-8", newline="") as f:
+            counts = import_rows(options["dataset"], read_rows(f, fmt), options["batch_size"])
+        elapsed = time.perf_counter() - started
+
+        rows = sum(counts.values())
+        self.stdout.write(
+            f"{counts['created']} created, {counts['updated']} updated, {counts['unchanged']} unchanged, "
+            f"{counts['skipped']} skipped "
+            f"in {elapsed:.2f}s ({rows / max(elapsed, 1e-9):.0f} rows/s)"
+        )
@@ -0,0 +1,90 @@
+"""
+Compare password hash policies: logins per second per core and memory per login
+
+    python manage.py login_benchmark
+    python manage.py login_benchmark --policy argon2 pbkdf2 --burst 200 --target-ms 50
+
+Verifying the password is nearly all of a login's CPU time, so each policy's
+hasher (with the costs from settings) verifies one password repeatedly for
+--duration seconds. Throughput is counted per CPU-second, which makes it a
+per-core figure even for hashers that use several threads. --burst shows how
+long this machine's cores need to log in that many users at once, and
+--target-ms suggests costs that make one verification take about that long.
+"""
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils.module_loading import import_string
+
+from ai_interview_coach.cpus import cpu_count
+
+PASSWORD = "correct horse battery staple"
+
+
+def _memory_kib(hasher):
+    """Memory one verification holds, for the memory-hard hashers"""
+    if hasattr(hasher, "memory_cost"):
+        return hasher.memory_cost
+    if hasattr(hasher, "work_factor"):
+        # Lanes run one after another in hashlib, so they don't add up
+        return 128 * hasher.work_factor * hasher.block_size // 1024
+    return 0
+
+
+class Command(BaseCommand):
+    help = "Report logins per second per core for each password hash policy"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--policy", nargs="+", choices=sorted(settings.PASSWORD_HASH_POLICIES),
+                            default=list(settings.PASSWORD_HASH_POLICIES))
+        parser.add_argument("--duration", type=float, default=3.0, help="Seconds of verification per policy")
+        parser.add_argument("--burst", type=int, default=200, help="Simultaneous logins to estimate the wait for")
+        parser.add_argument("--target-ms", type=float, help="Suggest costs for this verification time")
+
+    def handle(self, *args, **options):
+        cpus = cpu_count()
+        self.stdout.write(f"{cpus} CPU(s); current policy: {settings.PASSWORD_HASH_POLICY}")
+        burst_header = f"{options['burst']} logins"
+        self.stdout.write(f"{'policy':<8}{'costs':<28}{'ms/login':>9}{'logins/s/core':>15}"
+                          f"{'MiB/login':>11}{burst_header:>13}")
+
+        for policy in options["policy"]:
+            hasher = import_string(settings.PASSWORD_HASH_POLICIES[policy])()
+            encoded = hasher.encode(PASSWORD, hasher.salt())
+
+            count = 0
+            cpu_started = time.process_time()
+            deadline = time.perf_counter() + options["duration"]
+            while time.perf_counter() < deadline:
+                if not hasher.verify(PASSWORD, encoded):
+                    raise AssertionError(f"{policy} failed to verify its own hash")
+                count += 1
+            cpu_seconds = time.process_time() - cpu_started
+
+            per_core = count / cpu_seconds
+            ms = 1000 / per_core
+            burst_seconds = options["burst"] / (per_core * cpus)
+            self.stdout.write(
+                f"{policy:<8}{self.describe_costs(hasher):<28}{ms:>9.1f}{per_core:>15.1f}"
+                f"{_memory_kib(hasher) / 1024:>11.1f}{burst_seconds:>12.1f}s"
+            )
+            if options["target_ms"]:
+                self.suggest(policy, hasher, ms, options["target_ms"])
+
+    def describe_costs(self, hasher):
+        if hasattr(hasher, "memory_cost"):
+            return f"t={hasher.time_cost} m={hasher.memory_cost}KiB p={hasher.parallelism}"
+        if hasattr(hasher, "work_factor"):
+            return f"n={hasher.work_factor} r={hasher.block_size} p={hasher.parallelism}"
+        return f"iterations={hasher.iterations}"
+
+    def suggest(self, policy, hasher, ms, target_ms):
+        # Cost grows linearly with memory (argon2) and iterations (pbkdf2)
+        scale = target_ms / ms
+        if policy == "argon2":
+            memory = max(19456, int(hasher.memory_cost * scale) // 1024 * 1024)
+            self.stdout.write(f"         for ~{target_ms:.0f} ms: ARGON2_MEMORY_COST={memory} "
+                              f"(keeping ARGON2_TIME_COST={hasher.time_cost})")
+        elif policy == "pbkdf2":
+            self.stdout.write(f"         for ~{target_ms:.0f} ms: PBKDF2_ITERATIONS={int(hasher.iterations * scale)}")
@@ -0,0 +1,221 @@
+"""
+Run the app as several nodes sharing backends and walk a user across them
+
+    python manage.py multinode_check --nodes 2 --cache file
+
+Starts --nodes development servers with DEPLOYMENT_MODE=multi against one
+temporary SQLite database, a shared file-based or database cache and a shared
+media directory, then sends every request of a user's journey to the next node
+in turn: register, start an interview, answer, complete, upload a resume and
+download it, and keep starting interviews until the shared rate limit answers
+429. Any step that depends on node-local state fails the check.
+"""
+import http.cookiejar
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+import uuid
+from itertools import cycle
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+CACHE_BACKENDS = {
+    "file": "django.core.cache.backends.filebased.FileBasedCache",
+    "db": "django.core.cache.backends.db.DatabaseCache",
+}
+
+
+class _NoRedirect(urllib.request.HTTPRedirectHandler):
+    # Redirects are followed by the check itself, on the next node
+    def redirect_request(self, *args, **kwargs):
+        return None
+
+
+class Client:
+    """Cookie-keeping HTTP client that sends each request to the next node"""
+
+    def __init__(self, base_urls):
+        self.cookies = http.cookiejar.CookieJar()
+        self.opener = urllib.request.build_opener(
+            urllib.request.HTTPCookieProcessor(self.cookies), _NoRedirect
+        )
+        self.nodes = cycle(base_urls)
+        self.last_node = None
+
+    def request(self, path, data=None, files=None):
+        self.last_node = next(self.nodes)
+        headers = {"Referer": self.last_node}
+        body = None
+        if data is not None:
+            data = dict(data, csrfmiddlewaretoken=self.csrf_token())
+            if files:
+                body, content_type = _multipart(data, files)
+            else:
+                body, content_type = urllib.parse.urlencode(data, doseq=True).encode(), "application/x-www-form-urlencoded"
+            headers["Content-Type"] = content_type
+        request = urllib.request.Request(self.last_node + path, data=body, headers=headers)
+        try:
+            with self.opener.open(request, timeout=30) as response:
+                return response.status, response.headers, response.read()
+        except urllib.error.HTTPError as e:
+            return e.code, e.headers, e.read()
+
+    def csrf_token(self):
+        return next((c.value for c in self.cookies if c.name == "csrftoken"), "")
+
+
+def _multipart(data, files):
+    boundary = uuid.uuid4().hex
+    parts = []
+    for name, value in data.items():
+        parts.append(f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode())
+    for name, (filename, content) in files.items():
+        parts.append(
+            f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"; filename="{filename}"\r\n'
+            f"Content-Type: application/octet-stream\r\n\r\n".encode() + content + b"\r\n"
+        )
+    parts.append(f"--{boundary}--\r\n".encode())
+    return b"".join(parts), f"multipart/form-data; boundary={boundary}"
+
+
+class Command(BaseCommand):
+    help = "Start several nodes on shared backends and check that a user's session works across them"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--nodes", type=int, default=2)
+        parser.add_argument("--cache", choices=sorted(CACHE_BACKENDS), default="file")
+        parser.add_argument("--port", type=int, default=8101, help="Port of the first node")
+
+    def handle(self, *args, **options):
+        if options["nodes"] < 2:
+            raise CommandError("Use at least two nodes")
+
+        with tempfile.TemporaryDirectory(prefix="multinode-") as shared:
+            env = self.node_env(Path(shared), options["cache"])
+            manage = [sys.executable, str(Path(settings.BASE_DIR) / "manage.py")]
+            for command in (["migrate", "--noinput"], ["createcachetable"]):
+                subprocess.run(manage + command, env=env, check=True, capture_output=True)
+
+            ports = [options["port"] + i for i in range(options["nodes"])]
+            servers = [
+                subprocess.Popen(
+                    manage + ["runserver", "--noreload", f"127.0.0.1:{port}"],
+                    env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                )
+                for port in ports
+            ]
+            try:
+                base_urls = [f"http://127.0.0.1:{port}" for port in ports]
+                for url in base_urls:
+                    self.wait_for(url)
+                failures = self.run_journey(Client(base_urls))
+            finally:
+                for server in servers:
+                    server.terminate()
+                for server in servers:
+                    server.wait()
+
+        if failures:
+            raise CommandError(f"{failures} check(s) failed")
+        self.stdout.write(self.style.SUCCESS(f"All checks passed across {options['nodes']} nodes"))
+
+    def node_env(self, shared, cache):
+        env = dict(
+            os.environ,
+            DEPLOYMENT_MODE="multi",
+            DEBUG="True",
+            DATABASE_ENGINE="django.db.backends.sqlite3",
+            DATABASE_NAME=str(shared / "db.sqlite3"),
+            CACHE_BACKEND=CACHE_BACKENDS[cache],
+            CACHE_LOCATION=str(shared / "cache") if cache == "file" else "django_cache",
+            SESSION_ENGINE="django.contrib.sessions.backends.cached_db",
+            MEDIA_ROOT=str(shared / "media"),
+            AI_PROVIDER_ORDER="stub",
+            PREWARM_ENABLED="False",
+            RATELIMIT_ENABLED="True",
+        )
+        env.pop("DJANGO_SETTINGS_MODULE", None)
+        return env
+
+    def wait_for(self, url, timeout=30):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            try:
+                urllib.request.urlopen(url + "/login/", timeout=2).close()
+                return
+            except OSError:
+                time.sleep(0.2)
+        raise CommandError(f"{url} did not start within {timeout}s")
+
+    def report(self, client, name, ok, detail=""):
+        node = client.last_node.rsplit(":", 1)[-1]
+        status = self.style.SUCCESS("PASS") if ok else self.style.ERROR("FAIL")
+        self.stdout.write(f"{status} {name} (node :{node}){f' - {detail}' if detail and not ok else ''}")
+        return 0 if ok else 1
+
+    def run_journey(self, client):
+        failures = 0
+        password = uuid.uuid4().hex
+
+        client.request("/register/")
+        status, headers, _ = client.request("/register/", {
+            "username": "multinode", "email": "multinode@example.com",
+            "password1": password, "password2": password,
+        })
+        failures += self.report(client, "register", status == 302, f"status {status}")
+
+        status, _, _ = client.request("/dashboard/")
+        failures += self.report(client, "logged in on another node", status == 200, f"status {status}")
+
+        interview = {"role": "Backend Engineer", "interview_type": "technical",
+                     "experience_level": "mid", "interview_mode": "multi"}
+        status, headers, _ = client.request("/interview/simulate/", interview)
+        failures += self.report(client, "start interview", status == 302, f"status {status}")
+
+        answered = 0
+        while True:
+            status, _, body = client.request("/interview/question/")
+            if status != 200:
+                break
+            status, headers, _ = client.request("/interview/question/", {"answer": f"Answer {answered + 1}"})
+            answered += 1
+            if headers.get("Location", "").endswith("/complete/"):
+                break
+        failures += self.report(client, f"answer {answered} questions", answered >= 1 and status == 302,
+                               f"status {status}")
+
+        status, _, body = client.request("/interview/complete/")
+        failures += self.report(client, "complete interview", status == 200 and b"score" in body, f"status {status}")
+
+        status, _, body = client.request("/api/v1/interviews/")
+        failures += self.report(client, "completed interview visible through the API",
+                               status == 200 and b'"completed_at":null' not in body, f"status {status}")
+
+        content = uuid.uuid4().hex.encode()
+        status, _, _ = client.request("/resume/upload/", {"title": "Multi-node"}, files={"file": ("resume.txt", content)})
+        failures += self.report(client, "upload resume", status == 302, f"status {status}")
+
+        status, _, body = client.request("/resume/")
+        match = re.search(rb'href="([^"]*/resumes/[^"]+)"', body)
+        failures += self.report(client, "resume listed", match is not None)
+        if match:
+            status, _, body = client.request(match.group(1).decode())
+            failures += self.report(client, "download resume uploaded on another node",
+                                   status == 200 and body == content, f"status {status}")
+
+        # The rate limit counts across nodes: one interview is already spent
+        capacity = settings.AI_RATE_LIMITS["interview"]["user"][0]
+        statuses = []
+        for _ in range(capacity):
+            status, _, _ = client.request("/interview/simulate/", interview)
+            statuses.append(status)
+        failures += self.report(client, "shared interview rate limit", statuses[-1] == 429, f"statuses {statuses}")
+        return failures
@@ -0,0 +1,102 @@
+"""
+Measure the offline content engine
+
+    python manage.py offline_benchmark --repeat 200
+
+Times reading and indexing the dataset once, then each generator in
+core/offline.py across every role family, level and interview type: median
+and 99th percentile microseconds per call. Finally counts how many distinct
+roadmaps and question sets the families get, which the single static
+fallback used to make one. No database or AI provider is needed.
+"""
+import json
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core import offline
+
+ROLES = {
+    "software": "Software Engineer", "backend": "Backend Developer", "frontend": "Frontend Engineer",
+    "fullstack": "Full Stack Developer", "mobile": "iOS Developer", "data_scientist": "Data Scientist",
+    "data_analyst": "Data Analyst", "data_engineer": "Data Engineer", "ml_engineer": "Machine Learning Engineer",
+    "devops": "Site Reliability Engineer", "security": "Security Analyst", "qa": "QA Engineer",
+    "product_manager": "Product Manager", "engineering_manager": "Engineering Manager",
+}
+INTERVIEW_TYPES = ["technical", "behavioral", "system-design", "mixed"]
+SKILLS = ["SQL", "Docker", "Kafka"]
+ANSWER = ("When I was at my last company our checkout API slowed down, so I profiled it and found an N+1 query. "
+          "I rewrote it with a join and added an index because the table had grown to 20 million rows. "
+          "As a result p95 latency dropped from 900 ms to 120 ms. The trade-off was slightly slower writes.")
+RESUME = """Jane Doe
+jane@example.com | +1 555 123 4567 | linkedin.com/in/jane
+Experience
+- Built a REST API in Django serving 2M requests per day
+- Reduced p99 latency by 40% by adding Redis caching
+- Responsible for the CI pipeline with Docker and GitHub Actions
+Education
+B.Sc. Computer Science
+Skills
+Python, SQL, PostgreSQL, Redis, Docker, AWS, Git
+"""
+
+
+def _time(calls, repeat):
+    """(median, p99) microseconds per call over repeat rounds of calls"""
+    timings = []
+    for _ in range(repeat):
+        for call in calls:
+            started = time.perf_counter()
+            call()
+            timings.append((time.perf_counter() - started) * 1e6)
+    timings.sort()
+    return statistics.median(timings), timings[min(len(timings) - 1, int(len(timings) * 0.99))]
+
+
+class Command(BaseCommand):
+    help = "Benchmark the offline roadmap, question and feedback generators"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--repeat", type=int, default=200, help="Rounds over every role and level")
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        with open(offline.DATA_PATH, encoding="utf-8") as f:
+            data = json.load(f)
+        content = offline._compile(data)
+        load_ms = (time.perf_counter() - started) * 1000
+        offline.load_content()
+        questions = sum(len(topic["questions"]) for topic in data["topics"].values())
+        self.stdout.write(f"Dataset: {offline.DATA_PATH.stat().st_size / 1024:.0f} KB, {len(data['families'])} role "
+                          f"families, {len(data['topics'])} topics, {questions} questions; "
+                          f"read and indexed in {load_ms:.1f} ms")
+        unmatched = [name for name in content["families"] if offline.role_family(ROLES.get(name, "")) != name]
+        if unmatched:
+            raise CommandError(f"No benchmark role maps to the families: {', '.join(unmatched)}")
+
+        combos = [(role, level) for role in ROLES.values() for level in offline.LEVELS]
+        sample = offline.roadmap("Backend Developer", "mid", SKILLS)["modules"][0]
+        qa_pairs = [{"question": q["question"], "expected_points": q["key_points"], "user_answer": ANSWER}
+                    for q in offline.questions("Backend Developer", "mixed", "mid")]
+        generators = [
+            ("roadmap", [lambda r=role, l=level: offline.roadmap(r, l) for role, level in combos]),
+            ("roadmap with 3 skills", [lambda r=role, l=level: offline.roadmap(r, l, SKILLS) for role, level in combos]),
+            ("roadmap module", [lambda r=role, l=level: offline.roadmap_module(r, l, module=sample)
+                                for role, level in combos]),
+            ("5 questions", [lambda r=role, l=level, t=kind: offline.questions(r, t, l)
+                             for role, level in combos for kind in INTERVIEW_TYPES]),
+            ("evaluate 5 answers", [lambda: offline.evaluate(qa_pairs, "mixed")]),
+            ("resume feedback", [lambda r=role: offline.resume_feedback(RESUME, r) for role in ROLES.values()]),
+        ]
+        self.stdout.write(f"{'generator':<24}{'median µs':>11}{'p99 µs':>10}")
+        for label, calls in generators:
+            median, p99 = _time(calls, options["repeat"])
+            self.stdout.write(f"{label:<24}{median:>11.1f}{p99:>10.1f}")
+
+        roadmaps = {tuple(m["title"] for m in offline.roadmap(role, level)["modules"]) for role, level in combos}
+        question_sets = {tuple(q["question"] for q in offline.questions(role, kind, level))
+                         for role, level in combos for kind in INTERVIEW_TYPES}
+        self.stdout.write(self.style.SUCCESS(
+            f"{len(roadmaps)} distinct roadmaps and {len(question_sets)} distinct question sets across "
+            f"{len(ROLES)} role families x {len(offline.LEVELS)} levels (x {len(INTERVIEW_TYPES)} interview types)"))
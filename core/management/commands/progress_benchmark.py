@@ -0,0 +1,215 @@
+"""
+Seed a large score history and check the dashboard stays O(1)
+
+    python manage.py progress_benchmark --users 10000 --sessions 500
+
+Seeds --users users with --sessions finished interviews each (ScoreRecords
+written with bulk_create, their ScoreSummary rows folded in memory with the
+same code the app uses), then reports:
+
+- the dashboard's query count and fastest time for a user with the full
+  history and for a user with none, and the time to read that user's
+  progress from their summary and to aggregate it from their records;
+- the time and query count of recording --appends more evaluations through
+  interview.progress.record_evaluation, spread over random users;
+- whether the incrementally updated summaries of those users match a rebuild
+  from their records.
+
+By default everything happens in a throwaway SQLite database. --in-place
+seeds the configured database instead (for a staging PostgreSQL); synthetic
+usernames start with "progress-".
+"""
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Avg, Count, Max
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from core.models import Profile
+from interview.models import InterviewSession, ScoreRecord, ScoreSummary
+from interview.progress import add_to_summary, progress_overview, rebuild_summary, record_evaluation
+
+INTERVIEW_TYPES = ["technical", "behavioral", "system-design", "mixed"]
+SUMMARY_FIELDS = ["sessions", "best_score", "last_score", "current_streak", "longest_streak", "last_active_date",
+                  "recent_scores", "weakness"]
+BATCH_SIZE = 5000
+
+
+def _history(user_id, sessions, now):
+    """A user's synthetic ScoreRecords, oldest first, roughly two a day with gaps"""
+    at = now - timedelta(hours=12 * sessions + user_id % 500)
+    for k in range(sessions):
+        at += timedelta(hours=6 + (user_id * 7 + k * 13) % 31)
+        score = 5 + ((user_id * 31 + k * 17) % 50) / 10
+        interview_type = INTERVIEW_TYPES[(user_id + k) % len(INTERVIEW_TYPES)]
+        yield ScoreRecord(user_id=user_id, overall_score=score, category_scores={interview_type: score},
+                          role="Backend Engineer", interview_type=interview_type, recorded_at=min(at, now))
+
+
+class Command(BaseCommand):
+    help = "Seed users x sessions of score history and measure the dashboard and score recording"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=10000)
+        parser.add_argument("--sessions", type=int, default=500, help="Finished interviews per user")
+        parser.add_argument("--appends", type=int, default=200, help="Evaluations recorded after seeding")
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument("--in-place", action="store_true", help="Seed the configured database")
+
+    def handle(self, *args, **options):
+        if not options["in_place"]:
+            return self.run_in_throwaway_database(options)
+        # Keep requests from starting background work mid-measurement,
+        # and render pages without needing collectstatic's manifest
+        storages = {**settings.STORAGES,
+                    "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"}}
+        with override_settings(PREWARM_ENABLED=False, SESSION_GC_INTERVAL=0, STORAGES=storages,
+                               ALLOWED_HOSTS=["*"]):
+            user_ids = self.seed(options["users"], options["sessions"])
+            self.measure_dashboard(user_ids[0], options["repeat"])
+            self.measure_appends(user_ids, options["appends"])
+
+    def run_in_throwaway_database(self, options):
+        manage = [sys.executable, str(Path(settings.BASE_DIR) / "manage.py")]
+        argv = ["--in-place"]
+        for option in ("users", "sessions", "appends", "repeat"):
+            argv += [f"--{option}", str(options[option])]
+        with tempfile.TemporaryDirectory(prefix="progress-") as tmp:
+            # DEBUG would keep every (large) bulk query in memory
+            env = dict(os.environ, DATABASE_ENGINE="django.db.backends.sqlite3",
+                       DATABASE_NAME=str(Path(tmp) / "db.sqlite3"), DEBUG="False")
+            subprocess.run(manage + ["migrate", "--noinput"], env=env, check=True, capture_output=True)
+            result = subprocess.run(manage + ["progress_benchmark"] + argv, env=env)
+        if result.returncode:
+            raise CommandError("progress_benchmark failed")
+
+    def seed(self, users, sessions):
+        """Create the synthetic users with their records and summaries; return their ids"""
+        started = time.perf_counter()
+        now = timezone.now()
+        per_batch = max(1, BATCH_SIZE // max(sessions, 1))
+        user_ids = []
+        for first in range(0, users, per_batch):
+            count = min(per_batch, users - first)
+            with transaction.atomic():
+                created = User.objects.bulk_create(
+                    User(username=f"progress-{first + i}", email=f"progress-{first + i}@example.com", password="!")
+                    for i in range(count)
+                )
+                records, summaries = [], []
+                for user in created:
+                    summary = ScoreSummary(user_id=user.pk)
+                    for record in _history(user.pk, sessions, now):
+                        add_to_summary(summary, record)
+                        records.append(record)
+                    summaries.append(summary)
+                ScoreRecord.objects.bulk_create(records, batch_size=BATCH_SIZE)
+                ScoreSummary.objects.bulk_create(summaries, batch_size=BATCH_SIZE)
+            user_ids += [user.pk for user in created]
+
+        with connection.cursor() as cursor:
+            if connection.vendor == "postgresql":
+                cursor.execute("ANALYZE auth_user, interview_scorerecord, interview_scoresummary")
+            else:
+                cursor.execute("ANALYZE")
+        seconds = time.perf_counter() - started
+        rows = users * sessions
+        self.stdout.write(f"Seeded {users} users x {sessions} sessions ({rows} records) in {seconds:.1f}s, "
+                          f"{rows / seconds:.0f} records/s")
+        return user_ids
+
+    def timed(self, repeat, function):
+        """Fastest of repeat runs in ms, and the queries of the last run"""
+        timings = []
+        for _ in range(repeat):
+            with CaptureQueriesContext(connection) as captured:
+                started = time.perf_counter()
+                function()
+                timings.append((time.perf_counter() - started) * 1000)
+        return min(timings), len(captured.captured_queries)
+
+    def measure_dashboard(self, heavy_id, repeat):
+        heavy = User.objects.get(pk=heavy_id)
+        fresh, created = User.objects.get_or_create(username="progress-fresh")
+        self.stdout.write(f"\n{'page':<44}{'queries':>8}{'ms':>9}")
+        for label, user in ((f"dashboard, {heavy.score_summary.sessions} sessions", heavy),
+                            ("dashboard, no sessions", fresh)):
+            Profile.objects.get_or_create(user=user)
+            client = Client()
+            client.force_login(user)
+
+            def get():
+                response = client.get(reverse("dashboard"))
+                if response.status_code != 200:
+                    raise CommandError(f"dashboard answered {response.status_code}")
+
+            ms, queries = self.timed(repeat, get)
+            self.stdout.write(f"{label:<44}{queries:>8}{ms:>9.1f}")
+
+        def scan():
+            # What the dashboard would do without summaries
+            records = ScoreRecord.objects.filter(user=heavy)
+            records.aggregate(Avg("overall_score"), Max("overall_score"), Count("id"))
+            list(records.order_by("-recorded_at").values_list("overall_score", flat=True)[:settings.SCORE_TREND_LENGTH])
+            categories = {}
+            for scores in records.values_list("category_scores", flat=True).iterator():
+                for name, score in scores.items():
+                    categories.setdefault(name, []).append(score)
+
+        ms, queries = self.timed(repeat, lambda: progress_overview(heavy))
+        self.stdout.write(f"{'progress from the summary':<44}{queries:>8}{ms:>9.1f}")
+        ms, queries = self.timed(repeat, scan)
+        self.stdout.write(f"{'progress aggregated from the records':<44}{queries:>8}{ms:>9.1f}")
+
+    def measure_appends(self, user_ids, appends):
+        if not appends:
+            return
+        rng = random.Random(0)
+        targets = [rng.choice(user_ids) for _ in range(appends)]
+        questions = [{"question": f"Question {i}", "key_points": []} for i in range(5)]
+        answers = [{"question_index": i, "answer": "An answer"} for i in range(5)]
+        timings, query_counts = [], []
+        for n, user_id in enumerate(targets):
+            evaluation = {"overall_score": 5 + n % 5,
+                          "question_feedback": [{"score": 5 + (n + i) % 5} for i in range(5)]}
+            interview = InterviewSession.objects.create(
+                user_id=user_id, role="Backend Engineer", interview_type=INTERVIEW_TYPES[n % len(INTERVIEW_TYPES)],
+                experience_level="mid", questions=questions, answers=answers, evaluation=evaluation,
+                completed_at=timezone.now(),
+            )
+            with CaptureQueriesContext(connection) as captured:
+                started = time.perf_counter()
+                record_evaluation(interview, evaluation)
+                timings.append((time.perf_counter() - started) * 1000)
+            query_counts.append(len(captured.captured_queries))
+
+        p95 = statistics.quantiles(timings, n=20)[-1] if len(timings) > 1 else timings[0]
+        self.stdout.write(f"\nRecorded {appends} evaluations: median {statistics.median(timings):.2f} ms, "
+                          f"p95 {p95:.2f} ms, {max(query_counts)} queries each")
+
+        mismatched = []
+        for user_id in sorted(set(targets)):
+            incremental = ScoreSummary.objects.get(user_id=user_id)
+            rebuilt = rebuild_summary(user_id)
+            same = all(getattr(incremental, field) == getattr(rebuilt, field) for field in SUMMARY_FIELDS)
+            same = same and abs(incremental.total_score - rebuilt.total_score) < 1e-6
+            same = same and incremental.categories.keys() == rebuilt.categories.keys()
+            if not same:
+                mismatched.append(user_id)
+        if mismatched:
+            raise CommandError(f"Incremental summaries differ from a rebuild for users {mismatched[:10]}")
+        self.stdout.write(self.style.SUCCESS(f"Incremental summaries of {len(set(targets))} users match a rebuild"))
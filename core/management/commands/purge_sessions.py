@@ -0,0 +1,33 @@
+"""
+Delete expired sessions in small batches and report session table size
+
+    python manage.py purge_sessions --batch-size 500
+    python manage.py purge_sessions --stats-only
+
+A gentler `clearsessions` for cron, for deployments that set
+SESSION_GC_INTERVAL=0 to turn off the in-process background GC.
+"""
+from django.core.management.base import BaseCommand
+
+from core.sessions import purge_expired_sessions, session_stats
+
+
+class Command(BaseCommand):
+    help = "Delete expired sessions in batches without holding long write locks"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=None)
+        parser.add_argument("--pause", type=float, default=0.05, help="Seconds between batches")
+        parser.add_argument("--stats-only", action="store_true", help="Only report session metrics")
+
+    def handle(self, *args, **options):
+        if not options["stats_only"]:
+            deleted = purge_expired_sessions(options["batch_size"], options["pause"])
+            self.stdout.write(f"Deleted {deleted} expired sessions")
+
+        stats = session_stats()
+        table = f"{stats['table_bytes'] / 1024:.0f} KB" if stats["table_bytes"] is not None else "unknown"
+        self.stdout.write(
+            f"{stats['sessions']} sessions ({stats['expired']} expired), "
+            f"{stats['avg_bytes']} bytes on average, largest {stats['max_bytes']} bytes, table size {table}"
+        )
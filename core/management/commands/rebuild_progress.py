@@ -0,0 +1,37 @@
+"""
+Backfill score history from past interviews and recompute progress summaries
+
+    python manage.py rebuild_progress
+    python manage.py rebuild_progress --users alice bob --no-backfill
+
+Interviews evaluated before score history existed get their ScoreRecord
+(oldest first), then every affected user's ScoreSummary is recomputed from
+their records. Safe to run again at any time.
+"""
+from django.core.management.base import BaseCommand
+
+from interview.models import ScoreRecord
+from interview.progress import backfill_records, rebuild_summary
+
+
+class Command(BaseCommand):
+    help = "Record past interview scores and recompute per-user progress summaries"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", nargs="+", help="Only rebuild these usernames")
+        parser.add_argument("--no-backfill", action="store_true", help="Skip recording past interviews")
+
+    def handle(self, *args, **options):
+        if not options["no_backfill"]:
+            added = backfill_records()
+            self.stdout.write(f"Recorded {added} past interviews")
+
+        records = ScoreRecord.objects.all()
+        if options["users"]:
+            records = records.filter(user__username__in=options["users"])
+        user_ids = records.order_by("user_id").values_list("user_id", flat=True).distinct()
+        rebuilt = 0
+        for user_id in user_ids.iterator():
+            rebuild_summary(user_id)
+            rebuilt += 1
+        self.stdout.write(f"Rebuilt {rebuilt} progress summaries")
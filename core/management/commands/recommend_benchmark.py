@@ -0,0 +1,92 @@
+"""
+Time the weak-area recommender's per-user work
+
+    python manage.py recommend_benchmark --users 10000
+
+For --users synthetic weakness vectors (a few weak topics each, stored and
+loaded as the ScoreSummary bytes), times loading the vector and ranking every
+topic for it, for any interview type and for technical interviews. Also times
+turning a five-question evaluation into its weakness signal. Fails if the
+99th percentile of load plus ranking exceeds --max-us microseconds. No
+database is needed.
+"""
+import random
+import statistics
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand, CommandError
+
+from interview.models import InterviewSession, ScoreSummary
+from interview.recommender import TOPIC_NAMES, evaluation_weakness, rank_topics, weakness_vector
+
+QUESTIONS = [
+    {"question": "How would you speed up a slow SQL query with several joins?",
+     "key_points": ["Query plans", "Indexing", "Avoiding N+1 queries"]},
+    {"question": "Design a URL shortener that handles 10k requests per second.",
+     "key_points": ["Scalability", "Caching", "Database sharding"]},
+    {"question": "Tell me about a disagreement with a teammate.",
+     "key_points": ["STAR structure", "Outcome", "Collaboration"]},
+    {"question": "How do you make sure a refactor doesn't break anything?",
+     "key_points": ["Unit tests", "Coverage", "Code review"]},
+    {"question": "Explain how you would debug a memory leak in production.",
+     "key_points": ["Profiling", "Monitoring", "Root cause"]},
+]
+EVALUATION = {
+    "overall_score": 6,
+    "overall_feedback": {"improvements": ["Quantify the impact of your work", "Discuss trade-offs explicitly"]},
+    "question_feedback": [
+        {"score": score, "improvements": ["Mention concrete examples"], "tips": ["Use the STAR method"]}
+        for score in (4, 6, 8, 5, 7)
+    ],
+}
+
+
+def _percentiles(timings):
+    cuts = statistics.quantiles(timings, n=100)
+    return statistics.median(timings), cuts[98]
+
+
+class Command(BaseCommand):
+    help = "Benchmark loading and scoring weakness vectors for the recommender"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=10000)
+        parser.add_argument("--max-us", type=float, default=1000.0, help="Fail above this p99 per user")
+
+    def handle(self, *args, **options):
+        rng = random.Random(0)
+        summaries = []
+        for _ in range(options["users"]):
+            vector = np.zeros(len(TOPIC_NAMES), dtype=np.float32)
+            for position in rng.sample(range(len(TOPIC_NAMES)), rng.randint(1, 8)):
+                vector[position] = rng.random()
+            summaries.append(ScoreSummary(weakness=vector.tobytes()))
+
+        self.stdout.write(f"{len(TOPIC_NAMES)} topics, {options['users']} users")
+        self.stdout.write(f"{'step':<40}{'median us':>11}{'p99 us':>9}")
+        worst = 0.0
+        for label, interview_type in (("load + rank, any type", None), ("load + rank, technical", "technical")):
+            timings = []
+            for summary in summaries:
+                started = time.perf_counter()
+                rank_topics(weakness_vector(summary), 3, interview_type)
+                timings.append((time.perf_counter() - started) * 1e6)
+            median, p99 = _percentiles(timings)
+            worst = max(worst, p99)
+            self.stdout.write(f"{label:<40}{median:>11.1f}{p99:>9.1f}")
+
+        interview = InterviewSession(role="Backend Engineer", interview_type="mixed", questions=QUESTIONS,
+                                     answers=[{"question_index": i, "answer": "..."} for i in range(len(QUESTIONS))])
+        timings = []
+        for _ in range(1000):
+            started = time.perf_counter()
+            evaluation_weakness(interview, EVALUATION)
+            timings.append((time.perf_counter() - started) * 1e6)
+        median, p99 = _percentiles(timings)
+        self.stdout.write(f"{'weakness signal of one evaluation':<40}{median:>11.1f}{p99:>9.1f}")
+        self.stdout.write(f"\nSample: {evaluation_weakness(interview, EVALUATION)}")
+
+        if worst > options["max_us"]:
+            raise CommandError(f"Scoring a user took {worst:.0f} us at p99 (limit {options['max_us']:.0f})")
+        self.stdout.write(self.style.SUCCESS(f"Scoring a user takes under {options['max_us']:.0f} us at p99"))
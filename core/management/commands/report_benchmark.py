@@ -0,0 +1,112 @@
+"""
+Measure concurrent report export throughput
+
+    python manage.py report_benchmark --reports 200 --workers 1,2,4
+
+For each format and worker count, queues --reports distinct interview
+reports at once on core.reports' worker pool and times until all are stored
+(cold), then requests the same reports again, which only finds the stored
+files (warm). Finally --duplicates concurrent requests for one identical
+interview must leave exactly one stored file. Files go to a temporary
+directory and the queued markers to an in-memory cache (all threads share one
+process); no database is needed.
+"""
+import statistics
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+from django.utils import timezone
+
+from core import reports
+from interview.models import InterviewSession
+
+
+def _interview(n):
+    """A synthetic five-question evaluated interview, different for every n"""
+    questions = [{"question": f"Question {k} of interview {n}: how would you design a rate limiter for an API "
+                              "used by thousands of clients?"} for k in range(5)]
+    answers = [{"question_index": k, "answer": f"Answer {n}.{k}. " + "I would start from the requirements, "
+                "then pick a token bucket per client kept in Redis, and discuss the trade-offs. " * 4}
+               for k in range(5)]
+    feedback = [{"score": 5 + (n + k) % 5, "good_points": ["Clear structure", "Mentions trade-offs"],
+                 "improvements": ["Quantify the expected load", "Cover failure modes"],
+                 "tips": ["Draw the data flow first"]} for k in range(5)]
+    evaluation = {"overall_score": 5 + n % 5, "question_feedback": feedback,
+                  "overall_feedback": {"strengths": ["Structured answers"], "improvements": ["More metrics"],
+                                       "tips": ["Practice system design questions"]}}
+    return InterviewSession(role="Backend Engineer", interview_type="technical", experience_level="mid",
+                            questions=questions, answers=answers, evaluation=evaluation,
+                            completed_at=timezone.now())
+
+
+class Command(BaseCommand):
+    help = "Benchmark rendering, storing and reusing PDF and HTML reports concurrently"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--reports", type=int, default=200, help="Distinct reports per run")
+        parser.add_argument("--workers", default="1,2,4", help="Comma-separated REPORT_WORKERS values")
+        parser.add_argument("--formats", default="pdf,html")
+        parser.add_argument("--duplicates", type=int, default=50, help="Concurrent requests for one report")
+
+    def handle(self, *args, **options):
+        workers = [int(w) for w in options["workers"].split(",") if w.strip()]
+        formats = [f.strip() for f in options["formats"].split(",") if f.strip()]
+        unknown = set(formats) - set(reports.FORMATS)
+        if unknown:
+            raise CommandError(f"Unknown formats: {', '.join(sorted(unknown))}")
+
+        with tempfile.TemporaryDirectory(prefix="reports-") as tmp:
+            # Django 5.0 ignores OPTIONS of an overridden default storage, so the location is MEDIA_ROOT
+            storages = {"default": {"BACKEND": "django.core.files.storage.FileSystemStorage"}}
+            caches = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+            with override_settings(STORAGES=storages, MEDIA_ROOT=tmp, CACHES=caches):
+                self.stdout.write(f"{'format':<8}{'workers':>8}{'cold reports/s':>16}{'warm requests/s':>17}"
+                                  f"{'median KB':>11}")
+                for fmt in formats:
+                    for count in workers:
+                        self.run(fmt, count, options["reports"])
+                self.check_duplicates(formats[0], options["duplicates"])
+        reports.shutdown_workers()
+
+    def run(self, fmt, workers, count):
+        reports.shutdown_workers()
+        # Distinct data per run, so nothing is reused from an earlier one
+        interviews = [_interview(n + workers * count) for n in range(count)]
+        with override_settings(REPORT_WORKERS=workers):
+            started = time.perf_counter()
+            futures = []
+            for interview in interviews:
+                data = reports.interview_report_data(interview)
+                futures.append(reports.schedule_report("interview", data, reports.report_digest("interview", data),
+                                                       fmt))
+            wait([future for future in futures if future is not None])
+            cold = time.perf_counter() - started
+
+            started = time.perf_counter()
+            ready = [reports.request_report("interview", interview, fmt)[1] == "ready"
+                     for interview in interviews]
+            warm = time.perf_counter() - started
+        if not all(ready):
+            raise CommandError(f"{ready.count(False)} {fmt} reports were not stored")
+
+        sizes = [default_storage.size(reports.report_name(reports.report_digest(
+            "interview", reports.interview_report_data(interview)), fmt)) for interview in interviews]
+        self.stdout.write(f"{fmt:<8}{workers:>8}{count / cold:>16.1f}{count / warm:>17.0f}"
+                          f"{statistics.median(sizes) / 1024:>11.1f}")
+
+    def check_duplicates(self, fmt, duplicates):
+        reports.shutdown_workers()
+        interview = _interview(-1)
+        with ThreadPoolExecutor(max_workers=min(duplicates, 32)) as clients:
+            list(clients.map(lambda _: reports.request_report("interview", interview, fmt), range(duplicates)))
+        reports.shutdown_workers()
+        digest = reports.report_digest("interview", reports.interview_report_data(interview))
+        directory, stored = default_storage.listdir(f"reports/{digest[:2]}")
+        copies = [name for name in stored if name.startswith(digest)]
+        if len(copies) != 1:
+            raise CommandError(f"{duplicates} requests for one report stored {len(copies)} files")
+        self.stdout.write(self.style.SUCCESS(f"{duplicates} concurrent requests for one report stored one file"))
@@ -0,0 +1,104 @@
+"""
+Compare module-level roadmap updates with regenerating the whole roadmap
+
+    AI_PROVIDER_ORDER=stub python manage.py roadmap_benchmark --repeat 5
+
+For each typical edit (adding or removing a skill, changing experience years
+within or across a level, and a level change with half the modules
+completed), starts from a freshly generated roadmap and applies the edit with
+roadmap.services.update_roadmap, then regenerates the whole roadmap for the
+new inputs the way a new roadmap is generated. Reports the completions and
+tokens each used and their fastest time. Use the stub provider to compare
+prompt sizes offline, or a real one for real latencies.
+
+By default everything happens in a throwaway SQLite database; --in-place
+uses the configured database (synthetic usernames start with "roadmap-").
+"""
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+
+from core.providers import ai_enabled
+from roadmap.services import generate_roadmap_content, create_roadmap, set_module_completed, update_roadmap
+
+JOB_ROLE = "Backend Engineer"
+SKILLS = ["SQL", "Docker", "Kafka"]
+# (label, experience years, target skills, share of modules completed first)
+EDITS = [
+    ("add a skill", 3, SKILLS + ["Redis"], 0),
+    ("remove a skill", 3, SKILLS[:2], 0),
+    ("years within a level", 4, SKILLS, 0),
+    ("level change", 6, SKILLS, 0),
+    ("level change, half completed", 6, SKILLS, 0.5),
+]
+
+
+class Command(BaseCommand):
+    help = "Measure tokens and time of module-level roadmap updates against full regeneration"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--repeat", type=int, default=3)
+        parser.add_argument("--in-place", action="store_true", help="Use the configured database")
+
+    def handle(self, *args, **options):
+        if not ai_enabled():
+            raise CommandError("No AI provider is configured (set OPENAI_API_KEY or AI_PROVIDER_ORDER=stub)")
+        if not options["in_place"]:
+            return self.run_in_throwaway_database(options)
+        with override_settings(PREWARM_ENABLED=False):
+            self.measure(options["repeat"])
+
+    def run_in_throwaway_database(self, options):
+        manage = [sys.executable, str(Path(settings.BASE_DIR) / "manage.py")]
+        with tempfile.TemporaryDirectory(prefix="roadmap-") as tmp:
+            env = dict(os.environ, DATABASE_ENGINE="django.db.backends.sqlite3",
+                       DATABASE_NAME=str(Path(tmp) / "db.sqlite3"), DEBUG="False")
+            subprocess.run(manage + ["migrate", "--noinput"], env=env, check=True, capture_output=True)
+            result = subprocess.run(manage + ["roadmap_benchmark", "--in-place",
+                                              "--repeat", str(options["repeat"])], env=env)
+        if result.returncode:
+            raise CommandError("roadmap_benchmark failed")
+
+    def measure(self, repeat):
+        self.stdout.write(f"{'edit':<32}{'update calls':>13}{'tokens':>8}{'ms':>8}"
+                          f"{'full calls':>12}{'tokens':>8}{'ms':>8}")
+        total_update = total_full = 0
+        for n, (label, years, skills, completed_share) in enumerate(EDITS):
+            update_runs, full_runs = [], []
+            for run in range(repeat):
+                user, created = User.objects.get_or_create(username=f"roadmap-{n}-{run}")
+                user.roadmaps.all().delete()
+                roadmap = create_roadmap(user, JOB_ROLE, 3, SKILLS)
+                modules = roadmap.content["modules"]
+                for module in modules[:int(len(modules) * completed_share)]:
+                    set_module_completed(roadmap, module["key"])
+
+                stats = {"completions": 0, "tokens": 0, "single_calls": 0}
+                started = time.perf_counter()
+                update_roadmap(user, JOB_ROLE, years, skills, stats=stats)
+                update_runs.append((time.perf_counter() - started) * 1000)
+
+                full = {"completions": 0, "tokens": 0, "single_calls": 0}
+                started = time.perf_counter()
+                generate_roadmap_content(JOB_ROLE, years, skills, stats=full)
+                full_runs.append((time.perf_counter() - started) * 1000)
+
+            total_update += stats["tokens"]
+            total_full += full["tokens"]
+            self.stdout.write(f"{label:<32}{stats['completions'] + stats['single_calls']:>13}{stats['tokens']:>8}"
+                              f"{min(update_runs):>8.1f}{full['completions'] + full['single_calls']:>12}"
+                              f"{full['tokens']:>8}{min(full_runs):>8.1f}")
+
+        if total_update >= total_full:
+            raise CommandError(f"Module updates used {total_update} tokens, full regeneration {total_full}")
+        self.stdout.write(self.style.SUCCESS(
+            f"Module updates used {total_update} tokens across the edits, "
+            f"{total_update / total_full:.0%} of full regeneration ({total_full})"))
@@ -0,0 +1,80 @@
+"""
+Replay a recorded AI workload through each routing policy
+
+Record a workload by running the app with AI_WORKLOAD_RECORD_PATH=workload.jsonl,
+then:
+
+    python manage.py routing_benchmark workload.jsonl --policies single,cascade
+
+Use AI_PROVIDER_ORDER=stub to exercise the routing logic offline.
+"""
+import json
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+
+from core.providers import ai_enabled
+from core.routing import POLICIES, complete_json, cost_of
+
+
+class Command(BaseCommand):
+    help = "Replay recorded AI calls through each routing policy and report latency and cost"
+
+    def add_arguments(self, parser):
+        parser.add_argument("workload", help="JSONL file written via AI_WORKLOAD_RECORD_PATH")
+        parser.add_argument("--policies", default=",".join(POLICIES))
+        parser.add_argument("--limit", type=int, default=None, help="Replay at most this many calls")
+
+    def handle(self, *args, **options):
+        policies = [p.strip() for p in options["policies"].split(",") if p.strip()]
+        unknown = set(policies) - set(POLICIES)
+        if unknown:
+            raise CommandError(f"Unknown policies: {', '.join(sorted(unknown))}")
+        if not ai_enabled():
+            raise CommandError("No AI provider is configured (set OPENAI_API_KEY or AI_PROVIDER_ORDER=stub)")
+
+        with open(options["workload"], encoding="utf-8") as f:
+            workload = [json.loads(line) for line in f if line.strip()]
+        workload = workload[:options["limit"]]
+        if not workload:
+            raise CommandError("The workload file is empty")
+
+        self.stdout.write(f"Replaying {len(workload)} calls")
+        # Recording would append the replayed calls to the workload being replayed
+        with override_settings(AI_WORKLOAD_RECORD_PATH=None):
+            for policy in policies:
+                self.report(policy, self.replay(policy, workload))
+
+    def replay(self, policy, workload):
+        results = []
+        for call in workload:
+            attempts = []
+            started = time.perf_counter()
+            try:
+                complete_json(call["task"], call["system"], call["prompt"], policy=policy, attempts=attempts)
+                ok = True
+            except Exception as e:
+                self.stderr.write(f"{policy}/{call['task']}: {e}")
+                ok = False
+            results.append({
+                "ok": ok,
+                "latency": time.perf_counter() - started,
+                "calls": len(attempts),
+                "cost": sum(cost_of(a) for a in attempts),
+                "tokens": sum(a["prompt_tokens"] + a["completion_tokens"] for a in attempts),
+            })
+        return results
+
+    def report(self, policy, results):
+        latencies = sorted(r["latency"] for r in results)
+        p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+        cost = sum(r["cost"] for r in results)
+        self.stdout.write(
+            f"{policy:>8}: ok {sum(r['ok'] for r in results)}/{len(results)}, "
+            f"escalated {sum(r['calls'] > 1 for r in results)}, "
+            f"latency p50 {statistics.median(latencies) * 1000:.0f} ms p95 {p95 * 1000:.0f} ms, "
+            f"tokens {sum(r['tokens'] for r in results)}, "
+            f"cost ${cost:.4f} (${cost / len(results):.5f}/call)"
+        )
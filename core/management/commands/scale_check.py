@@ -0,0 +1,219 @@
+"""
+Seed millions of synthetic rows and check that hot pages stay flat
+
+    python manage.py scale_check --rows 100000 1000000 3000000
+
+Grows the users, profiles and resumes tables to each --rows resumes in turn
+(--resumes-per-user resumes per synthetic user) and, at every size, requests
+the pages that list resumes and profiles: resume:home (first and last page)
+and the resumes API as one user with --heavy-resumes resumes, and the Resume
+and Profile admin changelists (plain and searched by username) as a
+superuser. For each page it reports the number of queries and the fastest of
+--repeat runs, and records the EXPLAIN plan of every query. The check fails
+if a page's query count or plans change between sizes, or its time grows more
+than --max-growth times from the smallest size to the largest.
+
+By default everything happens in a throwaway SQLite database. --in-place
+seeds the configured database instead (for a staging PostgreSQL); synthetic
+usernames start with "scale-".
+"""
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from core.models import Profile
+from resume.models import Resume
+
+HEAVY_USER = "scale-heavy"
+ADMIN_USER = "scale-admin"
+BATCH_SIZE = 5000
+
+
+@contextmanager
+def _keep_uploaded_at():
+    # bulk_create would stamp every seeded resume with the current time
+    field = Resume._meta.get_field("uploaded_at")
+    field.auto_now_add = False
+    try:
+        yield
+    finally:
+        field.auto_now_add = True
+
+
+def _resumes(owner_ids, per_user, start):
+    now = timezone.now()
+    for owner_id in owner_ids:
+        for i in range(per_user):
+            n = start + i
+            yield Resume(owner_id=owner_id, title=f"Resume {n}", file=f"resumes/scale-{owner_id}-{i}.pdf",
+                         uploaded_at=now - timedelta(minutes=(n * 7919) % 1_500_000))
+        start += per_user
+
+
+class Command(BaseCommand):
+    help = "Seed large Resume and Profile tables and check query counts and plans stay flat"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, nargs="+", default=[100000, 1000000],
+                            help="Total resumes at each step")
+        parser.add_argument("--resumes-per-user", type=int, default=5)
+        parser.add_argument("--heavy-resumes", type=int, default=2000,
+                            help="Resumes of the user whose pages are measured")
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument("--max-growth", type=float, default=3.0)
+        parser.add_argument("--show-plans", action="store_true", help="Print the plans at the largest size")
+        parser.add_argument("--in-place", action="store_true", help="Seed the configured database")
+
+    def handle(self, *args, **options):
+        if not options["in_place"]:
+            return self.run_in_throwaway_database(options)
+        # Keep logins and requests from starting background work mid-measurement,
+        # and render pages without needing collectstatic's manifest
+        storages = {**settings.STORAGES,
+                    "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"}}
+        with override_settings(PREWARM_ENABLED=False, SESSION_GC_INTERVAL=0, STORAGES=storages):
+            self.check_sizes(options)
+
+    def check_sizes(self, options):
+        sizes = sorted(options["rows"])
+        heavy, admin = self.seed_accounts(options["heavy_resumes"])
+        clients = {}
+        for name, user in (("heavy", heavy), ("admin", admin)):
+            clients[name] = Client()
+            clients[name].force_login(user)
+
+        last_page = -(-options["heavy_resumes"] // settings.RESUMES_PER_PAGE)
+        pages = [
+            ("resume home", "heavy", reverse("resume:home")),
+            ("resume home, last page", "heavy", f"{reverse('resume:home')}?page={last_page}"),
+            ("API resumes", "heavy", reverse("api:resume_list")),
+            ("admin resumes", "admin", reverse("admin:resume_resume_changelist")),
+            ("admin resumes search", "admin", f"{reverse('admin:resume_resume_changelist')}?q={HEAVY_USER}"),
+            ("admin profiles", "admin", reverse("admin:core_profile_changelist")),
+            ("admin profiles search", "admin", f"{reverse('admin:core_profile_changelist')}?q={HEAVY_USER}"),
+        ]
+
+        results = {}
+        self.stdout.write(f"{'resumes':>9}  {'page':<26}{'queries':>8}{'ms':>9}")
+        for size in sizes:
+            self.seed(size, options["resumes_per_user"])
+            for name, client, url in pages:
+                queries, ms, plans = self.measure(clients[client], url, options["repeat"])
+                results.setdefault(name, []).append((size, queries, ms, plans))
+                self.stdout.write(f"{size:>9}  {name:<26}{queries:>8}{ms:>9.1f}")
+
+        if options["show_plans"]:
+            for name, rows in results.items():
+                self.stdout.write(f"\n{name}")
+                for plan in rows[-1][3]:
+                    self.stdout.write(f"  {plan}")
+
+        failures = self.compare(results, options["max_growth"])
+        if failures:
+            raise CommandError("Not flat:\n" + "\n".join(failures))
+        self.stdout.write(self.style.SUCCESS(f"Query counts, plans and times stay flat up to {sizes[-1]} resumes"))
+
+    def run_in_throwaway_database(self, options):
+        manage = [sys.executable, str(Path(settings.BASE_DIR) / "manage.py")]
+        argv = ["--in-place", "--rows", *map(str, options["rows"])]
+        for option in ("resumes_per_user", "heavy_resumes", "repeat", "max_growth"):
+            argv += [f"--{option.replace('_', '-')}", str(options[option])]
+        if options["show_plans"]:
+            argv.append("--show-plans")
+        with tempfile.TemporaryDirectory(prefix="scale-") as tmp:
+            env = dict(os.environ, DATABASE_ENGINE="django.db.backends.sqlite3",
+                       DATABASE_NAME=str(Path(tmp) / "db.sqlite3"), DEBUG="False")
+            subprocess.run(manage + ["migrate", "--noinput"], env=env, check=True, capture_output=True)
+            result = subprocess.run(manage + ["scale_check"] + argv, env=env)
+        if result.returncode:
+            raise CommandError("scale_check failed")
+
+    def seed_accounts(self, heavy_resumes):
+        admin, created = User.objects.get_or_create(username=ADMIN_USER, defaults={"is_staff": True,
+                                                                                    "is_superuser": True})
+        heavy, created = User.objects.get_or_create(username=HEAVY_USER)
+        if created:
+            Profile.objects.get_or_create(user=heavy)
+            with _keep_uploaded_at(), transaction.atomic():
+                Resume.objects.bulk_create(_resumes([heavy.pk], heavy_resumes, 0), batch_size=BATCH_SIZE)
+        return heavy, admin
+
+    def seed(self, size, per_user):
+        """Add synthetic users, profiles and resumes until there are size resumes"""
+        missing = size - Resume.objects.count()
+        started = time.perf_counter()
+        seeded = User.objects.filter(username__startswith="scale-u").count()
+        while missing > 0:
+            count = min(BATCH_SIZE // per_user or 1, -(-missing // per_user))
+            with _keep_uploaded_at(), transaction.atomic():
+                users = User.objects.bulk_create(
+                    User(username=f"scale-u{seeded + i}", email=f"scale-u{seeded + i}@example.com", password="!")
+                    for i in range(count)
+                )
+                ids = [user.pk for user in users]
+                Profile.objects.bulk_create(Profile(user_id=pk, job_role="Backend Engineer",
+                                                    experience_years=pk % 15) for pk in ids)
+                Resume.objects.bulk_create(_resumes(ids, per_user, seeded * per_user), batch_size=BATCH_SIZE)
+            seeded += count
+            missing -= count * per_user
+
+        # Fresh statistics for the planner and for estimated counts
+        with connection.cursor() as cursor:
+            if connection.vendor == "postgresql":
+                cursor.execute("ANALYZE auth_user, core_profile, resume_resume")
+            else:
+                cursor.execute("ANALYZE")
+        self.stderr.write(f"seeded up to {size} resumes in {time.perf_counter() - started:.1f}s")
+
+    def measure(self, client, url, repeat):
+        """Return the query count, fastest time in ms and query plans of one page"""
+        timings = []
+        # Estimate every unfiltered count, so pages run the same queries at every size
+        with override_settings(ALLOWED_HOSTS=["*"], ESTIMATED_COUNT_THRESHOLD=0):
+            for _ in range(repeat):
+                with CaptureQueriesContext(connection) as captured:
+                    started = time.perf_counter()
+                    response = client.get(url)
+                    timings.append((time.perf_counter() - started) * 1000)
+                if response.status_code != 200:
+                    raise CommandError(f"{url} answered {response.status_code}")
+        plans = [self.explain(query["sql"]) for query in captured.captured_queries]
+        return len(captured.captured_queries), min(timings), plans
+
+    def explain(self, sql):
+        if not sql.lstrip().upper().startswith("SELECT"):
+            return sql.split()[0]
+        with connection.cursor() as cursor:
+            if connection.vendor == "postgresql":
+                cursor.execute(f"EXPLAIN (COSTS OFF) {sql}")
+                return " / ".join(row[0].strip() for row in cursor.fetchall())
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+            return " / ".join(row[-1] for row in cursor.fetchall())
+
+    def compare(self, results, max_growth):
+        failures = []
+        for name, rows in results.items():
+            first, last = rows[0], rows[-1]
+            for size, queries, ms, plans in rows[1:]:
+                if queries != first[1]:
+                    failures.append(f"{name}: {first[1]} queries at {first[0]} rows, {queries} at {size}")
+                elif plans != first[3]:
+                    changed = [f"    {a}\n -> {b}" for a, b in zip(first[3], plans) if a != b]
+                    failures.append(f"{name}: plans changed at {size} rows\n" + "\n".join(changed))
+            if last[2] > first[2] * max_growth:
+                failures.append(f"{name}: {first[2]:.1f} ms at {first[0]} rows, {last[2]:.1f} ms at {last[0]}")
+        return failures
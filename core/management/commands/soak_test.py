@@ -0,0 +1,225 @@
+"""
+Drive thousands of full user flows through one long-lived worker and look for memory growth
+
+    python manage.py soak_test --flows 3000
+    python manage.py soak_test --flows 10000 --worker-class gevent --group-by traceback --frames 10
+
+Starts gunicorn (gunicorn.conf.py, one worker that is never recycled, on a
+throwaway database) with MEMWATCH_ENABLED, pointed at a fake OpenAI server
+that answers every model (named after its task via AI_MODEL_OVERRIDES) with
+the stub provider's content. The module-level OpenAI client, its connection
+pool and the JSON parsing in core/ai_utils.py therefore all run as in
+production. Each flow logs a user in on a fresh cookie jar (so a new
+session), runs an interview through the question pages or the single-page
+submit, generates a roadmap, uploads a resume and lists resumes, reads the
+interviews API and the dashboard, and logs out.
+
+After --warmup flows a staff client starts tracemalloc in the worker through
+/metrics/memory/, and every --sample-every flows it records the worker's RSS
+and traced memory. The report gives the growth per 1000 flows (least-squares
+slope over the samples) and the allocation sites that grew most since the
+warm-up. --max-growth-kb fails the run if traced memory grows faster than
+that per 1000 flows.
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core import memwatch
+from ..fake_openai import fake_openai_env, start_fake_openai
+from .multinode_check import Client
+from .startup_benchmark import _free_port
+
+ROLES = ["Backend Engineer", "Frontend Developer", "Data Scientist", "DevOps Engineer", "Product Manager"]
+INTERVIEW_TYPES = ["technical", "behavioral", "system-design", "mixed"]
+LEVELS = ["entry", "mid", "senior"]
+TASKS = ["questions", "roadmap", "resume_feedback", "evaluation"]
+PASSWORD = "soak-test-password-1"
+PDF = b"%PDF-1.4\n1 0 obj << /Type /Catalog >> endobj\ntrailer << /Root 1 0 R >>\n%%EOF\n"
+
+
+class Command(BaseCommand):
+    help = "Run full interview, roadmap and resume flows through one worker and report memory growth"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--flows", type=int, default=3000)
+        parser.add_argument("--warmup", type=int, default=100, help="Flows before the baseline is taken")
+        parser.add_argument("--sample-every", type=int, default=250)
+        parser.add_argument("--users", type=int, default=20, help="Accounts the flows rotate through")
+        parser.add_argument("--worker-class", choices=("sync", "gthread", "gevent"), default="gthread")
+        parser.add_argument("--frames", type=int, default=1, help="Stack frames kept per allocation")
+        parser.add_argument("--group-by", choices=("lineno", "filename", "traceback"), default="lineno")
+        parser.add_argument("--top", type=int, default=15)
+        parser.add_argument("--max-growth-kb", type=float, help="Fail above this traced growth per 1000 flows")
+
+    def handle(self, *args, **options):
+        fake = start_fake_openai()
+        try:
+            with tempfile.TemporaryDirectory(prefix="soak-") as tmp:
+                tmp = Path(tmp)
+                env = dict(
+                    os.environ,
+                    DATABASE_ENGINE="django.db.backends.sqlite3",
+                    DATABASE_NAME=str(tmp / "db.sqlite3"),
+                    MEDIA_ROOT=str(tmp / "media"),
+                    STATIC_ROOT=str(tmp / "static"),
+                    DEBUG="False",
+                    RATELIMIT_ENABLED="False",
+                    MEMWATCH_ENABLED="True",
+                    MEMWATCH_FRAMES=str(options["frames"]),
+                    MEMWATCH_TOP=str(options["top"]),
+                    GUNICORN_WORKER_CLASS=options["worker_class"],
+                    WEB_CONCURRENCY="1",
+                    GUNICORN_MAX_REQUESTS="0",
+                    **fake_openai_env(fake, TASKS),
+                )
+                manage = [sys.executable, str(Path(settings.BASE_DIR) / "manage.py")]
+                for command in (["migrate", "--noinput"], ["collectstatic", "--noinput"]):
+                    subprocess.run(manage + command, env=env, check=True, capture_output=True)
+                subprocess.run(
+                    manage + ["createsuperuser", "--noinput", "--username", "soak-admin", "--email", "soak@example.com"],
+                    env=dict(env, DJANGO_SUPERUSER_PASSWORD=PASSWORD), check=True, capture_output=True,
+                )
+                self.run_worker(env, tmp / "gunicorn.log", options)
+        finally:
+            fake.shutdown()
+
+    def run_worker(self, env, log_path, options):
+        port = _free_port()
+        base_url = f"http://127.0.0.1:{port}"
+        with open(log_path, "wb") as log:
+            server = subprocess.Popen(
+                [sys.executable, "-m", "gunicorn", "-c", str(Path(settings.BASE_DIR) / "gunicorn.conf.py"),
+                 "--bind", f"127.0.0.1:{port}", "ai_interview_coach.wsgi:application"],
+                cwd=settings.BASE_DIR, env=env, stdout=log, stderr=subprocess.STDOUT,
+            )
+        try:
+            self.wait_for(server, base_url)
+            self.soak(base_url, options)
+        except CommandError:
+            self.stderr.write(log_path.read_text(errors="replace")[-3000:])
+            raise
+        finally:
+            server.terminate()
+            server.wait(timeout=30)
+
+    def wait_for(self, server, base_url, timeout=60):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if server.poll() is not None:
+                raise CommandError("gunicorn exited early")
+            try:
+                urllib.request.urlopen(base_url + "/login/", timeout=2).close()
+                return
+            except urllib.error.HTTPError:
+                # Any status means Django answered
+                return
+            except OSError:
+                time.sleep(0.2)
+        raise CommandError(f"gunicorn did not start within {timeout}s")
+
+    def soak(self, base_url, options):
+        users = [f"soak-{i}" for i in range(options["users"])]
+        for username in users:
+            client = Client([base_url])
+            self.expect(client, "/register/", 200)
+            self.expect(client, "/register/", 302, {"username": username, "email": f"{username}@example.com",
+                                                    "password1": PASSWORD, "password2": PASSWORD})
+        staff = Client([base_url])
+        self.login(staff, "soak-admin")
+
+        samples = []
+        started = time.perf_counter()
+        pid = None
+        self.stdout.write(f"{'flows':>7}{'seconds':>9}{'RSS MB':>9}{'traced MB':>11}")
+        for n in range(options["flows"] + options["warmup"]):
+            self.flow(Client([base_url]), n, users[n % len(users)])
+            flows = n + 1 - options["warmup"]
+            if flows == 0:
+                pid = self.memory(staff, start=1)["pid"]
+            if flows < 0 or flows % options["sample_every"]:
+                continue
+            report = self.memory(staff)
+            if report["pid"] != pid:
+                raise CommandError("The worker was replaced during the soak")
+            rss_mb, traced_mb = report["rss_kb"] / 1024, report["traced_kb"] / 1024
+            samples.append((flows, rss_mb, traced_mb))
+            self.stdout.write(f"{flows:>7}{time.perf_counter() - started:>9.1f}{rss_mb:>9.1f}{traced_mb:>11.2f}")
+
+        report = self.memory(staff, group_by=options["group_by"])
+        self.report(samples, report, options)
+
+    def memory(self, staff, **params):
+        query = "&".join(f"{key}={value}" for key, value in params.items())
+        status, headers, body = self.expect(staff, f"/metrics/memory/?{query}", 200)
+        return json.loads(body)
+
+    def login(self, client, username):
+        self.expect(client, "/login/", 200)
+        self.expect(client, "/login/", 302, {"username": username, "password": PASSWORD})
+
+    def flow(self, client, n, username):
+        """One user's visit: interview, roadmap, resume upload, API and dashboard"""
+        self.login(client, username)
+        self.expect(client, "/dashboard/", 200)
+
+        role = ROLES[n % len(ROLES)]
+        single_page = n % 2 == 0
+        self.expect(client, "/interview/simulate/", 302, {
+            "role": role,
+            "interview_type": INTERVIEW_TYPES[n % len(INTERVIEW_TYPES)],
+            "experience_level": LEVELS[n % len(LEVELS)],
+            "interview_mode": "single" if single_page else "pages",
+        })
+        if single_page:
+            status, headers, body = self.expect(client, "/interview/all/?format=json", 200)
+            questions = json.loads(body)["questions"]
+            answers = [f"Answer {i} to flow {n}. " * 20 for i in range(len(questions))]
+            self.expect(client, "/interview/submit/", 302, {"answers": answers})
+        else:
+            while client.request("/interview/question/")[0] == 200:
+                self.expect(client, "/interview/question/", 302, {"answer": f"Answer to flow {n}. " * 20})
+        self.expect(client, "/interview/complete/", 200)
+
+        self.expect(client, "/roadmap/", 200, {
+            "job_role": role,
+            "experience_years": n % 12,
+            "target_skills": ["Python", "SQL"] if n % 3 else [],
+        })
+        self.expect(client, "/resume/upload/", 302, {"title": f"Resume {n}"}, files={"file": (f"soak-{n}.pdf", PDF)})
+        self.expect(client, "/resume/", 200)
+        self.expect(client, "/api/v1/interviews/", 200)
+        self.expect(client, "/logout/", 302, {})
+
+    def expect(self, client, path, status, data=None, files=None):
+        response = client.request(path, data, files)
+        if response[0] != status:
+            raise CommandError(f"{path} answered {response[0]}, expected {status}")
+        return response
+
+    def report(self, samples, report, options):
+        if len(samples) > 1:
+            flows = [sample[0] for sample in samples]
+            rss_slope = statistics.linear_regression(flows, [sample[1] for sample in samples]).slope
+            traced_slope = statistics.linear_regression(flows, [sample[2] for sample in samples]).slope
+            rss_kb, traced_kb = rss_slope * 1024 * 1000, traced_slope * 1024 * 1000
+        else:
+            rss_kb = traced_kb = 0.0
+        self.stdout.write(f"\nGrowth per 1000 flows: RSS {rss_kb:+.0f} KB, traced {traced_kb:+.0f} KB")
+        self.stdout.write(f"Top growth sites since the warm-up (by {options['group_by']}):")
+        for line in memwatch.format_growth(report.get("growth", [])):
+            self.stdout.write(f"  {line}")
+
+        limit = options["max_growth_kb"]
+        if limit is not None and traced_kb > limit:
+            raise CommandError(f"Traced memory grows {traced_kb:.0f} KB per 1000 flows (limit {limit:.0f})")
@@ -0,0 +1,163 @@
+"""
+Measure cold-start cost: import time, time to first response and worker RSS
+
+    python manage.py startup_benchmark --workers 2
+    python manage.py startup_benchmark --no-preload
+"""
+import os
+import re
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+IMPORT_SCRIPT = "import django; django.setup(); from django.urls import get_resolver; get_resolver().url_patterns"
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _memory_kb(pid, path, field):
+    try:
+        with open(f"/proc/{pid}/{path}") as f:
+            for line in f:
+                if line.startswith(field):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def _rss_kb(pid):
+    """Resident set size of a process in KB (Linux only)"""
+    return _memory_kb(pid, "status", "VmRSS:")
+
+
+def _pss_kb(pid):
+    """Proportional set size in KB: shared copy-on-write pages are split between sharers"""
+    return _memory_kb(pid, "smaps_rollup", "Pss:")
+
+
+def _child_pids(parent_pid):
+    pids = []
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                # ppid is the 4th field, after the parenthesised command name
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        if ppid == parent_pid:
+            pids.append(int(entry))
+    return pids
+
+
+class Command(BaseCommand):
+    help = "Report import time (-X importtime), time to first response and per-worker RSS"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=2)
+        parser.add_argument("--no-preload", action="store_true", help="Start gunicorn without preload_app")
+        parser.add_argument("--path", default="/login/", help="URL path used for the first request")
+        parser.add_argument("--top", type=int, default=15, help="Number of slowest imports to list")
+        parser.add_argument("--timeout", type=float, default=60.0)
+
+    def handle(self, *args, **options):
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE=os.environ.get("DJANGO_SETTINGS_MODULE", "ai_interview_coach.settings"))
+        self.report_import_time(env, options["top"])
+        self.report_first_response(env, options)
+
+    def report_import_time(self, env, top):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", IMPORT_SCRIPT],
+            cwd=settings.BASE_DIR, env=env, capture_output=True, text=True,
+        )
+        if result.returncode != 0:
+            raise CommandError(f"Importing the project failed:\n{result.stderr[-2000:]}")
+
+        imports = []
+        for line in result.stderr.splitlines():
+            match = IMPORTTIME_LINE.match(line)
+            if match:
+                self_us, cumulative_us, indent, module = match.groups()
+                imports.append((int(cumulative_us), int(self_us), len(indent) // 2, module))
+
+        total_us = sum(cumulative for cumulative, _, depth, _ in imports if depth == 0)
+        self.stdout.write(f"Import time (django.setup + URLconf): {total_us / 1000:.1f} ms across {len(imports)} modules")
+        top_level = sorted((i for i in imports if i[2] == 0), reverse=True)[:top]
+        for cumulative, _, _, module in top_level:
+            self.stdout.write(f"  {cumulative / 1000:8.1f} ms  {module}")
+
+    def report_first_response(self, env, options):
+        port = _free_port()
+        command = [
+            sys.executable, "-m", "gunicorn",
+            "-c", str(settings.BASE_DIR / "gunicorn.conf.py"),
+            "--bind", f"127.0.0.1:{port}",
+            "--workers", str(options["workers"]),
+            "ai_interview_coach.wsgi:application",
+        ]
+        env = dict(env, GUNICORN_PRELOAD="False" if options["no_preload"] else "True")
+
+        log = tempfile.TemporaryFile()
+        started = time.perf_counter()
+        server = subprocess.Popen(command, cwd=settings.BASE_DIR, env=env,
+                                  stdout=subprocess.DEVNULL, stderr=log)
+        try:
+            first_response = self.wait_for_response(server, port, options["path"], started, options["timeout"], log)
+            self.stdout.write(
+                f"Time to first response ({options['path']}, preload={'off' if options['no_preload'] else 'on'}): "
+                f"{first_response * 1000:.0f} ms"
+            )
+
+            # Touch every worker once so each one has served a request
+            for _ in range(options["workers"] * 2):
+                self.fetch(port, options["path"])
+
+            master_rss = _rss_kb(server.pid)
+            if master_rss is None:
+                self.stdout.write("RSS: unavailable (needs /proc)")
+                return
+            self.stdout.write(f"Master RSS: {master_rss / 1024:.1f} MB")
+            for pid in _child_pids(server.pid):
+                rss, pss = _rss_kb(pid), _pss_kb(pid)
+                if rss is not None:
+                    pss_text = f", PSS {pss / 1024:.1f} MB" if pss is not None else ""
+                    self.stdout.write(f"Worker {pid} RSS: {rss / 1024:.1f} MB{pss_text}")
+        finally:
+            server.terminate()
+            server.wait(timeout=10)
+            log.close()
+
+    def wait_for_response(self, server, port, path, started, timeout, log):
+        while time.perf_counter() - started < timeout:
+            if server.poll() is not None:
+                log.seek(0)
+                raise CommandError(f"gunicorn exited early:\n{log.read().decode()[-2000:]}")
+            if self.fetch(port, path):
+                return time.perf_counter() - started
+            time.sleep(0.01)
+        raise CommandError(f"No response from gunicorn within {timeout:.0f}s")
+
+    def fetch(self, port, path):
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}{path}", timeout=5) as response:
+                response.read()
+            return True
+        except urllib.error.HTTPError:
+            # Any HTTP status (including redirects to login) means Django answered
+            return True
+        except OSError:
+            return False
@@ -0,0 +1,86 @@
+"""
+Fake OpenAI server for the commands that benchmark gunicorn against a "local" provider
+
+The server answers every chat completion with the stub provider's content, so
+the OpenAI client, its connection pool and the JSON parsing in
+core/ai_utils.py run as in production. The stub needs the task, so each task
+is routed to a model named after it through AI_MODEL_OVERRIDES; fake_openai_env()
+gives the environment variables that do that.
+"""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from core.providers import StubProvider
+
+
+def _handler(latency):
+    stub = StubProvider("fake-openai", latency)
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self):
+            request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+            # Each task is routed to a model named after it
+            response = stub.complete(request["model"], request["messages"], request["model"])
+            self.send_json({
+                "id": "chatcmpl-fake",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": request["model"],
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": response.choices[0].message.content},
+                    "finish_reason": "stop",
+                }],
+                "usage": {
+                    "prompt_tokens": response.usage.prompt_tokens,
+                    "completion_tokens": response.usage.completion_tokens,
+                    "total_tokens": response.usage.prompt_tokens + response.usage.completion_tokens,
+                },
+            })
+
+        def do_GET(self):
+            self.send_json({"object": "list", "data": []})
+
+        def send_json(self, data):
+            body = json.dumps(data).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+def start_fake_openai(latency=0.0):
+    """
+    Serve chat completions on a free local port from a background thread
+
+    Args:
+        latency: Seconds each completion takes
+
+    Returns:
+        The running server; call its shutdown() when done
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _handler(latency))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def fake_openai_env(server, tasks):
+    """Environment variables that send the given tasks to the server as the only provider"""
+    return {
+        "AI_PROVIDER_ORDER": "local",
+        "LOCAL_LLM_BASE_URL": f"http://127.0.0.1:{server.server_address[1]}/v1",
+        "LOCAL_LLM_API_KEY": "fake",
+        "LOCAL_LLM_MODEL": "",
+        "AI_MODEL_OVERRIDES": json.dumps({task: {"model": task} for task in tasks}),
+    }
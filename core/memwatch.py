@@ -0,0 +1,155 @@
+"""
+Memory growth tracking with tracemalloc
+
+`manage.py soak_test` uses these helpers to find allocation sites that grow
+over thousands of flows. In production the same diff can be taken from a live
+worker when settings.MEMWATCH_ENABLED is on: the first SIGUSR2 sent to a
+gunicorn worker (or a staff GET of /metrics/memory/?start=1, which reaches
+whichever worker serves it) starts tracing and records a baseline; every
+later signal logs the top growth sites since the previous one, and the
+endpoint returns them since the baseline (?rebase=1 moves it). tracemalloc only
+sees allocations made after it starts and slows the worker down while it
+runs; /metrics/memory/?stop=1 turns it off again.
+"""
+import gc
+import os
+import signal
+import threading
+import time
+import tracemalloc
+
+from django.conf import settings
+
+# Allocations of tracemalloc itself and of the import machinery are not leaks
+_IGNORED = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+_lock = threading.Lock()
+_baseline = None
+_baseline_at = None
+
+
+def rss_kb():
+    """Resident set size of this process in KB (Linux), or None"""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def take_snapshot():
+    """Collect garbage, then snapshot the traced allocations without tracemalloc's own"""
+    gc.collect()
+    return tracemalloc.take_snapshot().filter_traces(_IGNORED)
+
+
+def top_growth(old, new, limit=10, key_type="lineno"):
+    """
+    The allocation sites that grew the most between two snapshots
+
+    Args:
+        old: Earlier tracemalloc.Snapshot
+        new: Later tracemalloc.Snapshot
+        limit: Number of sites to return
+        key_type: "lineno", "filename" or "traceback"
+
+    Returns:
+        List of dicts with site (list of "file:line" frames, innermost
+        last), size_kb, size_diff_kb, count and count_diff
+    """
+    stats = [stat for stat in new.compare_to(old, key_type) if stat.size_diff > 0]
+    return [
+        {
+            "site": [f"{frame.filename}:{frame.lineno}" for frame in stat.traceback],
+            "size_kb": round(stat.size / 1024, 1),
+            "size_diff_kb": round(stat.size_diff / 1024, 1),
+            "count": stat.count,
+            "count_diff": stat.count_diff,
+        }
+        for stat in stats[:limit]
+    ]
+
+
+def format_growth(growth):
+    """Lines of text for top_growth() results"""
+    lines = []
+    for entry in growth:
+        lines.append(f"{entry['size_diff_kb']:>+10.1f} KB {entry['count_diff']:>+8} blocks  {entry['site'][-1]}")
+        for frame in reversed(entry["site"][:-1]):
+            lines.append(f"{'':>32}{frame}")
+    return lines
+
+
+def start(frames=None):
+    """Start tracing (if needed) and record the baseline later diffs are taken against"""
+    global _baseline, _baseline_at
+    with _lock:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames or settings.MEMWATCH_FRAMES)
+        _baseline = take_snapshot()
+        _baseline_at = time.time()
+
+
+def stop():
+    """Stop tracing and forget the baseline"""
+    global _baseline, _baseline_at
+    with _lock:
+        tracemalloc.stop()
+        _baseline = _baseline_at = None
+
+
+def growth_report(limit=10, key_type="lineno", rebase=False):
+    """
+    This process's memory and top growth sites since start()
+
+    Args:
+        limit: Number of sites to report
+        key_type: "lineno", "filename" or "traceback"
+        rebase: Make the current state the new baseline
+
+    Returns:
+        Dictionary with pid, rss_kb, tracing and, while tracing, traced_kb,
+        seconds since the baseline and growth (see top_growth)
+    """
+    global _baseline, _baseline_at
+    report = {"pid": os.getpid(), "rss_kb": rss_kb(), "tracing": tracemalloc.is_tracing()}
+    with _lock:
+        if not report["tracing"] or _baseline is None:
+            return report
+        snapshot = take_snapshot()
+        report["traced_kb"] = round(tracemalloc.get_traced_memory()[0] / 1024, 1)
+        report["seconds"] = round(time.time() - _baseline_at)
+        report["growth"] = top_growth(_baseline, snapshot, limit, key_type)
+        if rebase:
+            _baseline, _baseline_at = snapshot, time.time()
+    return report
+
+
+def _log_growth():
+    if not tracemalloc.is_tracing():
+        start()
+        print(f"memwatch: pid {os.getpid()} started tracing; send SIGUSR2 again for the growth since now")
+        return
+    report = growth_report(limit=settings.MEMWATCH_TOP, key_type="traceback", rebase=True)
+    print(f"memwatch: pid {report['pid']} rss {report['rss_kb']} KB, traced {report['traced_kb']} KB, "
+          f"top growth over {report['seconds']}s:")
+    for line in format_growth(report["growth"]):
+        print(f"memwatch: {line}")
+
+
+def _handle_signal(signum, frame):
+    # Snapshots take a while; don't hold up whatever the main thread was doing
+    threading.Thread(target=_log_growth, name="memwatch", daemon=True).start()
+
+
+def install_signal_handler():
+    """Log the growth since the previous SIGUSR2 on each SIGUSR2 (call from the main thread)"""
+    signal.signal(signal.SIGUSR2, _handle_signal)
@@ -0,0 +1,28 @@
+# Generated by Django 5.0 on 2026-10-19 12:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='profile',
+            name='daily_token_quota',
+            field=models.PositiveIntegerField(blank=True, help_text='Leave empty to use the site default.', null=True),
+        ),
+        migrations.AddField(
+            model_name='profile',
+            name='tokens_used',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='profile',
+            name='tokens_used_on',
+            field=models.DateField(blank=True, null=True),
+        ),
+    ]
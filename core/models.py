@@ -1,3 +1,4 @@
+from django.conf import settings
 from django.db import models
 from django.contrib.auth.models import User
 
@@ -6,8 +7,18 @@ class Profile(models.Model):
     job_role = models.CharField(max_length=100, blank=True)
     experience_years = models.IntegerField(default=0)
     resume = models.FileField(upload_to='resumes/', blank=True, null=True)
+    # Daily AI token accounting (see core/ratelimit.py)
+    daily_token_quota = models.PositiveIntegerField(blank=True, null=True, help_text='Leave empty to use the site default.')
+    tokens_used = models.PositiveIntegerField(default=0)
+    tokens_used_on = models.DateField(blank=True, null=True)
 
     def __str__(self):
         return self.user.username
 
+    @property
+    def token_quota(self):
+        if self.daily_token_quota is not None:
+            return self.daily_token_quota
+        return settings.AI_DAILY_TOKEN_QUOTA
+
 
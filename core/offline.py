@@ -0,0 +1,584 @@
+"""
+Offline content engine: roadmaps, questions and feedback without an AI provider
+
+Everything the app generates has a fallback for when no provider is
+configured or every provider fails. This module builds that fallback from a
+curated dataset (core/data/offline_content.json) instead of fixed text:
+
+- a job role maps to a role family (backend, data analyst, devops, ...) by
+  its aliases, and each family lists the topics that matter at the entry,
+  mid and senior levels;
+- every topic has level-specific subtopics, resources, projects and
+  interview questions with the key points an interviewer listens for;
+- answers and resumes get heuristic feedback: key-point coverage, length,
+  examples, numbers, STAR structure or reasoning, action verbs and role
+  keywords.
+
+The dataset is read and indexed once per process (load_content()); gunicorn
+loads it in the master so preloaded workers share it. After that every
+generator is a few dictionary lookups and returns fresh objects the caller
+may change. `manage.py offline_benchmark` measures them.
+"""
+import json
+import re
+import threading
+from collections import Counter
+from functools import lru_cache
+from pathlib import Path
+
+DATA_PATH = Path(__file__).resolve().parent / "data" / "offline_content.json"
+LEVELS = ("entry", "mid", "senior")
+WEEKS = {"entry": 4, "mid": 3, "senior": 2}
+MODULE_TOPICS = 5
+
+_content = None
+_content_lock = threading.Lock()
+
+# Dots only inside a word ("node.js"), not at the end of a sentence
+_WORD = re.compile(r"[a-z0-9](?:[a-z0-9+#/'-]|\.(?=[a-z0-9]))*")
+_NUMBER = re.compile(r"\d|\bpercent\b|\bhalf\b|\btwice\b|\bdoubled?\b|\btripled?\b")
+_EMAIL = re.compile(r"[\w.+-]+@[\w-]+\.[\w.]+")
+_PHONE = re.compile(r"\+?\d[\d\s().-]{7,}\d")
+_BULLET = re.compile(r"^[\s•▪◦●*·\-–]+")
+_BEHAVIORAL_QUESTION = re.compile(r"\b(a time|tell me about|describe a situation|where do you see|why do you want)\b")
+_SUFFIXES = ("ations", "ation", "ings", "ing", "ness", "ment", "ions", "ion", "ers", "er", "es", "ed", "ly", "s")
+_STOP = frozenset("""
+a an and are as at be by can do does for from has have how if in into is it its of on or our so than that the
+their them then there these they this to was we were what when where which while who why will with you your
+use used using about also any each more most not only other some such very would could should
+""".split())
+
+EXAMPLE_MARKERS = ("for example", "for instance", "such as", "in my ", "at my ", "i built", "we built", "i used",
+                   "we used", "i worked", "on a project", "in one project", "last year", "recently")
+REASONING_MARKERS = ("because", "trade-off", "tradeoff", "trade off", "instead of", "rather than", "however",
+                     "depends on", "so that", "which means", "downside", "alternatively", "the cost")
+STAR_MARKERS = {
+    "situation": ("when i", "at my", "while working", "in my previous", "in my last", "situation", "during", "we had"),
+    "task": ("my goal", "the goal", "needed to", "my task", "responsible for", "had to", "was asked", "my role"),
+    "action": ("i decided", "i built", "i led", "i created", "i proposed", "i implemented", "i organized",
+               "i talked", "i worked", "i started", "i set up", "i wrote", "i changed", "i suggested", "so i"),
+    "result": ("as a result", "result", "led to", "reduced", "increased", "improved", "saved", "in the end",
+               "outcome", "learned", "which meant"),
+}
+
+GOOD_POINTS = {
+    "length": "Enough detail without rambling",
+    "example": "Used a concrete example",
+    "quantify": "Backed it up with numbers",
+    "structure": "Clear STAR structure: situation, task, action and result",
+    "reasoning": "Explained the reasoning and trade-offs",
+}
+STRENGTHS = {
+    "coverage": "Covered most of the key points interviewers look for",
+    "length": "Answers were detailed without rambling",
+    "example": "Grounded answers in concrete examples",
+    "quantify": "Backed answers up with numbers",
+    "structure": "Told clear, well-structured stories",
+    "reasoning": "Explained the reasoning and trade-offs behind choices",
+}
+IMPROVEMENTS = {
+    "coverage": "Cover more of the key points each question is asking about",
+    "short": "Give fuller answers that show depth",
+    "long": "Keep answers focused and concise",
+    "example": "Add specific examples from your own experience",
+    "quantify": "Quantify outcomes with numbers",
+    "structure": "Structure answers with the STAR method",
+    "reasoning": "Explain why, not just what: trade-offs and alternatives",
+}
+
+
+def _words(text):
+    return _WORD.findall(text.lower())
+
+
+@lru_cache(maxsize=8192)
+def _stem(word):
+    """A crude stem: one common suffix off, then at most six characters"""
+    if word.endswith("ies") and len(word) > 4:
+        word = word[:-3] + "y"
+    else:
+        for suffix in _SUFFIXES:
+            if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+                word = word[:-len(suffix)]
+                break
+    if word.endswith("e") and len(word) > 4:
+        word = word[:-1]
+    return word[:6]
+
+
+def _terms(words):
+    return {_stem(word) for word in words if len(word) > 2 and word not in _STOP}
+
+
+@lru_cache(maxsize=4096)
+def _point_terms(point):
+    # Key points repeat across answers and interviews (most come from the dataset)
+    return frozenset(_terms(_words(point)))
+
+
+def _padded(text):
+    """Lowercase words joined by single spaces, with a space on either side for whole-word matching"""
+    return f" {' '.join(_words(text))} "
+
+
+def _compile(data):
+    topics = data["topics"]
+    default = data["default_family"]
+    aliases = [(name == default, _padded(alias), name)
+               for name, family in data["families"].items() for alias in family["aliases"]]
+    topic_aliases = [(_padded(alias), name) for name, topic in topics.items() for alias in topic["aliases"]]
+    index = {}
+    for name, topic in topics.items():
+        for alias in [name, topic["title"]] + topic["aliases"]:
+            index.setdefault(" ".join(_words(alias)), name)
+    families = {}
+    for name, family in data["families"].items():
+        covered = list(dict.fromkeys(topic for level in LEVELS for topic in family["levels"][level]))
+        families[name] = {
+            "levels": family["levels"],
+            # Resume keywords: each of the family's skill topics and the words that show it
+            "keywords": [(topic, tuple(_padded(alias) for alias in [topic] + topics[topic]["aliases"]))
+                         for topic in covered if topics[topic]["kind"] != "behavioral"],
+        }
+    resume = data["resume"]
+    return {
+        "version": data["version"],
+        "topics": topics,
+        "families": families,
+        "default_family": default,
+        # Generic titles ("engineer", "developer") last, then longest alias first
+        "aliases": [(alias, name) for generic, alias, name in sorted(aliases, key=lambda a: (a[0], -len(a[1])))],
+        "topic_aliases": sorted(topic_aliases, key=lambda pair: -len(pair[0])),
+        "topic_index": index,
+        "questions": {name: {q["level"]: q for q in topic["questions"]} for name, topic in topics.items()},
+        "interview_types": data["interview_types"],
+        "generic_skill": data["generic_skill"],
+        "interview_prep": data["interview_prep"],
+        "answer_structures": data["answer_structures"],
+        "tips": data["tips"],
+        "sections": {name: tuple(_padded(word) for word in words) for name, words in resume["sections"].items()},
+        "action_verbs": frozenset(resume["action_verbs"]),
+        "weak_phrases": tuple(resume["weak_phrases"]),
+    }
+
+
+def load_content():
+    """
+    The indexed offline dataset, read on first use and kept for the process
+
+    Returns:
+        Dictionary of the dataset's topics, role families and lookup indexes
+    """
+    global _content
+    if _content is None:
+        with _content_lock:
+            if _content is None:
+                with open(DATA_PATH, encoding="utf-8") as f:
+                    _content = _compile(json.load(f))
+    return _content
+
+
+def _level(level):
+    return level if level in LEVELS else "mid"
+
+
+def _fill(text, role, skill=""):
+    return text.replace("{role}", role).replace("{skill}", skill)
+
+
+@lru_cache(maxsize=512)
+def role_family(role):
+    """
+    The role family a job title belongs to ("backend", "data_analyst", ...)
+
+    Unknown titles belong to the general software family.
+    """
+    content = load_content()
+    padded = _padded(role or "")
+    for alias, family in content["aliases"]:
+        if alias in padded:
+            return family
+    return content["default_family"]
+
+
+@lru_cache(maxsize=512)
+def topic_for(name):
+    """
+    The dataset topic a skill, focus area or module title is about
+
+    Args:
+        name: E.g. "sql", "Docker", "Caching Strategies" or a recommender topic
+
+    Returns:
+        The topic's name, or None if nothing in the dataset matches
+    """
+    content = load_content()
+    words = " ".join(_words(name or ""))
+    if words in content["topic_index"]:
+        return content["topic_index"][words]
+    padded = f" {words} "
+    for alias, topic in content["topic_aliases"]:
+        if alias in padded:
+            return topic
+    return None
+
+
+def _level_topics(items, level):
+    """The slice of a topic's subtopics that suits a level: basics first, advanced last"""
+    spare = max(len(items) - MODULE_TOPICS, 0)
+    start = {"entry": 0, "mid": spare // 2, "senior": spare}[level]
+    return items[start:start + MODULE_TOPICS]
+
+
+def _projects(projects, level, role, skill=""):
+    result = [_fill(projects[level], role, skill)]
+    if level != "senior":
+        harder = LEVELS[LEVELS.index(level) + 1]
+        result.append(f"Stretch goal: {_fill(projects[harder], role, skill)}")
+    return result
+
+
+def _topic_module(name, level, role):
+    topic = load_content()["topics"][name]
+    return {
+        "title": topic["title"],
+        "timeline": f"{WEEKS[level]} weeks",
+        "topics": _level_topics(topic["topics"], level),
+        "resources": list(topic["resources"]),
+        "projects": _projects(topic["projects"], level, role),
+    }
+
+
+def _skill_module(skill, level, role, covered):
+    """A module dedicated to a target skill: its topic's module if the dataset knows it, else a generic one"""
+    name = topic_for(skill)
+    if name is not None and name not in covered:
+        covered.add(name)
+        module = _topic_module(name, level, role)
+        if skill.lower() != name.lower():
+            module["title"] = f"{skill}: {module['title']}"
+    else:
+        generic = load_content()["generic_skill"]
+        module = {
+            "title": f"{skill} for {role}",
+            "timeline": f"{max(WEEKS[level] - 1, 2)} weeks",
+            "topics": _level_topics([_fill(topic, role, skill) for topic in generic["topics"]], level),
+            "resources": [_fill(resource, role, skill) for resource in generic["resources"]],
+            "projects": _projects(generic["projects"], level, role, skill),
+        }
+    module["skill"] = skill
+    return module
+
+
+def _prep_module(level, role):
+    prep = load_content()["interview_prep"]
+    return {
+        "title": _fill(prep["title"], role),
+        "timeline": "2 weeks",
+        "topics": list(prep["topics"]),
+        "resources": list(prep["resources"]),
+        "projects": [_fill(prep["projects"][level], role)],
+    }
+
+
+def roadmap(job_role, level, target_skills=None):
+    """
+    A learning roadmap for a role and level
+
+    Args:
+        job_role: Target job role
+        level: "entry", "mid" or "senior"
+        target_skills: Optional skills to give a module each; every such
+            module has a "skill" field with the skill's name
+
+    Returns:
+        {"modules": [...]}: the family's core topics for the level, one
+        module per target skill, then interview preparation
+    """
+    role = (job_role or "").strip() or "this role"
+    level = _level(level)
+    covered = set()
+    skill_modules = [_skill_module(skill, level, role, covered) for skill in target_skills or []]
+    core = [name for name in load_content()["families"][role_family(role)]["levels"][level] if name not in covered]
+    modules = [_topic_module(name, level, role) for name in core[:max(2, MODULE_TOPICS - len(skill_modules))]]
+    return {"modules": modules + skill_modules + [_prep_module(level, role)]}
+
+
+def roadmap_module(job_role, level, skill=None, module=None):
+    """
+    One roadmap module: a new one for a skill, or an existing one for another level
+
+    A module whose title matches a dataset topic is rebuilt for the level
+    (keeping its title); other modules are returned as they are.
+    """
+    role = (job_role or "").strip() or "this role"
+    level = _level(level)
+    if module is None:
+        return _skill_module(skill or "General skills", level, role, set())
+    title = str(module.get("title") or "")
+    if title == _fill(load_content()["interview_prep"]["title"], role):
+        return _prep_module(level, role)
+    name = topic_for(title)
+    if name is None:
+        return dict(module)
+    return dict(_topic_module(name, level, role), title=title)
+
+
+def _ordered_topics(family, level, interview_type):
+    """Topics to ask about for an interview type, the family's own first"""
+    content = load_content()
+    kinds = {"technical": ("technical", "both"), "behavioral": ("behavioral", "both")}.get(interview_type, ())
+    base = content["interview_types"][interview_type]
+    own = [name for name in family["levels"][level] if name in base or content["topics"][name]["kind"] in kinds]
+    return list(dict.fromkeys(own + base))
+
+
+def _structure(name, interview_type):
+    kind = load_content()["topics"][name]["kind"]
+    if kind == "behavioral" or (kind == "both" and interview_type == "behavioral"):
+        return "behavioral"
+    return "design" if interview_type == "system-design" or name == "System Design" else "technical"
+
+
+def questions(role, interview_type, level, num_questions=5, focus_areas=None):
+    """
+    Interview questions for a role, interview type and level
+
+    Args:
+        role: Job title
+        interview_type: "technical", "behavioral", "system-design" or "mixed"
+        level: "entry", "mid" or "senior"
+        num_questions: Number of questions
+        focus_areas: Optional topics the candidate is weak in; up to half
+            of the questions come from them
+
+    Returns:
+        List of {"question", "key_points", "sample_answer_structure"}
+    """
+    content = load_content()
+    role = (role or "").strip() or "this role"
+    level = _level(level)
+    family = content["families"][role_family(role)]
+    if interview_type in content["interview_types"]:
+        candidates = _ordered_topics(family, level, interview_type)
+    else:
+        # Mixed: alternate technical and behavioral topics
+        technical = _ordered_topics(family, level, "technical")
+        behavioral = [name for name in _ordered_topics(family, level, "behavioral") if name not in technical]
+        candidates = [name for pair in zip(technical, behavioral) for name in pair]
+        candidates += technical[len(behavioral):] + behavioral[len(technical):]
+    focus = [name for name in dict.fromkeys(topic_for(area) for area in focus_areas or []) if name]
+    candidates = list(dict.fromkeys(focus[:(num_questions + 1) // 2] + candidates))
+
+    # The level's own question from every topic first, then the nearest levels'
+    levels = sorted(LEVELS, key=lambda other: abs(LEVELS.index(other) - LEVELS.index(level)))
+    picks = [(name, question_level) for question_level in levels for name in candidates]
+    if interview_type == "system-design":
+        # Every design question before the other topics' questions
+        picks.sort(key=lambda pick: pick[0] != "System Design")
+    result = []
+    for name, question_level in picks[:num_questions]:
+        question = content["questions"][name][question_level]
+        result.append({
+            "question": _fill(question["question"], role),
+            "key_points": list(question["points"]),
+            "sample_answer_structure": content["answer_structures"][_structure(name, interview_type)],
+        })
+    return result
+
+
+def _has_any(text, markers):
+    return any(marker in text for marker in markers)
+
+
+def _assess(pair, interview_type):
+    """Score one answer; returns (score, feedback, strengths, weaknesses)"""
+    question = str(pair.get("question") or "")
+    answer = str(pair.get("user_answer") or "")
+    points = [str(point) for point in pair.get("expected_points") or [] if isinstance(point, (str, int, float))]
+    tokens = _words(answer)
+    text = f" {' '.join(tokens)} "
+    words = len(tokens)
+    if not words:
+        return 0, {"score": 0, "good_points": [], "improvements": ["No answer was given"],
+                   "tips": ["Even a partial answer with your reasoning earns credit"]}, [], ["short"]
+
+    stems = _terms(tokens)
+    covered, missing = [], []
+    for point in points:
+        terms = _point_terms(point)
+        # Key points carry qualifiers ("Missing or unused indexes"); a third of their terms will do
+        (covered if terms and len(terms & stems) * 3 >= len(terms) else missing).append(point)
+    coverage = len(covered) / len(points) if points else 0.5
+    behavioral = interview_type == "behavioral" or (
+        interview_type not in ("technical", "system-design") and _BEHAVIORAL_QUESTION.search(question.lower()))
+
+    strengths, weaknesses = [], []
+    if coverage >= 0.75:
+        strengths.append("coverage")
+    elif points:
+        weaknesses.append("coverage")
+    length = 2 if 60 <= words <= 350 else 1 if words >= 25 else 0
+    if length == 2:
+        strengths.append("length")
+    else:
+        weaknesses.append("short" if words < 60 else "long")
+    example = _has_any(text, EXAMPLE_MARKERS)
+    (strengths if example else weaknesses).append("example")
+    quantified = bool(_NUMBER.search(answer.lower()))
+    (strengths if quantified else weaknesses).append("quantify")
+    if behavioral:
+        parts = sum(_has_any(text, markers) for markers in STAR_MARKERS.values())
+        structure = 1 if parts >= 3 else 0.5 if parts == 2 else 0
+        (strengths if parts >= 3 else weaknesses).append("structure")
+    else:
+        structure = 1 if _has_any(text, REASONING_MARKERS) else 0
+        (strengths if structure else weaknesses).append("reasoning")
+
+    score = max(1, min(10, round(5 * coverage + length + example + quantified + structure)))
+    good_points = []
+    if covered:
+        good_points.append(f"Covered {', '.join(covered[:3]).lower()}")
+    good_points += [GOOD_POINTS[name] for name in strengths if name != "coverage"]
+    improvements = []
+    if missing:
+        improvements.append(f"Also address: {', '.join(missing[:3]).lower()}")
+    for name in weaknesses:
+        if name == "short":
+            improvements.append(f"At {words} words the answer is too brief to show depth")
+        elif name == "long":
+            improvements.append(f"At {words} words the answer is hard to follow; lead with the main point")
+        elif name == "quantify" and not behavioral:
+            improvements.append("Mention concrete numbers: complexity, latency, data sizes or scale")
+        elif name != "coverage":
+            improvements.append(IMPROVEMENTS[name])
+    tips = load_content()["tips"]
+    feedback = {
+        "score": score,
+        "good_points": good_points or ["You attempted the question"],
+        "improvements": improvements or ["Add one more example or trade-off to make the answer stand out"],
+        "tips": [tips[name][0] for name in weaknesses[:2]] or [tips["reasoning"][1]],
+    }
+    return score, feedback, strengths, weaknesses
+
+
+def evaluate(qa_pairs, interview_type=None):
+    """
+    Heuristic marks and feedback for interview answers
+
+    Args:
+        qa_pairs: List of {"question", "expected_points", "user_answer"}
+        interview_type: The interview's type, which decides whether answers
+            are checked for STAR structure or for reasoning
+
+    Returns:
+        Dictionary with overall_score, overall_feedback and question_feedback,
+        shaped like the AI evaluation
+    """
+    question_feedback, scores = [], []
+    strengths, weaknesses = Counter(), Counter()
+    for pair in qa_pairs:
+        score, feedback, good, weak = _assess(pair if isinstance(pair, dict) else {}, interview_type)
+        question_feedback.append(feedback)
+        scores.append(score)
+        strengths.update(good)
+        weaknesses.update(weak)
+
+    total = len(scores)
+    weak_order = [name for name, count in weaknesses.most_common()]
+    tips = load_content()["tips"]
+    overall_tips = list(dict.fromkeys(tip for name in weak_order for tip in tips[name]))[:3]
+    for tip in tips["structure"] + tips["example"]:
+        if len(overall_tips) < 3 and tip not in overall_tips:
+            overall_tips.append(tip)
+    return {
+        "overall_score": round(sum(scores) / total, 1) if total else 0.0,
+        "overall_feedback": {
+            "strengths": [STRENGTHS[name] for name, count in strengths.most_common(3)]
+                         or (["You completed the interview"] if total else []),
+            "improvements": [f"{IMPROVEMENTS[name]} ({count} of {total} answers)"
+                             for name, count in weaknesses.most_common(3)],
+            "tips": overall_tips,
+        },
+        "question_feedback": question_feedback,
+    }
+
+
+def resume_feedback(resume_text, target_role):
+    """
+    Heuristic resume review for a target role
+
+    Checks the usual sections, contact details, quantified and action-verb
+    bullets, weak phrasing, length and the keywords of the role's family.
+
+    Returns:
+        Dictionary with overall_score (0-100), strengths, improvements,
+        suggestions and missing_keywords
+    """
+    content = load_content()
+    text = resume_text or ""
+    lower = text.lower()
+    padded = _padded(text)
+    lines = [_BULLET.sub("", line).strip() for line in text.splitlines()]
+    lines = [line for line in lines if len(line.split()) >= 4]
+    words = len(_words(text))
+
+    sections = {name for name, headers in content["sections"].items() if _has_any(padded, headers)}
+    quantified = sum(bool(_NUMBER.search(line.lower())) for line in lines)
+    verbs = sum(line.split()[0].lower().strip(",.:;") in content["action_verbs"] for line in lines)
+    weak = [phrase for phrase in content["weak_phrases"] if phrase in lower]
+    links = "linkedin" in lower or "github" in lower
+    keywords = content["families"][role_family(target_role or "")]["keywords"]
+    found = [topic for topic, aliases in keywords if _has_any(padded, aliases)]
+    missing = [topic for topic, aliases in keywords if topic not in found]
+
+    score = 30
+    score += 5 * len(sections & {"experience", "education", "skills"}) + 3 * ("projects" in sections)
+    score += 2 * ("summary" in sections)
+    score += 4 * bool(_EMAIL.search(text)) + 2 * bool(_PHONE.search(text)) + 2 * links
+    score += min(12, 3 * quantified) + min(8, 2 * verbs)
+    score += round(15 * len(found) / len(keywords)) if keywords else 0
+    score += 5 if 300 <= words <= 1000 else -5
+    score -= min(6, 2 * len(weak))
+    score = max(0, min(100, score))
+
+    strengths, improvements, suggestions = [], [], []
+    present = [name for name in ("experience", "education", "skills", "projects") if name in sections]
+    absent = [name for name in ("experience", "education", "skills", "projects") if name not in sections]
+    if present:
+        strengths.append(f"Includes {', '.join(present)} sections")
+    if absent:
+        improvements.append(f"Add clearly labeled {', '.join(absent)} section{'s' if len(absent) > 1 else ''}")
+    if _EMAIL.search(text):
+        strengths.append("Contact details are easy to find")
+    else:
+        improvements.append("Add an email address and phone number at the top")
+    if not links:
+        suggestions.append("Link your LinkedIn profile and GitHub or portfolio")
+    if quantified >= 3:
+        strengths.append(f"{quantified} achievements are backed by numbers")
+    else:
+        improvements.append("Quantify more achievements (time saved, users, revenue, percentages)")
+        suggestions.append(content["tips"]["quantify"][1])
+    if verbs >= 3:
+        strengths.append("Bullets start with strong action verbs")
+    else:
+        suggestions.append("Start each bullet with an action verb such as built, led, reduced or automated")
+    if weak:
+        improvements.append(f"Replace passive phrasing like \"{weak[0]}\" with what you achieved")
+    if found:
+        strengths.append(f"Shows {target_role or 'role'}-relevant skills: {', '.join(found[:4])}")
+    if missing:
+        improvements.append(f"Show experience with {', '.join(missing[:3])} if you have it")
+    if words < 300:
+        improvements.append(f"The resume is short ({words} words); add detail to your recent roles")
+    elif words > 1000:
+        suggestions.append("Trim to one or two pages, keeping the most recent and relevant work")
+    suggestions.append(f"Mirror the wording of {target_role or 'target'} job postings in your skills section")
+    return {
+        "overall_score": score,
+        "strengths": strengths or ["The resume text could be read"],
+        "improvements": improvements or ["Tailor the summary to each application"],
+        "suggestions": suggestions,
+        "missing_keywords": missing[:6],
+    }
@@ -0,0 +1,64 @@
+"""
+Row counts that stay cheap on very large tables
+
+COUNT(*) reads a whole table (or its smallest index), so an admin changelist
+over millions of rows spends most of its time counting. For unfiltered
+querysets, estimated_count() asks the database's statistics instead:
+pg_class.reltuples on PostgreSQL and sqlite_stat1 on SQLite (filled in by
+ANALYZE). Small tables, filtered querysets and databases without statistics
+still get an exact count.
+"""
+from django.conf import settings
+from django.core.paginator import Paginator
+from django.db import DatabaseError, connections
+from django.utils.functional import cached_property
+
+
+def _table_estimate(model, using):
+    table = model._meta.db_table
+    connection = connections[using]
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            cursor.execute("SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass", [table])
+            row = cursor.fetchone()
+            return row[0] if row and row[0] > 0 else None
+        if connection.vendor == "sqlite":
+            # stat is "<rows> <rows per key>...", the same first number for every index
+            try:
+                cursor.execute("SELECT stat FROM sqlite_stat1 WHERE tbl = %s LIMIT 1", [table])
+            except DatabaseError:
+                # No ANALYZE has run yet
+                return None
+            row = cursor.fetchone()
+            return int(row[0].split()[0]) if row else None
+    return None
+
+
+def estimated_count(queryset, threshold=None):
+    """
+    Count a queryset, estimating unfiltered counts of large tables
+
+    Args:
+        queryset: The queryset to count
+        threshold: Estimates below this many rows are replaced by an exact
+            count (default settings.ESTIMATED_COUNT_THRESHOLD)
+
+    Returns:
+        Number of rows, exact or estimated
+    """
+    if threshold is None:
+        threshold = settings.ESTIMATED_COUNT_THRESHOLD
+    query = queryset.query
+    if not query.where and not query.distinct and query.low_mark == 0 and query.high_mark is None:
+        estimate = _table_estimate(queryset.model, queryset.db)
+        if estimate is not None and estimate >= threshold:
+            return estimate
+    return queryset.count()
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator for admin changelists whose count may be estimated"""
+
+    @cached_property
+    def count(self):
+        return estimated_count(self.object_list)
@@ -0,0 +1,222 @@
+"""
+Background prewarming of interview questions and roadmaps
+
+When we know a user's Profile (job role and experience) we can generate the
+question set and roadmap they are most likely to ask for next before they
+ask for it. Results are parked in the cache and consumed exactly once.
+Prewarming starts when the user logs in and when they update their profile,
+never on page views. Generation is charged to the user's daily token quota
+like any other AI call, and nothing is prewarmed for a user who has already
+spent it.
+"""
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.utils import timezone
+
+from .ai_utils import experience_level_for_years, generate_interview_questions, generate_learning_roadmap
+from .providers import ai_enabled
+from .ratelimit import charging, quota_exhausted
+
+# Interview type used for prewarmed question sets (preselected on the simulate form)
+PREWARM_INTERVIEW_TYPE = "technical"
+
+_executor = None
+_executor_lock = threading.Lock()
+_in_flight = 0
+
+
+def _role_digest(role):
+    # Roles are free text; hash them so keys stay memcached-safe
+    return hashlib.md5(role.strip().lower().encode()).hexdigest()
+
+
+def questions_key(user_id, role, interview_type, experience_level):
+    return f"prewarm:questions:{user_id}:{_role_digest(role)}:{interview_type}:{experience_level}"
+
+
+def roadmap_key(user_id, job_role, experience_years):
+    return f"prewarm:roadmap:{user_id}:{_role_digest(job_role)}:{experience_years}"
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.PREWARM_MAX_WORKERS,
+                thread_name_prefix="prewarm",
+            )
+        return _executor
+
+
+def _take_budget():
+    """
+    Reserve one unit of the prewarm budget
+
+    Two limits apply: the number of jobs queued or running in this process,
+    and an hourly generation budget kept in the cache. The hourly budget is
+    shared by every process only when the cache is (Redis is, the default
+    LocMemCache is not).
+    """
+    global _in_flight
+    with _executor_lock:
+        if _in_flight >= settings.PREWARM_MAX_PENDING:
+            return False
+        _in_flight += 1
+
+    budget_key = f"prewarm:budget:{timezone.now():%Y%m%d%H}"
+    cache.add(budget_key, 0, timeout=3600)
+    try:
+        used = cache.incr(budget_key)
+    except ValueError:
+        used = 1
+    if used > settings.PREWARM_HOURLY_BUDGET:
+        _release_budget()
+        return False
+    return True
+
+
+def _release_budget():
+    global _in_flight
+    with _executor_lock:
+        _in_flight -= 1
+
+
+def _run_job(key, generate, user):
+    try:
+        # Runs on a pool thread, so the charged user has to be set here
+        with charging(user):
+            result = generate()
+        cache.set(key, result, timeout=settings.PREWARM_TIMEOUT)
+    except Exception as e:
+        print(f"Error prewarming {key}: {e}")
+    finally:
+        cache.delete(f"{key}:queued")
+        _release_budget()
+        # Connections are per thread; don't leave this one open
+        connection.close()
+
+
+def _schedule(key, generate, user):
+    """
+    Queue a generation job unless its result is already cached or queued
+
+    The queued marker lives in the same cache, so the check spans processes
+    as far as the cache does.
+    """
+    if cache.get(key) is not None:
+        return False
+    # cache.add is atomic, so only one caller wins the right to queue the key
+    if not cache.add(f"{key}:queued", True, timeout=settings.PREWARM_TIMEOUT):
+        return False
+    if not _take_budget():
+        cache.delete(f"{key}:queued")
+        return False
+    _get_executor().submit(_run_job, key, generate, user)
+    return True
+
+
+def schedule_prewarm(user, profile=None):
+    """
+    Schedule background generation of the likely next question set and roadmap
+
+    Args:
+        user: The authenticated user
+        profile: The user's Profile, looked up if not given
+
+    Returns:
+        Number of generation jobs that were queued
+    """
+    if not settings.PREWARM_ENABLED or not ai_enabled() or quota_exhausted(user.pk):
+        return 0
+
+    if profile is None:
+        from .models import Profile
+        profile = Profile.objects.filter(user=user).first()
+    if profile is None or not profile.job_role:
+        return 0
+
+    role = profile.job_role
+    experience_years = profile.experience_years
+    experience_level = experience_level_for_years(experience_years)
+    # Aim at the user's current weak areas, as an interview or roadmap started now would
+    from interview.recommender import rank_topics, user_weakness
+    weakness = user_weakness(user)
+    focus_areas = rank_topics(weakness, settings.RECOMMENDED_TOPICS, PREWARM_INTERVIEW_TYPE)
+    target_skills = rank_topics(weakness, settings.RECOMMENDED_TOPICS)
+
+    queued = 0
+    queued += _schedule(
+        questions_key(user.pk, role, PREWARM_INTERVIEW_TYPE, experience_level),
+        lambda: generate_interview_questions(
+            role=role,
+            interview_type=PREWARM_INTERVIEW_TYPE,
+            experience_level=experience_level,
+            num_questions=5,
+            focus_areas=focus_areas,
+        ),
+        user,
+    )
+    queued += _schedule(
+        roadmap_key(user.pk, role, experience_years),
+        lambda: generate_learning_roadmap(job_role=role, experience_years=experience_years,
+                                          target_skills=target_skills or None),
+        user,
+    )
+    return queued
+
+
+def _consume(key):
+    """Pop a prewarmed result so it is served at most once, and record a hit or miss"""
+    value = cache.get(key)
+    # delete() reports whether the key was still there, so only one of two
+    # concurrent requests gets to serve the same prewarmed result
+    if value is not None and not cache.delete(key):
+        value = None
+    _record("hits" if value is not None else "misses")
+    return value
+
+
+def consume_questions(user, role, interview_type, experience_level):
+    """Return a prewarmed question set for this interview, or None"""
+    if not settings.PREWARM_ENABLED or not role:
+        return None
+    return _consume(questions_key(user.pk, role, interview_type, experience_level))
+
+
+def consume_roadmap(user, job_role, experience_years):
+    """Return a prewarmed roadmap for this role and experience, or None"""
+    if not settings.PREWARM_ENABLED or not job_role:
+        return None
+    return _consume(roadmap_key(user.pk, job_role, experience_years))
+
+
+def _record(outcome):
+    key = f"prewarm:stats:{outcome}"
+    cache.add(key, 0, timeout=None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, timeout=None)
+
+
+def prewarm_stats():
+    """
+    Return prewarm hit-rate counters
+
+    Returns:
+        Dictionary with hits, misses and hit_rate (0-1)
+    """
+    hits = cache.get("prewarm:stats:hits", 0)
+    misses = cache.get("prewarm:stats:misses", 0)
+    total = hits + misses
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_rate": hits / total if total else 0.0,
+    }
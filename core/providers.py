@@ -0,0 +1,234 @@
+"""
+LLM provider backends
+
+settings.AI_PROVIDERS configures named providers and settings.AI_PROVIDER_ORDER
+says which ones to use, most preferred first. Two kinds exist:
+
+- "openai": any OpenAI-compatible chat completions server. With a base_url
+  this can be a local CPU inference server (llama.cpp, vLLM, Ollama) on the
+  same host, which keeps the app working fully offline.
+- "stub": deterministic in-process responses built from the fallback content,
+  for tests and benchmarks.
+
+A provider that raises is marked down for AI_PROVIDER_RETRY_SECONDS and the
+next one in order is tried; once the cooldown passes it is tried again. The
+logprobs request option only reaches providers configured with logprobs=True,
+since many self-hosted servers reject or ignore it.
+`manage.py check_providers` probes every provider actively.
+"""
+import hashlib
+import json
+import re
+import threading
+import time
+from types import SimpleNamespace
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+
+class ProviderError(Exception):
+    """Every configured provider failed or is down"""
+
+
+class OpenAICompatibleProvider:
+    def __init__(self, name, api_key=None, base_url=None, model=None, timeout=60, logprobs=False):
+        self.name = name
+        self.api_key = api_key
+        self.base_url = base_url
+        self.model = model
+        self.timeout = timeout
+        self.logprobs = logprobs
+        self._client = None
+
+    @property
+    def configured(self):
+        # The public API needs a key; a self-hosted server only needs an address
+        return bool(self.api_key or self.base_url)
+
+    @property
+    def client(self):
+        # The OpenAI SDK is imported on first use rather than at module import,
+        # so workers that only serve pages like /login/ never pay for it
+        if self._client is None:
+            import openai
+            self._client = openai.OpenAI(
+                api_key=self.api_key or "not-needed",
+                base_url=self.base_url,
+                timeout=self.timeout,
+                max_retries=0,
+            )
+        return self._client
+
+    def complete(self, task, messages, model, **params):
+        # Self-hosted servers name their models differently from the routing table
+        return self.client.chat.completions.create(messages=messages, model=self.model or model, **params)
+
+    def health_check(self):
+        self.client.models.list()
+
+
+class StubProvider:
+    """Deterministic responses that pass the routing schema checks, with optional injected latency"""
+
+    configured = True
+    logprobs = False
+
+    def __init__(self, name, latency=0.0):
+        self.name = name
+        self.latency = latency
+
+    def complete(self, task, messages, model, **params):
+        from . import ai_utils
+
+        prompt = messages[-1]["content"]
+        if self.latency and not task.endswith("_batch"):
+            time.sleep(self.latency)
+
+        if task == "questions":
+            data = ai_utils.generate_fallback_questions("this", "mixed", "mid")
+        elif task == "roadmap":
+            data = ai_utils.generate_fallback_roadmap("this")["modules"]
+        elif task == "roadmap_module":
+            data = ai_utils.generate_fallback_roadmap("this")["modules"][0]
+        elif task == "resume_feedback":
+            data = ai_utils.generate_fallback_resume_feedback()
+        elif task == "evaluation":
+            try:
+                # The answers are the JSON block between the prompt's first two blank lines
+                qa_pairs = json.loads(prompt.split("\n\n", 2)[1])
+            except (IndexError, ValueError):
+                qa_pairs = [{}] * prompt.count('"user_answer"')
+            data = ai_utils.generate_fallback_evaluation(qa_pairs)
+        elif task.endswith("_batch"):
+            single_task = task[:-len("_batch")]
+            item = self.complete(single_task, messages, model)
+            data = {
+                key: json.loads(item.choices[0].message.content)
+                for key in re.findall(r'"(r\d+)"', prompt.rsplit("exactly the keys", 1)[-1])
+            }
+        else:
+            data = {}
+        # Vary scores by prompt so replays are deterministic but not identical
+        if isinstance(data, dict) and "overall_score" in data:
+            data["overall_score"] = int(hashlib.md5(prompt.encode()).hexdigest(), 16) % 5 + 5
+
+        content = json.dumps(data)
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=content), logprobs=None)],
+            usage=SimpleNamespace(
+                prompt_tokens=sum(len(m["content"]) for m in messages) // 4,
+                completion_tokens=len(content) // 4,
+            ),
+        )
+
+    def health_check(self):
+        pass
+
+
+PROVIDER_TYPES = {
+    "openai": OpenAICompatibleProvider,
+    "stub": StubProvider,
+}
+
+_providers = None
+_providers_lock = threading.Lock()
+_down_until = {}
+
+
+def get_providers():
+    """The configured providers in AI_PROVIDER_ORDER, built once per process"""
+    global _providers
+    with _providers_lock:
+        if _providers is None:
+            providers = []
+            for name in settings.AI_PROVIDER_ORDER:
+                options = dict(settings.AI_PROVIDERS[name])
+                provider = PROVIDER_TYPES[options.pop("type")](name, **options)
+                if provider.configured:
+                    providers.append(provider)
+            _providers = providers
+        return _providers
+
+
+def reset_providers():
+    """Forget built providers and health state, e.g. after changing settings"""
+    global _providers
+    with _providers_lock:
+        _providers = None
+        _down_until.clear()
+
+
+@receiver(setting_changed)
+def _reset_on_setting_change(setting, **kwargs):
+    if setting in ("AI_PROVIDERS", "AI_PROVIDER_ORDER"):
+        reset_providers()
+
+
+def ai_enabled():
+    """True if at least one provider is configured; otherwise callers use their fallbacks"""
+    return bool(get_providers())
+
+
+def mark_down(provider):
+    _down_until[provider.name] = time.monotonic() + settings.AI_PROVIDER_RETRY_SECONDS
+
+
+def is_up(provider):
+    return _down_until.get(provider.name, 0) <= time.monotonic()
+
+
+def complete(task, messages, **params):
+    """
+    Send a chat completion to the first healthy provider, failing over in order
+
+    Args:
+        task: Routing task name (used by the stub provider)
+        messages: Chat messages
+        **params: model, temperature, max_tokens and any extra request options;
+            logprobs is dropped for providers that don't support it
+
+    Returns:
+        An OpenAI-shaped completion response
+
+    Raises:
+        ProviderError: if every provider is down or failed
+    """
+    errors = []
+    for provider in get_providers():
+        if not is_up(provider):
+            continue
+        request = dict(params)
+        if not provider.logprobs:
+            request.pop("logprobs", None)
+        try:
+            return provider.complete(task, messages, **request)
+        except Exception as e:
+            status = getattr(e, "status_code", None)
+            if status is not None and status < 500 and status != 429:
+                # The request itself was rejected; another provider would not help
+                raise
+            print(f"AI provider {provider.name} failed, trying the next one: {e}")
+            mark_down(provider)
+            errors.append(f"{provider.name}: {e}")
+    raise ProviderError("; ".join(errors) or "All AI providers are down")
+
+
+def check_health():
+    """
+    Actively probe every configured provider and update its up/down state
+
+    Returns:
+        Dictionary of provider name to None (healthy) or the error message
+    """
+    results = {}
+    for provider in get_providers():
+        try:
+            provider.health_check()
+            _down_until.pop(provider.name, None)
+            results[provider.name] = None
+        except Exception as e:
+            mark_down(provider)
+            results[provider.name] = str(e)
+    return results
@@ -0,0 +1,198 @@
+"""
+Per-user and per-IP rate limiting and daily token quotas for AI endpoints
+
+Limits are token buckets kept in the Django cache. A bucket with capacity C
+refilled over P seconds is approximated with a sliding window counter: the
+requests made in the current P-second window plus a linearly decaying share of
+the previous window. Each check counts the request with cache.add/incr first
+and compares the count that call returned, giving the token back if it is over
+the limit, so concurrent checks cannot both take the last token.
+
+That is only safe when incr is atomic, as it is with the local-memory and Redis
+caches. The database and file-based caches implement incr as a get and a set
+(about 1.5 ms per call on the database), so concurrent requests can overshoot
+the limits; check --deploy warns about them (core.W005).
+"""
+import contextvars
+import math
+import time
+from contextlib import contextmanager
+from datetime import datetime, time as dt_time, timedelta
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F
+from django.http import HttpResponse
+from django.utils import timezone
+
+# The user whose AI calls are being charged, set by ai_rate_limit for the
+# duration of the view so core.ai_utils can report usage without plumbing
+_current_user_id = contextvars.ContextVar("ai_quota_user_id", default=None)
+
+
+def client_ip(request):
+    """Client address, taken from X-Forwarded-For when running behind a trusted proxy"""
+    if settings.RATELIMIT_TRUST_X_FORWARDED_FOR:
+        forwarded = request.META.get("HTTP_X_FORWARDED_FOR")
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+    return request.META.get("REMOTE_ADDR", "")
+
+
+def take_token(key, capacity, period, now=None):
+    """
+    Try to take one token from a bucket
+
+    Args:
+        key: Cache key identifying the bucket
+        capacity: Number of requests allowed in a burst
+        period: Seconds for an empty bucket to refill completely
+        now: Current time (for tests)
+
+    Returns:
+        0 if the request is allowed, otherwise seconds to wait before retrying
+    """
+    now = time.time() if now is None else now
+    window = int(now // period)
+    elapsed = now - window * period
+    current_key = f"rl:{key}:{window}"
+    previous_key = f"rl:{key}:{window - 1}"
+
+    # Count the request before comparing; both windows must outlive the next
+    # one, hence the 2x timeout
+    if cache.add(current_key, 1, timeout=period * 2):
+        count = 1
+    else:
+        try:
+            count = cache.incr(current_key)
+        except ValueError:
+            # Expired between add and incr
+            cache.set(current_key, 1, timeout=period * 2)
+            count = 1
+    # Requests allowed in this window before this one
+    current = count - 1
+    previous = cache.get(previous_key, 0)
+    previous_weight = previous * (1 - elapsed / period)
+
+    if previous_weight + current + 1 <= capacity:
+        return 0
+
+    # Over the limit: give the token back so rejected requests do not count
+    try:
+        cache.decr(current_key)
+    except ValueError:
+        pass
+    if current + 1 <= capacity and previous:
+        # Wait until the previous window has decayed enough to free a token
+        wait = period * (1 - (capacity - current - 1) / previous) - elapsed
+    else:
+        # Nothing frees up until this window becomes the previous one and decays
+        wait = period - elapsed + period * (1 - (capacity - 1) / current)
+    return max(1, math.ceil(wait))
+
+
+def _seconds_until_midnight():
+    now = timezone.localtime()
+    midnight = timezone.make_aware(datetime.combine(now.date() + timedelta(days=1), dt_time.min))
+    return max(1, int((midnight - now).total_seconds()))
+
+
+def _quota_key(user_id):
+    return f"quota:exhausted:{user_id}:{timezone.localdate():%Y%m%d}"
+
+
+def quota_exhausted(user_id):
+    """True once the user has spent today's token quota (always False with rate limiting off)"""
+    return settings.RATELIMIT_ENABLED and user_id is not None and bool(cache.get(_quota_key(user_id)))
+
+
+def charge_tokens(usage):
+    """
+    Add the prompt and completion tokens of one completion to the current user's daily total
+
+    Args:
+        usage: The usage object returned with an OpenAI completion
+    """
+    user_id = _current_user_id.get()
+    if user_id is None or usage is None:
+        return
+    tokens = (getattr(usage, "prompt_tokens", 0) or 0) + (getattr(usage, "completion_tokens", 0) or 0)
+    if not tokens:
+        return
+
+    from .models import Profile
+    today = timezone.localdate()
+    profiles = Profile.objects.filter(user_id=user_id)
+    if not profiles.filter(tokens_used_on=today).update(tokens_used=F("tokens_used") + tokens):
+        # First usage today resets the running total
+        profiles.update(tokens_used=tokens, tokens_used_on=today)
+
+    profile = profiles.only("tokens_used", "daily_token_quota").first()
+    if profile and profile.tokens_used >= profile.token_quota:
+        # Remember exhaustion in the cache so later checks skip the database
+        cache.set(_quota_key(user_id), True, timeout=_seconds_until_midnight())
+
+
+def check_rate_limits(request, scope):
+    """
+    Apply the AI_RATE_LIMITS[scope] buckets and the daily token quota to a request
+
+    Returns:
+        None if the request may proceed, otherwise a 429 response with Retry-After
+    """
+    if not settings.RATELIMIT_ENABLED:
+        return None
+    limits = settings.AI_RATE_LIMITS[scope]
+    user_id = request.user.pk if request.user.is_authenticated else None
+
+    if quota_exhausted(user_id):
+        return _too_many_requests(_seconds_until_midnight(), "Daily AI usage quota reached.")
+
+    checks = [(f"{scope}:ip:{client_ip(request)}", *limits["ip"])]
+    if user_id is not None:
+        checks.insert(0, (f"{scope}:user:{user_id}", *limits["user"]))
+    for key, capacity, period in checks:
+        retry_after = take_token(key, capacity, period)
+        if retry_after:
+            return _too_many_requests(retry_after, "Too many requests. Please slow down.")
+    return None
+
+
+@contextmanager
+def charging(user):
+    """Charge the tokens of every completion made inside the block to this user"""
+    token = _current_user_id.set(user.pk if user.is_authenticated else None)
+    try:
+        yield
+    finally:
+        _current_user_id.reset(token)
+
+
+def ai_rate_limit(scope, methods=("GET", "POST")):
+    """
+    Decorator applying check_rate_limits to a view and charging its AI usage to the user
+
+    Requests using other HTTP methods pass straight through. Limited requests
+    get an immediate 429 with a Retry-After header.
+    """
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapped(request, *args, **kwargs):
+            if request.method not in methods:
+                return view_func(request, *args, **kwargs)
+
+            limited = check_rate_limits(request, scope)
+            if limited is not None:
+                return limited
+
+            with charging(request.user):
+                return view_func(request, *args, **kwargs)
+        return wrapped
+    return decorator
+
+
+def _too_many_requests(retry_after, message):
+    response = HttpResponse(message, status=429, content_type="text/plain")
+    response["Retry-After"] = str(retry_after)
+    return response
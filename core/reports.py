@@ -0,0 +1,337 @@
+"""
+Downloadable interview reports and roadmaps (PDF and static HTML)
+
+A report is rendered from a plain dictionary of the data it shows (never by
+re-rendering a page, which could start another AI call). The dictionary's
+SHA-256 names the stored file, reports/<ab>/<digest>.<format> in the default
+storage, so identical inputs share one file and a changed interview or
+roadmap gets a new one. Rendering happens on a small thread pool: a request
+either finds the file already stored or queues it and polls. A render that
+fails is remembered for a short while, so polling stops with an error instead
+of waiting for a file that never comes. Stored files never change, so
+downloads are served with a long-lived immutable cache.
+"""
+import hashlib
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from xml.sax.saxutils import escape
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.http import FileResponse, Http404, HttpResponseNotModified
+from django.template.loader import render_to_string
+
+# Bump when the templates or the PDF layout change, so stored files are re-rendered
+REPORT_VERSION = 1
+FORMATS = {
+    "pdf": "application/pdf",
+    "html": "text/html; charset=utf-8",
+}
+
+# Seconds a failed render is reported before a request may queue it again
+FAILED_RETRY_AFTER = 60
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _strings(value):
+    if isinstance(value, str):
+        return [value]
+    if isinstance(value, list):
+        return [str(item) for item in value if isinstance(item, (str, int, float))]
+    return []
+
+
+def interview_report_data(interview):
+    """
+    The data an interview's report shows
+
+    Args:
+        interview: An evaluated InterviewSession
+
+    Returns:
+        JSON-serializable dictionary
+    """
+    evaluation = interview.evaluation if isinstance(interview.evaluation, dict) else {}
+    overall = evaluation.get("overall_feedback") if isinstance(evaluation.get("overall_feedback"), dict) else {}
+    feedback = evaluation.get("question_feedback") or []
+    questions = []
+    for i, answer in enumerate(interview.answers or []):
+        index = answer.get("question_index") if isinstance(answer, dict) else None
+        if not isinstance(index, int) or not 0 <= index < len(interview.questions):
+            continue
+        entry = feedback[i] if i < len(feedback) and isinstance(feedback[i], dict) else {}
+        question = interview.questions[index] if isinstance(interview.questions[index], dict) else {}
+        questions.append({
+            "question": str(question.get("question", "")),
+            "answer": str(answer.get("answer") or ""),
+            "score": entry.get("score"),
+            "good_points": _strings(entry.get("good_points")),
+            "improvements": _strings(entry.get("improvements")),
+            "tips": _strings(entry.get("tips")),
+        })
+    return {
+        "role": interview.role,
+        "interview_type": interview.interview_type,
+        "experience_level": interview.experience_level,
+        "date": f"{interview.completed_at:%d %B %Y}" if interview.completed_at else "",
+        "overall_score": evaluation.get("overall_score"),
+        "strengths": _strings(overall.get("strengths")),
+        "improvements": _strings(overall.get("improvements")),
+        "tips": _strings(overall.get("tips")),
+        "questions": questions,
+    }
+
+
+def roadmap_report_data(roadmap):
+    """
+    The data a roadmap's report shows
+
+    Args:
+        roadmap: A Roadmap
+
+    Returns:
+        JSON-serializable dictionary
+    """
+    completed = set(roadmap.completed_modules or [])
+    modules = roadmap.content.get("modules") if isinstance(roadmap.content, dict) else None
+    return {
+        "job_role": roadmap.job_role,
+        "experience_years": roadmap.experience_years,
+        "target_skills": _strings(roadmap.target_skills),
+        "modules": [
+            {
+                "title": str(module.get("title", "")),
+                "timeline": str(module.get("timeline", "")),
+                "topics": _strings(module.get("topics")),
+                "resources": _strings(module.get("resources")),
+                "projects": _strings(module.get("projects")),
+                "completed": module.get("key") in completed,
+            }
+            for module in modules or [] if isinstance(module, dict)
+        ],
+    }
+
+
+REPORTS = {
+    "interview": {
+        "data": interview_report_data,
+        "template": "reports/interview.html",
+        "title": lambda data: f"{data['role']} Interview Report",
+    },
+    "roadmap": {
+        "data": roadmap_report_data,
+        "template": "reports/roadmap.html",
+        "title": lambda data: f"{data['job_role']} Learning Roadmap",
+    },
+}
+
+
+def report_digest(kind, data):
+    """SHA-256 of a report's kind and data; equal inputs give equal digests"""
+    payload = json.dumps({"kind": kind, "version": REPORT_VERSION, "data": data},
+                         sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def report_name(digest, fmt):
+    """Storage name of a rendered report"""
+    return f"reports/{digest[:2]}/{digest}.{fmt}"
+
+
+def _pdf_lines(kind, data):
+    """(style, text) paragraphs of a report, in order"""
+    lines = []
+
+    def bullets(heading, items):
+        if items:
+            lines.append(("h3", heading))
+            lines.extend(("bullet", item) for item in items)
+
+    if kind == "interview":
+        details = [data["interview_type"].replace("-", " ").title(), f"{data['experience_level']} level", data["date"]]
+        lines.append(("meta", " · ".join(detail for detail in details if detail)))
+        lines.append(("h2", f"Overall score: {data['overall_score']}/10"))
+        bullets("Strengths", data["strengths"])
+        bullets("Areas to improve", data["improvements"])
+        for number, question in enumerate(data["questions"], 1):
+            score = f" ({question['score']}/10)" if question["score"] is not None else ""
+            lines.append(("h2", f"Q{number}{score}: {question['question']}"))
+            lines.append(("body", question["answer"] or "No answer provided"))
+            bullets("What went well", question["good_points"])
+            bullets("To improve", question["improvements"])
+            bullets("Tips", question["tips"])
+        bullets("Next steps", data["tips"])
+    else:
+        details = [f"{data['experience_years']} years of experience"]
+        if data["target_skills"]:
+            details.append(f"Focus: {', '.join(data['target_skills'])}")
+        lines.append(("meta", " · ".join(details)))
+        for number, module in enumerate(data["modules"], 1):
+            done = " (completed)" if module["completed"] else ""
+            lines.append(("h2", f"Module {number}: {module['title']}{done}"))
+            if module["timeline"]:
+                lines.append(("meta", module["timeline"]))
+            bullets("Topics", module["topics"])
+            bullets("Resources", module["resources"])
+            bullets("Projects", module["projects"])
+    return lines
+
+
+def _render_pdf(kind, data):
+    # Only the report workers need reportlab, so web processes start without it
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+    from reportlab.lib.units import mm
+    from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer
+
+    sample = getSampleStyleSheet()
+    styles = {
+        "h2": sample["Heading2"],
+        "h3": sample["Heading4"],
+        "body": sample["BodyText"],
+        "meta": ParagraphStyle("meta", parent=sample["BodyText"], textColor="#64748b"),
+        "bullet": ParagraphStyle("bullet", parent=sample["BodyText"], leftIndent=12, bulletIndent=2),
+    }
+    title = REPORTS[kind]["title"](data)
+    story = [Paragraph(escape(title), sample["Title"])]
+    for style, text in _pdf_lines(kind, data):
+        bullet = "•" if style == "bullet" else None
+        story.append(Paragraph(escape(text).replace("\n", "<br/>"), styles[style], bulletText=bullet))
+    story.append(Spacer(1, 6 * mm))
+
+    buffer = BytesIO()
+    # invariant leaves out the creation date and random ids, so equal data gives equal bytes
+    document = SimpleDocTemplate(buffer, pagesize=A4, title=title, author="AI Interview Coach", invariant=True,
+                                 leftMargin=18 * mm, rightMargin=18 * mm, topMargin=18 * mm, bottomMargin=18 * mm)
+    document.build(story)
+    return buffer.getvalue()
+
+
+def render_report(kind, data, fmt):
+    """
+    Render a report
+
+    Args:
+        kind: "interview" or "roadmap"
+        data: The report's data (see interview_report_data and roadmap_report_data)
+        fmt: "pdf" or "html"
+
+    Returns:
+        The file's bytes
+    """
+    if fmt == "pdf":
+        return _render_pdf(kind, data)
+    title = REPORTS[kind]["title"](data)
+    return render_to_string(REPORTS[kind]["template"], {"title": title, "report": data}).encode()
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.REPORT_WORKERS,
+                thread_name_prefix="report",
+            )
+        return _executor
+
+
+def shutdown_workers(wait=True):
+    """Stop the report workers; the next queued report starts new ones (with the current settings)"""
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=wait)
+
+
+def _failed_key(digest, fmt):
+    return f"report:failed:{digest}:{fmt}"
+
+
+def _render_job(kind, data, digest, fmt, queued_key):
+    name = report_name(digest, fmt)
+    try:
+        if not default_storage.exists(name):
+            saved = default_storage.save(name, ContentFile(render_report(kind, data, fmt)))
+            if saved != name:
+                # Another process stored the same report first; the storage renamed ours
+                default_storage.delete(saved)
+    except Exception as e:
+        print(f"Error rendering {name}: {e}")
+        # Set before the queued marker goes, so pollers never see neither
+        cache.set(_failed_key(digest, fmt), True, timeout=FAILED_RETRY_AFTER)
+    finally:
+        cache.delete(queued_key)
+
+
+def schedule_report(kind, data, digest, fmt):
+    """
+    Queue rendering a report unless it is stored or queued already
+
+    Returns:
+        The worker's Future, or None if nothing was queued
+    """
+    name = report_name(digest, fmt)
+    if default_storage.exists(name):
+        return None
+    queued_key = f"report:queued:{digest}:{fmt}"
+    # cache.add is atomic, so one request (on any node) queues each report
+    if not cache.add(queued_key, True, timeout=settings.REPORT_RENDER_TIMEOUT):
+        return None
+    return _get_executor().submit(_render_job, kind, data, digest, fmt, queued_key)
+
+
+def request_report(kind, obj, fmt):
+    """
+    Find a stored report of an interview or roadmap, or queue rendering it
+
+    Args:
+        kind: "interview" or "roadmap"
+        obj: The InterviewSession or Roadmap
+        fmt: "pdf" or "html"
+
+    Returns:
+        Tuple of (digest, status), status being "ready", "pending" or "failed"
+    """
+    data = REPORTS[kind]["data"](obj)
+    digest = report_digest(kind, data)
+    if default_storage.exists(report_name(digest, fmt)):
+        return digest, "ready"
+    if cache.get(_failed_key(digest, fmt)):
+        return digest, "failed"
+    schedule_report(kind, data, digest, fmt)
+    return digest, "pending"
+
+
+def report_response(request, kind, obj, digest, fmt, filename):
+    """
+    Stream a stored report as a download
+
+    The digest must be that of the object's current data, so a link to an
+    outdated report stops working once the interview or roadmap changes.
+
+    Raises:
+        Http404: For an outdated digest or a report that is not stored
+    """
+    if fmt not in FORMATS or digest != report_digest(kind, REPORTS[kind]["data"](obj)):
+        raise Http404("No such report")
+    etag = f'"{digest}"'
+    if etag in request.headers.get("If-None-Match", ""):
+        response = HttpResponseNotModified()
+    else:
+        try:
+            report = default_storage.open(report_name(digest, fmt), "rb")
+        except FileNotFoundError:
+            raise Http404("Report not rendered yet")
+        response = FileResponse(report, as_attachment=True, filename=f"{filename}.{fmt}", content_type=FORMATS[fmt])
+    response["ETag"] = etag
+    # The URL names the content, which never changes
+    response["Cache-Control"] = "private, max-age=31536000, immutable"
+    return response
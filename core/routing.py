@@ -0,0 +1,206 @@
+"""
+Model routing for the AI generators in core/ai_utils.py
+
+Each task (questions, roadmap, roadmap_module, resume_feedback, evaluation) has a list of
+input-size bands in settings.AI_MODEL_ROUTES; the first band whose
+max_input_chars covers the prompt decides the model, temperature and
+max_tokens. settings.AI_MODEL_OVERRIDES lets an environment replace any of
+those per task without editing the table.
+
+With AI_ROUTING_POLICY = "cascade" every call first goes to the cheap
+AI_CASCADE["fast_model"]; the routed model is only used when the fast call
+fails, its answer does not parse or fails the task's schema check, or its mean
+token probability is below AI_CASCADE["min_confidence"]. Token probabilities
+come from providers that support logprobs; without them a valid fast answer
+is used as it is.
+"""
+import json
+import math
+import threading
+import time
+
+from django.conf import settings
+
+from . import providers
+from .ratelimit import charge_tokens
+
+POLICIES = ("single", "cascade")
+
+_record_lock = threading.Lock()
+
+
+def route(task, input_size):
+    """
+    Pick the model settings for a task
+
+    Args:
+        task: Key of settings.AI_MODEL_ROUTES
+        input_size: Length of the prompt in characters
+
+    Returns:
+        Dictionary with model, temperature and max_tokens
+    """
+    bands = settings.AI_MODEL_ROUTES[task]
+    band = next(
+        (b for b in bands if b.get("max_input_chars") is None or input_size <= b["max_input_chars"]),
+        bands[-1],
+    )
+    params = {key: band[key] for key in ("model", "temperature", "max_tokens")}
+    params.update(settings.AI_MODEL_OVERRIDES.get(task, {}))
+    return params
+
+
+def extract_json(content):
+    """Parse a JSON completion, tolerating markdown code fences around it"""
+    if "```json" in content:
+        content = content.split("```json")[1].split("```")[0].strip()
+    elif "```" in content:
+        content = content.split("```")[1].split("```")[0].strip()
+    return json.loads(content)
+
+
+def _is_str_list(value):
+    return isinstance(value, list) and all(isinstance(item, str) for item in value)
+
+
+def _valid_questions(data):
+    return isinstance(data, list) and bool(data) and all(
+        isinstance(q, dict) and isinstance(q.get("question"), str) and _is_str_list(q.get("key_points"))
+        for q in data
+    )
+
+
+def _valid_roadmap(data):
+    modules = data.get("modules") if isinstance(data, dict) else data
+    return isinstance(modules, list) and bool(modules) and all(
+        isinstance(m, dict) and isinstance(m.get("title"), str) and _is_str_list(m.get("topics", []))
+        for m in modules
+    )
+
+
+def _valid_module(data):
+    return isinstance(data, dict) and isinstance(data.get("title"), str) and _is_str_list(data.get("topics", []))
+
+
+def _valid_resume_feedback(data):
+    return isinstance(data, dict) and isinstance(data.get("score", data.get("overall_score")), (int, float)) and all(
+        _is_str_list(data.get(key, [])) for key in ("strengths", "improvements", "suggestions")
+    )
+
+
+def _valid_evaluation(data):
+    return (
+        isinstance(data, dict)
+        and isinstance(data.get("overall_score"), (int, float))
+        and isinstance(data.get("overall_feedback"), dict)
+        and isinstance(data.get("question_feedback"), list)
+    )
+
+
+VALIDATORS = {
+    "questions": _valid_questions,
+    "roadmap": _valid_roadmap,
+    "resume_feedback": _valid_resume_feedback,
+    "evaluation": _valid_evaluation,
+    "roadmap_module": _valid_module,
+    # Batched completions (core/batching.py) are checked per key after splitting
+    "questions_batch": lambda data: isinstance(data, dict),
+    "roadmap_batch": lambda data: isinstance(data, dict),
+    "roadmap_module_batch": lambda data: isinstance(data, dict),
+}
+
+
+class RoutingError(Exception):
+    """No model produced a response that passed the task's schema check"""
+
+
+def _call(task, params, messages, want_confidence=False):
+    extra = {"logprobs": True} if want_confidence else {}
+    response = providers.complete(task, messages, **params, **extra)
+    charge_tokens(response.usage)
+
+    choice = response.choices[0]
+    confidence = None
+    logprobs = getattr(choice, "logprobs", None)
+    if want_confidence and logprobs and logprobs.content:
+        # Geometric mean of the token probabilities
+        confidence = math.exp(sum(t.logprob for t in logprobs.content) / len(logprobs.content))
+    return choice.message.content, response.usage, confidence
+
+
+def _attempt(task, params, messages, want_confidence, attempts):
+    started = time.perf_counter()
+    content, usage, confidence = _call(task, params, messages, want_confidence)
+    attempt = {
+        "model": params["model"],
+        "latency": time.perf_counter() - started,
+        "prompt_tokens": getattr(usage, "prompt_tokens", 0) or 0,
+        "completion_tokens": getattr(usage, "completion_tokens", 0) or 0,
+        "confidence": confidence,
+    }
+    attempts.append(attempt)
+    try:
+        data = extract_json(content)
+    except ValueError:
+        return None
+    return data if VALIDATORS[task](data) else None
+
+
+def complete_json(task, system, prompt, policy=None, attempts=None):
+    """
+    Run a JSON-producing completion through the routing policy
+
+    Args:
+        task: Key of settings.AI_MODEL_ROUTES
+        system: System prompt
+        prompt: User prompt
+        policy: "single" or "cascade"; defaults to settings.AI_ROUTING_POLICY
+        attempts: Optional list that receives one dict per model call
+            (model, latency, prompt_tokens, completion_tokens, confidence)
+
+    Returns:
+        The parsed JSON data
+
+    Raises:
+        RoutingError: if no model produced schema-valid JSON
+    """
+    policy = policy or settings.AI_ROUTING_POLICY
+    attempts = [] if attempts is None else attempts
+    messages = [
+        {"role": "system", "content": system},
+        {"role": "user", "content": prompt},
+    ]
+    params = route(task, len(prompt))
+    _record(task, system, prompt)
+
+    if policy == "cascade" and settings.AI_CASCADE["fast_model"] != params["model"]:
+        fast_params = dict(params, model=settings.AI_CASCADE["fast_model"])
+        try:
+            data = _attempt(task, fast_params, messages, True, attempts)
+        except Exception as e:
+            print(f"Fast model {fast_params['model']} failed, escalating to {params['model']}: {e}")
+        else:
+            confidence = attempts[-1]["confidence"]
+            if data is not None and (confidence is None or confidence >= settings.AI_CASCADE["min_confidence"]):
+                return data
+
+    data = _attempt(task, params, messages, False, attempts)
+    if data is None:
+        raise RoutingError(f"{params['model']} returned no valid {task} JSON")
+    return data
+
+
+def _record(task, system, prompt):
+    """Append the call to settings.AI_WORKLOAD_RECORD_PATH so routing_benchmark can replay it"""
+    path = settings.AI_WORKLOAD_RECORD_PATH
+    if not path:
+        return
+    line = json.dumps({"task": task, "system": system, "prompt": prompt})
+    with _record_lock, open(path, "a", encoding="utf-8") as f:
+        f.write(line + "\n")
+
+
+def cost_of(attempt):
+    """Dollar cost of one attempt from settings.AI_MODEL_PRICING (per 1K tokens)"""
+    input_price, output_price = settings.AI_MODEL_PRICING.get(attempt["model"], (0, 0))
+    return (attempt["prompt_tokens"] * input_price + attempt["completion_tokens"] * output_price) / 1000
@@ -0,0 +1,164 @@
+"""
+Compact session storage and garbage collection of expired sessions
+
+Django already zlib-compresses signed session data, but plain zlib has little
+to work with in a few hundred bytes of JSON. CompressedJSONSerializer primes
+zlib with a dictionary of strings nearly every session here contains, so even
+a login-only session shrinks. Rows written before it was enabled are plain
+JSON and are still read transparently.
+
+Nothing in Django removes expired rows from django_session unless
+`clearsessions` is run, and that deletes them in one statement that holds the
+write lock for the whole table. purge_expired_sessions deletes in small
+batches instead, and maybe_schedule_gc runs it in a background thread at most
+once per SESSION_GC_INTERVAL.
+"""
+import json
+import threading
+import time
+import zlib
+
+from django.conf import settings
+from django.contrib.sessions.models import Session
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Avg, Max
+from django.db.models.functions import Length
+from django.utils import timezone
+
+# Never edit the dictionary in place: rows compressed with it could no longer
+# be read. Add a new one with a new marker instead.
+_MARKER = b"\x00z1"
+_ZDICT = json.dumps([
+    "_auth_user_id", "_auth_user_backend", "_auth_user_hash",
+    "django.contrib.auth.backends.ModelBackend", "_messages", "_session_expiry",
+    "interview_id", "current_question", "user_answers", "question_index", "answer",
+    "interview_questions", "interview_role", "interview_type", "interview_level",
+    "question", "key_points", "sample_answer_structure",
+    "technical", "behavioral", "system-design", "mixed", "entry", "mid", "senior",
+], separators=(",", ":")).encode()
+
+
+class CompressedJSONSerializer:
+    """Compact JSON compressed with a preset zlib dictionary (settings.SESSION_SERIALIZER)"""
+
+    def dumps(self, obj):
+        data = json.dumps(obj, separators=(",", ":")).encode("latin-1")
+        compressor = zlib.compressobj(level=9, zdict=_ZDICT)
+        return _MARKER + compressor.compress(data) + compressor.flush()
+
+    def loads(self, data):
+        if data.startswith(_MARKER):
+            decompressor = zlib.decompressobj(zdict=_ZDICT)
+            data = decompressor.decompress(data[len(_MARKER):]) + decompressor.flush()
+        return json.loads(data.decode("latin-1"))
+
+
+def purge_expired_sessions(batch_size=None, pause=0.05):
+    """
+    Delete expired sessions a batch at a time
+
+    Each batch is its own short transaction, and the pause between batches lets
+    waiting writers (logins, interview answers) in.
+
+    Args:
+        batch_size: Rows per DELETE, default settings.SESSION_GC_BATCH_SIZE
+        pause: Seconds to sleep between batches
+
+    Returns:
+        Number of sessions deleted
+    """
+    batch_size = batch_size or settings.SESSION_GC_BATCH_SIZE
+    now = timezone.now()
+    deleted = 0
+    while True:
+        keys = list(
+            Session.objects.filter(expire_date__lt=now).values_list("session_key", flat=True)[:batch_size]
+        )
+        if not keys:
+            return deleted
+        deleted += Session.objects.filter(session_key__in=keys).delete()[0]
+        if len(keys) < batch_size:
+            return deleted
+        time.sleep(pause)
+
+
+DB_SESSION_ENGINES = (
+    "django.contrib.sessions.backends.db",
+    "django.contrib.sessions.backends.cached_db",
+)
+
+_last_gc = None
+_gc_lock = threading.Lock()
+
+
+def _collect():
+    try:
+        deleted = purge_expired_sessions()
+        if deleted:
+            print(f"Deleted {deleted} expired sessions")
+    except Exception as e:
+        print(f"Error deleting expired sessions: {e}")
+    finally:
+        # Connections are per thread; don't leave this one open
+        connection.close()
+
+
+def maybe_schedule_gc():
+    """
+    Start a background session GC if none ran in the last SESSION_GC_INTERVAL
+
+    Called after every request, so it must stay cheap; the cache lock makes
+    sure only one process of the deployment does the work per interval.
+    SESSION_GC_INTERVAL=0 turns it off, and so does an in-memory SQLite
+    database (the test runner's), which a second thread would find locked.
+    """
+    global _last_gc
+    interval = settings.SESSION_GC_INTERVAL
+    if not interval or settings.SESSION_ENGINE not in DB_SESSION_ENGINES:
+        return
+    if connection.vendor == "sqlite" and connection.is_in_memory_db():
+        return
+    now = time.monotonic()
+    with _gc_lock:
+        if _last_gc is not None and now - _last_gc < interval:
+            return
+        _last_gc = now
+    if cache.add("sessions:gc", True, timeout=interval):
+        threading.Thread(target=_collect, name="session-gc", daemon=True).start()
+
+
+def _table_bytes():
+    """Size of django_session on disk, where the database can tell"""
+    table = Session._meta.db_table
+    with connection.cursor() as cursor:
+        try:
+            if connection.vendor == "sqlite":
+                # Needs SQLite built with the dbstat table, as Python's usually is
+                cursor.execute("SELECT SUM(pgsize) FROM dbstat WHERE name = %s", [table])
+            elif connection.vendor == "postgresql":
+                cursor.execute("SELECT pg_total_relation_size(%s)", [table])
+            else:
+                return None
+            return cursor.fetchone()[0]
+        except Exception:
+            return None
+
+
+def session_stats():
+    """
+    Size metrics for the session table
+
+    Returns:
+        Dictionary with total and expired row counts, average and largest
+        session_data length in characters, and the table size in bytes
+    """
+    sessions = Session.objects.all()
+    sizes = sessions.aggregate(avg=Avg(Length("session_data")), max=Max(Length("session_data")))
+    return {
+        "sessions": sessions.count(),
+        "expired": sessions.filter(expire_date__lt=timezone.now()).count(),
+        "avg_bytes": round(sizes["avg"] or 0),
+        "max_bytes": sizes["max"] or 0,
+        "table_bytes": _table_bytes(),
+    }
@@ -0,0 +1,24 @@
+from django.contrib.auth.signals import user_logged_in
+from django.core.management import call_command
+from django.core.signals import request_finished
+from django.dispatch import receiver
+
+from .prewarm import schedule_prewarm
+from .sessions import maybe_schedule_gc
+
+
+@receiver(user_logged_in)
+def prewarm_on_login(sender, request, user, **kwargs):
+    """Start generating the user's likely next interview and roadmap"""
+    schedule_prewarm(user)
+
+
+@receiver(request_finished)
+def collect_sessions(sender, **kwargs):
+    """Delete expired sessions now and then, off the request path"""
+    maybe_schedule_gc()
+
+
+def create_cache_table(sender, using, **kwargs):
+    """Create the database cache's table with the other tables, so `migrate` is the only setup step"""
+    call_command("createcachetable", database=using, verbosity=0)
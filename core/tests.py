@@ -1,3 +1,515 @@
-from django.test import TestCase
+import json
+import re
+import tempfile
+from importlib import import_module
+from io import StringIO
+from types import SimpleNamespace
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.contrib.sessions.serializers import JSONSerializer
+from django.core import signing
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.http import HttpResponse
+from django.test import TestCase, override_settings
+from django.test.client import RequestFactory
+from django.urls import reverse
+
+from resume.models import Resume
+from . import ai_utils, batching, prewarm, providers, reports, routing
+from .bulk import export_lines, import_rows, read_rows
+from .models import Profile
+from .ratelimit import ai_rate_limit, charge_tokens, quota_exhausted, take_token
+from .sessions import CompressedJSONSerializer, maybe_schedule_gc
+
+# Render pages without collectstatic's manifest
+STORAGES = {**settings.STORAGES, "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"}}
+
+
+class TokenBucketTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_a_full_bucket_allows_a_burst_of_capacity(self):
+        # The window only frees a token once it is the previous one and has decayed to 3
+        self.assertEqual([take_token("burst", 4, 60, now=0) for _ in range(5)], [0, 0, 0, 0, 75])
+
+    def test_the_previous_window_decays_linearly(self):
+        for _ in range(4):
+            take_token("decay", 4, 60, now=0)
+        # At t=60 the previous window still weighs 4; at t=75 it weighs 3, freeing one token
+        self.assertEqual(take_token("decay", 4, 60, now=60), 15)
+        self.assertEqual(take_token("decay", 4, 60, now=74.9), 1)
+        self.assertEqual(take_token("decay", 4, 60, now=75), 0)
+        # The next token waits for the previous window to decay to 2
+        self.assertEqual(take_token("decay", 4, 60, now=75), 15)
+
+    def test_an_idle_bucket_refills_completely(self):
+        for _ in range(4):
+            take_token("idle", 4, 60, now=0)
+        self.assertEqual([take_token("idle", 4, 60, now=120) for _ in range(4)], [0, 0, 0, 0])
+
+    def test_rejected_requests_give_their_token_back(self):
+        self.assertEqual([take_token("flood", 4, 60, now=0) for _ in range(10)], [0] * 4 + [75] * 6)
+        self.assertEqual(cache.get("rl:flood:0"), 4)
+
+    def test_buckets_are_independent(self):
+        take_token("a", 1, 60, now=0)
+        self.assertEqual(take_token("b", 1, 60, now=0), 0)
+        self.assertGreater(take_token("a", 1, 60, now=0), 0)
+
+
+@override_settings(RATELIMIT_ENABLED=True, AI_DAILY_TOKEN_QUOTA=100)
+class TokenQuotaTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user("spender")
+        Profile.objects.create(user=self.user, job_role="Backend Engineer", experience_years=3)
+
+    def _generate(self, tokens):
+        @ai_rate_limit("interview")
+        def view(request):
+            charge_tokens(SimpleNamespace(prompt_tokens=tokens, completion_tokens=0))
+            return HttpResponse()
+
+        request = RequestFactory().post("/")
+        request.user = self.user
+        return view(request)
+
+    def test_spending_the_quota_limits_ai_requests(self):
+        self.assertEqual(self._generate(60).status_code, 200)
+        self.assertFalse(quota_exhausted(self.user.pk))
+        self.assertEqual(self._generate(40).status_code, 200)
+        self.assertEqual(Profile.objects.get(user=self.user).tokens_used, 100)
+        self.assertTrue(quota_exhausted(self.user.pk))
+
+        response = self._generate(0)
+        self.assertEqual(response.status_code, 429)
+        self.assertGreater(int(response["Retry-After"]), 0)
+
+        with override_settings(RATELIMIT_ENABLED=False):
+            self.assertFalse(quota_exhausted(self.user.pk))
+
+    def test_usage_outside_limited_views_is_not_counted(self):
+        charge_tokens(SimpleNamespace(prompt_tokens=500, completion_tokens=500))
+        self.assertEqual(Profile.objects.get(user=self.user).tokens_used, 0)
+
+    @override_settings(AI_PROVIDER_ORDER=["stub"], PREWARM_ENABLED=True)
+    def test_prewarm_is_skipped_once_the_quota_is_spent(self):
+        with mock.patch.object(prewarm, "_schedule", return_value=True) as schedule:
+            self.assertEqual(prewarm.schedule_prewarm(self.user), 2)
+            self._generate(100)
+            self.assertEqual(prewarm.schedule_prewarm(self.user), 0)
+        self.assertEqual(schedule.call_count, 2)
+
+
+QUESTIONS = [{"question": "What is an index?", "key_points": ["B-tree"]}]
+
+
+@override_settings(
+    AI_MODEL_ROUTES={"questions": [
+        {"max_input_chars": 100, "model": "small", "temperature": 0.7, "max_tokens": 500},
+        {"max_input_chars": None, "model": "large", "temperature": 0.7, "max_tokens": 2000},
+    ]},
+    AI_MODEL_OVERRIDES={},
+    AI_CASCADE={"fast_model": "fast", "min_confidence": 0.6},
+    AI_WORKLOAD_RECORD_PATH=None,
+)
+class RoutingTests(TestCase):
+    def _complete(self, answers, policy="cascade", prompt="Questions please"):
+        """Run complete_json with each model answering (content, confidence) from answers"""
+        calls = []
+
+        def call(task, params, messages, want_confidence=False):
+            calls.append((params["model"], want_confidence))
+            if isinstance(answers[params["model"]], Exception):
+                raise answers[params["model"]]
+            content, confidence = answers[params["model"]]
+            return content, SimpleNamespace(prompt_tokens=10, completion_tokens=5), confidence
+
+        with mock.patch.object(routing, "_call", side_effect=call):
+            try:
+                return routing.complete_json("questions", "system", prompt, policy=policy), calls
+            except routing.RoutingError:
+                return None, calls
+
+    def test_the_input_size_picks_the_band_and_overrides_win(self):
+        self.assertEqual(routing.route("questions", 100)["model"], "small")
+        self.assertEqual(routing.route("questions", 101)["model"], "large")
+        with override_settings(AI_MODEL_OVERRIDES={"questions": {"model": "tuned", "max_tokens": 10}}):
+            self.assertEqual(routing.route("questions", 5), {"model": "tuned", "temperature": 0.7, "max_tokens": 10})
+
+    def test_a_confident_valid_fast_answer_is_used(self):
+        data, calls = self._complete({"fast": (json.dumps(QUESTIONS), 0.9)})
+        self.assertEqual(data, QUESTIONS)
+        self.assertEqual(calls, [("fast", True)])
+
+    def test_the_cascade_escalates_invalid_or_unconfident_answers(self):
+        routed = ("```json\n" + json.dumps(QUESTIONS) + "\n```", None)
+        for fast in (("not json", 0.9), (json.dumps([{"question": "No key points"}]), 0.9),
+                     (json.dumps(QUESTIONS), 0.3)):
+            data, calls = self._complete({"fast": fast, "small": routed})
+            self.assertEqual(data, QUESTIONS)
+            self.assertEqual(calls, [("fast", True), ("small", False)])
+
+    def test_a_failing_fast_model_escalates(self):
+        data, calls = self._complete({"fast": providers.ProviderError("fast: refused"),
+                                      "small": (json.dumps(QUESTIONS), None)})
+        self.assertEqual(data, QUESTIONS)
+        self.assertEqual(calls, [("fast", True), ("small", False)])
+
+    def test_the_single_policy_calls_only_the_routed_model(self):
+        data, calls = self._complete({"large": (json.dumps(QUESTIONS), None)}, policy="single", prompt="x" * 101)
+        self.assertEqual(data, QUESTIONS)
+        self.assertEqual(calls, [("large", False)])
+
+        data, calls = self._complete({"small": ("[]", None)}, policy="single")
+        self.assertIsNone(data)
+
+
+class Rejected(Exception):
+    status_code = 400
+
+
+@override_settings(
+    AI_PROVIDERS={"primary": {"type": "stub"}, "secondary": {"type": "stub"}},
+    AI_PROVIDER_ORDER=["primary", "secondary"],
+    AI_PROVIDER_RETRY_SECONDS=30,
+)
+class ProviderFailoverTests(TestCase):
+    MESSAGES = [{"role": "user", "content": "Questions please"}]
+
+    def setUp(self):
+        providers.reset_providers()
+        self.primary, self.secondary = providers.get_providers()
+
+    def _complete(self):
+        return providers.complete("questions", self.MESSAGES, model="gpt-3.5-turbo")
+
+    def test_a_failing_provider_is_skipped_until_its_cooldown_passes(self):
+        with mock.patch.object(self.primary, "complete", side_effect=ConnectionError("refused")) as primary, \
+                mock.patch.object(self.secondary, "complete", wraps=self.secondary.complete) as secondary:
+            self._complete()
+            self._complete()
+            self.assertEqual((primary.call_count, secondary.call_count), (1, 2))
+            self.assertFalse(providers.is_up(self.primary))
+
+            with override_settings(AI_PROVIDER_RETRY_SECONDS=0):
+                providers.mark_down(self.primary)
+            self._complete()
+            self.assertEqual(primary.call_count, 2)
+
+    def test_rejected_requests_are_not_retried_elsewhere(self):
+        with mock.patch.object(self.primary, "complete", side_effect=Rejected("bad request")), \
+                mock.patch.object(self.secondary, "complete") as secondary:
+            with self.assertRaises(Rejected):
+                self._complete()
+        secondary.assert_not_called()
+        self.assertTrue(providers.is_up(self.primary))
+
+    def test_an_error_is_raised_once_every_provider_is_down(self):
+        with mock.patch.object(self.primary, "complete", side_effect=TimeoutError("slow")), \
+                mock.patch.object(self.secondary, "complete", side_effect=ConnectionError("refused")):
+            with self.assertRaisesMessage(providers.ProviderError, "primary: slow; secondary: refused"):
+                self._complete()
+            with self.assertRaisesMessage(providers.ProviderError, "down"):
+                self._complete()
+
+    def test_logprobs_only_reach_providers_that_support_them(self):
+        self.secondary.logprobs = True
+        with mock.patch.object(self.primary, "complete", side_effect=ConnectionError("refused")) as primary, \
+                mock.patch.object(self.secondary, "complete") as secondary:
+            providers.complete("questions", self.MESSAGES, model="gpt-3.5-turbo", logprobs=True)
+        self.assertNotIn("logprobs", primary.call_args.kwargs)
+        self.assertTrue(secondary.call_args.kwargs["logprobs"])
+
+    def test_the_stub_answers_pass_the_routing_schema_checks(self):
+        data = routing.complete_json("questions", "system", "Questions please", policy="single")
+        self.assertTrue(data[0]["question"])
+
+
+def _question_set(label):
+    return [{"question": label, "key_points": ["point"]}]
+
+
+@override_settings(AI_PROVIDER_ORDER=["stub"])
+class BatchGenerationTests(TestCase):
+    REQUESTS = [{"role": f"Role {i}", "interview_type": "technical", "experience_level": "mid"} for i in range(5)]
+
+    def _generate(self, answer, **options):
+        """Run generate_batch with each completion answered by answer(keys, call_number)"""
+        batches = []
+
+        def complete_json(task, system, prompt, attempts=None):
+            keys = re.findall(r'"(r\d+)"', prompt.rsplit("exactly the keys", 1)[-1])
+            batches.append(keys)
+            attempts.append({"prompt_tokens": 100, "completion_tokens": 50})
+            return answer(keys, len(batches))
+
+        def generate_interview_questions(role, *args, attempts=None):
+            attempts.append({"prompt_tokens": 40, "completion_tokens": 20})
+            return _question_set(f"single {role}")
+
+        stats = {}
+        with mock.patch.object(batching, "complete_json", side_effect=complete_json), \
+                mock.patch("core.ai_utils.generate_interview_questions", side_effect=generate_interview_questions):
+            results = batching.generate_batch("questions", self.REQUESTS, stats=stats, **options)
+        return results, batches, stats
+
+    def test_each_request_gets_the_part_answered_under_its_key(self):
+        # Answer the keys in reverse order to make sure results follow the requests
+        results, batches, stats = self._generate(
+            lambda keys, call: {key: _question_set(key) for key in reversed(keys)}, batch_size=2)
+        self.assertEqual(results, [_question_set(f"r{i}") for i in range(5)])
+        self.assertEqual(batches, [["r0", "r1"], ["r2", "r3"], ["r4"]])
+        self.assertEqual(stats, {"completions": 3, "tokens": 450, "single_calls": 0})
+
+    def test_missing_and_invalid_parts_are_retried_in_a_batch_then_one_by_one(self):
+        def answer(keys, call):
+            if call == 1:
+                # r1 is missing and r2 fails the schema check
+                return {"r0": _question_set("r0"), "r2": [{"question": "No key points"}], "r3": _question_set("r3"),
+                        "r4": _question_set("r4")}
+            # The retry only fixes r1
+            return {"r1": _question_set("r1 retried")}
+
+        results, batches, stats = self._generate(answer, batch_size=5)
+        self.assertEqual(batches, [["r0", "r1", "r2", "r3", "r4"], ["r1", "r2"]])
+        self.assertEqual(results[1], _question_set("r1 retried"))
+        self.assertEqual(results[2], _question_set("single Role 2"))
+        # The single-request fallback's tokens count too
+        self.assertEqual(stats, {"completions": 2, "tokens": 360, "single_calls": 1})
+
+    def test_a_failed_completion_retries_all_of_its_keys(self):
+        def answer(keys, call):
+            if call == 1:
+                raise ValueError("no JSON")
+            return {key: _question_set(key) for key in keys}
+
+        results, batches, stats = self._generate(answer, batch_size=3)
+        self.assertEqual(batches, [["r0", "r1", "r2"], ["r3", "r4"], ["r0", "r1", "r2"]])
+        self.assertEqual(results, [_question_set(f"r{i}") for i in range(5)])
+        self.assertEqual(stats["single_calls"], 0)
+
+    def test_batched_roadmaps_ask_for_the_same_skill_fields_as_single_ones(self):
+        prompt = batching.build_batch_prompt(
+            "roadmap", [("r0", {"job_role": "Backend Engineer", "experience_years": 3, "target_skills": ["SQL"]})])
+        self.assertIn(ai_utils.roadmap_skills_instruction(["SQL"]), prompt)
+
+
+@override_settings(AI_PROVIDER_ORDER=["stub"], PREWARM_ENABLED=True, SESSION_GC_INTERVAL=0, STORAGES=STORAGES)
+class PrewarmTriggerTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user("member")
+        Profile.objects.create(user=self.user, job_role="Backend Engineer", experience_years=3)
+
+    def test_logging_in_prewarms_and_browsing_does_not(self):
+        with mock.patch.object(prewarm, "_schedule", return_value=True) as schedule:
+            self.client.force_login(self.user)
+            self.assertEqual(schedule.call_count, 2)
+            for _ in range(3):
+                self.assertEqual(self.client.get(reverse("dashboard")).status_code, 200)
+            self.assertEqual(schedule.call_count, 2)
+
+
+@override_settings(SESSION_GC_INTERVAL=0, PREWARM_ENABLED=False, STORAGES=STORAGES)
+class SessionSerializerTests(TestCase):
+    def test_round_trip_is_smaller_than_plain_json(self):
+        session = {"_auth_user_id": "1", "interview_id": 5, "user_answers": [{"question_index": 0, "answer": "é"}]}
+        serializer = CompressedJSONSerializer()
+        data = serializer.dumps(session)
+        self.assertEqual(serializer.loads(data), session)
+        self.assertLess(len(data), len(JSONSerializer().dumps(session)))
+
+    def test_plain_json_written_before_compression_is_still_read(self):
+        self.assertEqual(CompressedJSONSerializer().loads(b'{"interview_id":5}'), {"interview_id": 5})
+
+    def test_sessions_stored_by_the_old_serializer_stay_logged_in(self):
+        user = User.objects.create_user("returning")
+        store_class = import_module(settings.SESSION_ENGINE).SessionStore
+        with override_settings(SESSION_SERIALIZER="django.contrib.sessions.serializers.JSONSerializer"):
+            old = store_class()
+            self.client.force_login(user)
+            old.update(self.client.session.items())
+            old["interview_questions"] = [{"question": "Q"}]
+            old.save()
+        self.client.logout()
+
+        store = store_class(session_key=old.session_key)
+        self.assertEqual(store["_auth_user_id"], str(user.pk))
+        self.assertEqual(store.decode(signing.dumps({"a": 1}, salt=store.key_salt, serializer=JSONSerializer,
+                                                    compress=True)), {"a": 1})
+
+        self.client.cookies[settings.SESSION_COOKIE_NAME] = old.session_key
+        self.assertEqual(self.client.get(reverse("dashboard")).status_code, 200)
+
+
+class SessionGCTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_gc_only_starts_with_an_interval_and_a_database_other_threads_can_use(self):
+        with mock.patch("core.sessions.threading.Thread") as thread, mock.patch("core.sessions._last_gc", None):
+            with override_settings(SESSION_GC_INTERVAL=0):
+                maybe_schedule_gc()
+            # The test database is in-memory SQLite
+            with override_settings(SESSION_GC_INTERVAL=60):
+                maybe_schedule_gc()
+            self.assertFalse(thread.called)
+
+            with override_settings(SESSION_GC_INTERVAL=60), \
+                    mock.patch.object(connection, "is_in_memory_db", return_value=False):
+                maybe_schedule_gc()
+            self.assertEqual(thread.call_count, 1)
+
+
+ARGON2_FIRST = ["core.hashers.TunedArgon2PasswordHasher", "core.hashers.TunedPBKDF2PasswordHasher"]
+
+
+@override_settings(ARGON2_TIME_COST=1, ARGON2_MEMORY_COST=1024, ARGON2_PARALLELISM=1, PBKDF2_ITERATIONS=1000)
+class PasswordRehashTests(TestCase):
+    def _user(self, hashers):
+        with override_settings(PASSWORD_HASHERS=hashers):
+            return User.objects.create_user("member", password="correct horse")
+
+    def _login(self, password="correct horse"):
+        with override_settings(PASSWORD_HASHERS=ARGON2_FIRST):
+            return self.client.login(username="member", password=password)
+
+    def test_hashes_from_another_policy_are_replaced_at_login(self):
+        user = self._user(list(reversed(ARGON2_FIRST)))
+        self.assertTrue(user.password.startswith("pbkdf2_sha256$1000$"))
+        self.assertTrue(self._login())
+        user.refresh_from_db()
+        self.assertTrue(user.password.startswith("argon2$argon2id$v=19$m=1024,t=1,p=1$"))
+
+    def test_changed_costs_are_applied_at_login(self):
+        user = self._user(ARGON2_FIRST)
+        with override_settings(ARGON2_TIME_COST=2):
+            self.assertTrue(self._login())
+        user.refresh_from_db()
+        self.assertIn("$m=1024,t=2,p=1$", user.password)
+
+    def test_a_wrong_password_keeps_the_old_hash(self):
+        user = self._user(list(reversed(ARGON2_FIRST)))
+        self.assertFalse(self._login("wrong"))
+        self.assertEqual(User.objects.get(pk=user.pk).password, user.password)
+
+
+class BulkImportTests(TestCase):
+    USERS = [
+        {"username": "ada", "email": "ada@example.com", "first_name": "Ada", "is_staff": "true"},
+        {"username": "bob", "email": "bob@example.com"},
+    ]
+    PROFILES = [
+        {"username": "ada", "job_role": "Backend Engineer", "experience_years": "4"},
+        {"username": "nobody", "job_role": "Ghost"},
+    ]
+    RESUMES = [
+        {"owner": "ada", "title": "CV", "file": "resumes/ada.pdf", "uploaded_at": "2024-01-02T03:04:05+00:00"},
+    ]
+
+    def test_importing_the_same_rows_twice_changes_nothing(self):
+        counts = import_rows("users", self.USERS, batch_size=1)
+        self.assertEqual((counts["created"], counts["updated"]), (2, 0))
+        self.assertEqual(import_rows("profiles", self.PROFILES)["skipped"], 1)
+        import_rows("resumes", self.RESUMES)
+        users = {user.username: (user.pk, user.password) for user in User.objects.all()}
+
+        self.assertEqual(import_rows("users", self.USERS)["unchanged"], 2)
+        self.assertEqual(import_rows("profiles", self.PROFILES)["unchanged"], 1)
+        self.assertEqual(import_rows("resumes", self.RESUMES)["unchanged"], 1)
+        self.assertEqual({user.username: (user.pk, user.password) for user in User.objects.all()}, users)
+        self.assertEqual(Profile.objects.count(), 1)
+        self.assertEqual(Resume.objects.get().uploaded_at.year, 2024)
+
+    def test_changed_rows_are_updated_in_place(self):
+        import_rows("users", self.USERS)
+        counts = import_rows("users", [dict(self.USERS[1], email="robert@example.com")])
+        self.assertEqual((counts["created"], counts["updated"]), (0, 1))
+        self.assertEqual(User.objects.get(username="bob").email, "robert@example.com")
+        self.assertEqual(User.objects.count(), 2)
+
+    def test_an_export_imports_back_unchanged(self):
+        import_rows("users", self.USERS)
+        import_rows("profiles", self.PROFILES)
+        for dataset in ("users", "profiles"):
+            for fmt in ("csv", "jsonl"):
+                rows = read_rows(StringIO("".join(export_lines(dataset, fmt))), fmt)
+                counts = import_rows(dataset, rows)
+                self.assertEqual(counts["unchanged"], 2 if dataset == "users" else 1, (dataset, fmt))
+                self.assertEqual(counts["created"] + counts["updated"], 0, (dataset, fmt))
+
+
+# Report workers are other threads, which cannot see the test's uncommitted database cache rows
+@override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+class ReportTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.storages = {**STORAGES, "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"}}
+        # Django 5.0 ignores OPTIONS of an overridden default storage, so the location is MEDIA_ROOT
+        self.media_root = tempfile.mkdtemp()
+        self.user = User.objects.create_user("reader")
+
+    def _roadmap(self):
+        from roadmap.models import Roadmap
+        return Roadmap.objects.create(user=self.user, job_role="Backend Engineer", content={"modules": [
+            {"key": "core:0", "title": "Basics", "topics": ["HTTP"], "resources": [], "projects": []}]})
+
+    def test_a_failed_render_is_reported_instead_of_pending_forever(self):
+        roadmap = self._roadmap()
+        with override_settings(STORAGES=self.storages, MEDIA_ROOT=self.media_root), \
+                mock.patch.object(reports, "_render_pdf", side_effect=RuntimeError("broken")):
+            self.assertEqual(reports.request_report("roadmap", roadmap, "pdf")[1], "pending")
+            reports.shutdown_workers()
+            self.assertEqual(reports.request_report("roadmap", roadmap, "pdf")[1], "failed")
+
+    def test_a_stored_report_is_ready(self):
+        roadmap = self._roadmap()
+        with override_settings(STORAGES=self.storages, MEDIA_ROOT=self.media_root):
+            self.assertEqual(reports.request_report("roadmap", roadmap, "html")[1], "pending")
+            reports.shutdown_workers()
+            digest, status = reports.request_report("roadmap", roadmap, "html")
+        self.assertEqual(status, "ready")
+        self.assertEqual(digest, reports.report_digest("roadmap", reports.roadmap_report_data(roadmap)))
+
+
+@override_settings(AI_PROVIDER_ORDER=["stub"], RATELIMIT_ENABLED=False, SESSION_GC_INTERVAL=0)
+class BenchmarkInvariantTests(TestCase):
+    """The checks the benchmark commands fail on, at sizes small enough for the test suite"""
+
+    def setUp(self):
+        cache.clear()
+
+    def _call(self, name, **options):
+        out = StringIO()
+        call_command(name, stdout=out, stderr=StringIO(), **options)
+        return out.getvalue()
+
+    def test_offline_content_covers_every_role_family(self):
+        self.assertIn("distinct roadmaps", self._call("offline_benchmark", repeat=1))
+
+    def test_recommender_scores_users(self):
+        self.assertIn("Scoring a user takes under", self._call("recommend_benchmark", users=50, max_us=1e6))
+
+    def test_concurrent_report_requests_store_one_file(self):
+        output = self._call("report_benchmark", reports=3, workers="1,2", formats="html,pdf", duplicates=8)
+        self.assertIn("8 concurrent requests for one report stored one file", output)
+
+    def test_incremental_progress_summaries_match_a_rebuild(self):
+        output = self._call("progress_benchmark", in_place=True, users=3, sessions=20, appends=6, repeat=1)
+        self.assertIn("match a rebuild", output)
+
+    def test_module_updates_use_fewer_tokens_than_full_regeneration(self):
+        self.assertIn("of full regeneration", self._call("roadmap_benchmark", in_place=True, repeat=1))
+
+    def test_hot_pages_keep_their_queries_as_tables_grow(self):
+        # Timings are too noisy at this size to compare; query counts and plans are not.
+        # Much smaller tables are scanned rather than searched, which changes the plans.
+        output = self._call("scale_check", in_place=True, rows=[300, 1500], heavy_resumes=30, repeat=1,
+                            max_growth=1e6)
+        self.assertIn("stay flat", output)
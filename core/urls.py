@@ -6,4 +6,7 @@ urlpatterns = [
     path('register/', views.register, name='register'),
     path('dashboard/', views.dashboard, name='dashboard'),
     path('profile/', views.profile, name='profile'),
+    path('metrics/prewarm/', views.prewarm_metrics, name='prewarm_metrics'),
+    path('metrics/sessions/', views.session_metrics, name='session_metrics'),
+    path('metrics/memory/', views.memory_metrics, name='memory_metrics'),
 ]
@@ -2,8 +2,15 @@ from django.shortcuts import render, redirect
 from django.contrib.auth import login
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
+from django.contrib.admin.views.decorators import staff_member_required
+from django.conf import settings
+from django.http import Http404, JsonResponse
+from interview.progress import progress_overview
 from .forms import UserRegisterForm, ProfileUpdateForm
 from .models import Profile
+from . import memwatch
+from .prewarm import schedule_prewarm, prewarm_stats
+from .sessions import session_stats
 
 def home(request):
     """Home page view for non-authenticated users"""
@@ -36,6 +43,8 @@ def dashboard(request):
     
     context = {
         'profile': profile,
+        # One summary row, however many interviews the user has finished
+        'progress': progress_overview(request.user),
     }
     return render(request, 'dashboard.html', context)
 
@@ -50,7 +59,8 @@ def profile(request):
     if request.method == 'POST':
         form = ProfileUpdateForm(request.POST, request.FILES, instance=profile)
         if form.is_valid():
-            form.save()
+            profile = form.save()
+            schedule_prewarm(request.user, profile)
             messages.success(request, 'Profile updated successfully!')
             return redirect('profile')
     else:
@@ -71,3 +81,34 @@ def profile(request):
         'completion_percentage': completion,
     }
     return render(request, 'profile.html', context)
+
+@staff_member_required
+def prewarm_metrics(request):
+    """Prewarm hit-rate counters for this deployment's cache"""
+    return JsonResponse(prewarm_stats())
+
+@staff_member_required
+def session_metrics(request):
+    """Session count, per-session size and django_session table size"""
+    return JsonResponse(session_stats())
+
+@staff_member_required
+def memory_metrics(request):
+    """
+    Memory of the worker serving this request and its top growth sites
+
+    ?start=1 starts tracing and sets the baseline, ?rebase=1 reports and then
+    sets a new baseline, ?stop=1 stops tracing. Needs MEMWATCH_ENABLED.
+    """
+    if not settings.MEMWATCH_ENABLED:
+        raise Http404
+    if request.GET.get('start'):
+        memwatch.start()
+    elif request.GET.get('stop'):
+        memwatch.stop()
+    key_type = request.GET.get('group_by', 'lineno')
+    if key_type not in ('lineno', 'filename', 'traceback'):
+        key_type = 'lineno'
+    return JsonResponse(memwatch.growth_report(
+        limit=settings.MEMWATCH_TOP, key_type=key_type, rebase=bool(request.GET.get('rebase')),
+    ))
@@ -0,0 +1,107 @@
+"""
+Gunicorn configuration for AI Interview Coach
+
+Used by render.yaml: gunicorn -c gunicorn.conf.py ai_interview_coach.wsgi:application
+Every value can be overridden with the environment variables below.
+
+Most request time is spent waiting on the LLM provider, so the default worker
+class is gthread: each worker serves GUNICORN_THREADS requests at once instead
+of sitting idle for the whole OpenAI call. GUNICORN_WORKER_CLASS=gevent serves
+GUNICORN_WORKER_CONNECTIONS requests per worker on greenlets, and "sync" keeps
+gunicorn's one-request-per-worker model. `manage.py concurrency_benchmark`
+compares the three.
+"""
+import os
+
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'gthread')
+
+if worker_class == 'gevent':
+    # Patch before Django, the OpenAI SDK or anything else is imported (the
+    # app is preloaded in the master below), so every socket, lock and
+    # thread-local they create is cooperative
+    try:
+        # httpcore (under the OpenAI SDK) imports trio when it is installed,
+        # and trio's import fails once gevent has removed select.epoll
+        import trio  # noqa: F401
+    except ImportError:
+        pass
+    from gevent import monkey
+    monkey.patch_all()
+
+    # Django keeps one DB connection per thread-local, which gevent turns into
+    # one per greenlet, and greenlets are not reused: persistent connections
+    # would pile up until the database refuses more. Close them per request.
+    os.environ['DATABASE_CONN_MAX_AGE'] = '0'
+
+
+# gunicorn puts its working directory on sys.path before reading this file
+from ai_interview_coach.cpus import cpu_count  # noqa: E402
+
+cpus = cpu_count()
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+
+# Sync workers need one process per concurrent request; cooperative workers
+# only need enough processes to keep the CPUs busy
+default_workers = cpus * 2 + 1 if worker_class == 'sync' else cpus + 1
+workers = int(os.getenv('WEB_CONCURRENCY', str(default_workers)))
+threads = int(os.getenv('GUNICORN_THREADS', '8')) if worker_class == 'gthread' else 1
+worker_connections = int(os.getenv('GUNICORN_WORKER_CONNECTIONS', '100'))
+
+# Evaluations can take a while on slow providers; only sync workers are
+# killed for a request running past this, cooperative ones keep heartbeating
+timeout = int(os.getenv('GUNICORN_TIMEOUT', '120'))
+graceful_timeout = int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT', '30'))
+keepalive = int(os.getenv('GUNICORN_KEEPALIVE', '5'))
+
+# Recycle workers now and then so slow leaks cannot grow without bound; the
+# jitter stops every worker from restarting at the same moment
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', '1000'))
+max_requests_jitter = int(os.getenv('GUNICORN_MAX_REQUESTS_JITTER', '100'))
+
+# Load Django once in the master and fork workers from it, so the imported
+# code and the resolved URLconf are shared copy-on-write between workers
+preload_app = os.getenv('GUNICORN_PRELOAD', 'True') == 'True'
+
+
+def when_ready(server):
+    server.log.info(
+        "Worker class %s: %d workers x %d %s",
+        worker_class, workers,
+        worker_connections if worker_class == 'gevent' else threads,
+        "connections" if worker_class == 'gevent' else "threads",
+    )
+    if not preload_app:
+        return
+    # Django resolves the URLconf (and imports every app's views) on the first
+    # request; do it in the master so workers inherit it already loaded
+    from django.urls import get_resolver
+    get_resolver().url_patterns
+    # Same for the offline content dataset (see core/offline.py)
+    from core.offline import load_content
+    load_content()
+
+
+def post_fork(server, worker):
+    if worker_class == 'gevent':
+        try:
+            # psycopg2 blocks the whole worker on queries unless it is told
+            # to wait through gevent; SQLite and psycopg 3 need nothing
+            from psycogreen.gevent import patch_psycopg
+        except ImportError:
+            pass
+        else:
+            patch_psycopg()
+    if not preload_app:
+        return
+    # Never share database connections opened in the master with a worker
+    from django.db import connections
+    connections.close_all()
+
+
+def post_worker_init(worker):
+    # Gunicorn resets the worker's signal handlers before this hook, so the
+    # SIGUSR2 memory dump has to be installed here (see core/memwatch.py)
+    from django.conf import settings
+    if settings.MEMWATCH_ENABLED:
+        from core.memwatch import install_signal_handler
+        install_signal_handler()
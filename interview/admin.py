@@ -1,3 +1,25 @@
 from django.contrib import admin
+from core.pagination import EstimatedCountPaginator
+from .models import InterviewSession, ScoreRecord, ScoreSummary
 
-# Register your models here.
+@admin.register(InterviewSession)
+class InterviewSessionAdmin(admin.ModelAdmin):
+    list_display = ("id", "user", "role", "interview_type", "experience_level", "created_at", "completed_at")
+    list_select_related = ("user",)
+
+@admin.register(ScoreRecord)
+class ScoreRecordAdmin(admin.ModelAdmin):
+    list_display = ("id", "user", "overall_score", "role", "interview_type", "recorded_at")
+    list_select_related = ("user",)
+    search_fields = ("user__username__exact",)
+    raw_id_fields = ("user", "interview")
+    ordering = ("-id",)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+@admin.register(ScoreSummary)
+class ScoreSummaryAdmin(admin.ModelAdmin):
+    list_display = ("user", "sessions", "best_score", "last_score", "current_streak", "last_recorded_at")
+    list_select_related = ("user",)
+    search_fields = ("user__username__exact",)
+    raw_id_fields = ("user",)
@@ -0,0 +1,50 @@
+# Generated by Django 5.0 on 2026-10-19 14:47
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('interview', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScoreSummary',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='score_summary', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('sessions', models.PositiveIntegerField(default=0)),
+                ('total_score', models.FloatField(default=0)),
+                ('best_score', models.FloatField(blank=True, null=True)),
+                ('last_score', models.FloatField(blank=True, null=True)),
+                ('last_recorded_at', models.DateTimeField(blank=True, null=True)),
+                ('current_streak', models.PositiveIntegerField(default=0)),
+                ('longest_streak', models.PositiveIntegerField(default=0)),
+                ('last_active_date', models.DateField(blank=True, null=True)),
+                ('recent_scores', models.JSONField(default=list)),
+                ('categories', models.JSONField(default=dict)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ScoreRecord',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('overall_score', models.FloatField()),
+                ('category_scores', models.JSONField(default=dict)),
+                ('role', models.CharField(max_length=255)),
+                ('interview_type', models.CharField(max_length=30)),
+                ('recorded_at', models.DateTimeField()),
+                ('interview', models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='score_record', to='interview.interviewsession')),
+                ('user', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='score_records', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-recorded_at'],
+                'indexes': [models.Index(fields=['user', 'recorded_at'], name='interview_s_user_id_2337a6_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.0 on 2026-10-19 14:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interview', '0002_score_history'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='scorerecord',
+            name='weak_topics',
+            field=models.JSONField(default=dict),
+        ),
+        migrations.AddField(
+            model_name='scoresummary',
+            name='weakness',
+            field=models.BinaryField(blank=True, default=bytes),
+        ),
+    ]
@@ -1,3 +1,74 @@
 from django.db import models
+from django.contrib.auth import get_user_model
 
-# Create your models here.
+User = get_user_model()
+
+class InterviewSession(models.Model):
+    """A mock interview: its generated questions, the user's answers and the evaluation"""
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="interview_sessions")
+    role = models.CharField(max_length=255)
+    interview_type = models.CharField(max_length=30)
+    experience_level = models.CharField(max_length=20)
+    questions = models.JSONField(default=list)
+    answers = models.JSONField(default=list)
+    evaluation = models.JSONField(blank=True, null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    completed_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [models.Index(fields=["user", "-created_at"])]
+
+    def __str__(self):
+        return f"{self.role} ({self.interview_type}) - {self.user}"
+
+
+class ScoreRecord(models.Model):
+    """One finished interview's scores; rows are only ever added"""
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="score_records", db_index=False)
+    # Kept when the interview itself is deleted; unique so an interview is recorded once
+    interview = models.OneToOneField(InterviewSession, on_delete=models.SET_NULL, blank=True, null=True,
+                                     related_name="score_record")
+    overall_score = models.FloatField()
+    category_scores = models.JSONField(default=dict)
+    # {topic: weight} of the weak areas the feedback points at (see recommender.py)
+    weak_topics = models.JSONField(default=dict)
+    role = models.CharField(max_length=255)
+    interview_type = models.CharField(max_length=30)
+    recorded_at = models.DateTimeField()
+
+    class Meta:
+        ordering = ["-recorded_at"]
+        # Serves a user's history in either direction; user_id alone needs no index of its own
+        indexes = [models.Index(fields=["user", "recorded_at"])]
+
+    def __str__(self):
+        return f"{self.overall_score} - {self.role} ({self.interview_type}) - {self.user}"
+
+
+class ScoreSummary(models.Model):
+    """Running totals over a user's ScoreRecords, updated as each one is added"""
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name="score_summary")
+    sessions = models.PositiveIntegerField(default=0)
+    total_score = models.FloatField(default=0)
+    best_score = models.FloatField(blank=True, null=True)
+    last_score = models.FloatField(blank=True, null=True)
+    last_recorded_at = models.DateTimeField(blank=True, null=True)
+    # Consecutive days (in TIME_ZONE) with at least one finished interview
+    current_streak = models.PositiveIntegerField(default=0)
+    longest_streak = models.PositiveIntegerField(default=0)
+    last_active_date = models.DateField(blank=True, null=True)
+    # The latest settings.SCORE_TREND_LENGTH overall scores, oldest first
+    recent_scores = models.JSONField(default=list)
+    # {category: {"sessions": int, "total": float, "best": float, "last": float}}
+    categories = models.JSONField(default=dict)
+    # Decayed sum of weak_topics as float32, one entry per recommender.TOPICS
+    weakness = models.BinaryField(default=bytes, blank=True)
+
+    def __str__(self):
+        return f"{self.user} - {self.sessions} sessions"
+
+    @property
+    def average_score(self):
+        return self.total_score / self.sessions if self.sessions else None
@@ -0,0 +1,223 @@
+"""
+Per-user score history and the running totals the dashboard reads
+
+Every finished interview appends one ScoreRecord (overall score, average
+score per question category, role, type and time) and folds it into the
+user's single ScoreSummary row in the same transaction: session count and
+score total for the running average, best and last scores, day streaks, the
+latest SCORE_TREND_LENGTH scores, the same totals per category and the
+decayed weakness vector the recommender ranks topics with. The
+dashboard therefore reads one row however long the history gets, and
+rebuild_summary() can always recompute that row from the records.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .models import InterviewSession, ScoreRecord, ScoreSummary
+from .recommender import add_weakness, evaluation_weakness, rank_topics, weakness_vector
+
+
+def _number(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def score_evaluation(interview, evaluation):
+    """
+    Pull the overall and per-category scores out of an evaluation
+
+    Questions are grouped by their "category" when the generator gave one,
+    otherwise by the interview type.
+
+    Args:
+        interview: The evaluated InterviewSession (answers already stored)
+        evaluation: Its evaluation dictionary
+
+    Returns:
+        Tuple of (overall score, {category: average score}), or None if the
+        evaluation has no usable scores
+    """
+    if not isinstance(evaluation, dict):
+        return None
+    feedback = evaluation.get("question_feedback") or []
+    scores = {}
+    for i, answer in enumerate(interview.answers or []):
+        score = _number(feedback[i].get("score")) if i < len(feedback) and isinstance(feedback[i], dict) else None
+        index = answer.get("question_index") if isinstance(answer, dict) else None
+        if score is None or not isinstance(index, int) or not 0 <= index < len(interview.questions):
+            continue
+        question = interview.questions[index]
+        category = (question.get("category") if isinstance(question, dict) else None) or interview.interview_type
+        scores.setdefault(category, []).append(score)
+    category_scores = {category: round(sum(values) / len(values), 2) for category, values in scores.items()}
+
+    overall = _number(evaluation.get("overall_score"))
+    if overall is None and scores:
+        overall = sum(sum(values) for values in scores.values()) / sum(len(values) for values in scores.values())
+    if overall is None:
+        return None
+    return round(overall, 2), category_scores
+
+
+def add_to_summary(summary, record):
+    """
+    Fold one record into a summary in memory (records must come oldest first)
+
+    Args:
+        summary: The user's ScoreSummary
+        record: A ScoreRecord not yet counted in it
+    """
+    score = record.overall_score
+    summary.sessions += 1
+    summary.total_score += score
+    summary.best_score = score if summary.best_score is None else max(summary.best_score, score)
+    summary.last_score = score
+    summary.last_recorded_at = record.recorded_at
+    summary.recent_scores = (summary.recent_scores + [score])[-settings.SCORE_TREND_LENGTH:]
+
+    day = timezone.localdate(record.recorded_at)
+    last_day = summary.last_active_date
+    if last_day is None or day > last_day:
+        summary.current_streak = summary.current_streak + 1 if last_day == day - timedelta(days=1) else 1
+        summary.longest_streak = max(summary.longest_streak, summary.current_streak)
+        summary.last_active_date = day
+
+    for category, score in record.category_scores.items():
+        totals = summary.categories.get(category)
+        if totals is None:
+            summary.categories[category] = {"sessions": 1, "total": score, "best": score, "last": score}
+        else:
+            totals["sessions"] += 1
+            totals["total"] += score
+            totals["best"] = max(totals["best"], score)
+            totals["last"] = score
+
+    add_weakness(summary, record.weak_topics)
+
+
+def _locked_summary(user_id):
+    locked = ScoreSummary.objects.select_for_update().filter(user_id=user_id)
+    summary = locked.first()
+    if summary is None:
+        # Another request may create it first; lock whichever row won
+        ScoreSummary.objects.get_or_create(user_id=user_id)
+        summary = locked.get()
+    return summary
+
+
+def record_evaluation(interview, evaluation):
+    """
+    Append an evaluated interview to its user's history and update the summary
+
+    Safe to call more than once for the same interview: only the first call
+    records anything.
+
+    Args:
+        interview: The InterviewSession, with answers and completed_at stored
+        evaluation: Its evaluation dictionary
+
+    Returns:
+        The new ScoreRecord, or None if nothing was recorded
+    """
+    scores = score_evaluation(interview, evaluation)
+    if scores is None:
+        return None
+    with transaction.atomic():
+        # Lock the summary row first, so concurrent finishes for one user queue up here
+        summary = _locked_summary(interview.user_id)
+        if ScoreRecord.objects.filter(interview=interview).exists():
+            return None
+        record = ScoreRecord.objects.create(
+            user_id=interview.user_id,
+            interview=interview,
+            overall_score=scores[0],
+            category_scores=scores[1],
+            weak_topics=evaluation_weakness(interview, evaluation),
+            role=interview.role,
+            interview_type=interview.interview_type,
+            recorded_at=interview.completed_at or timezone.now(),
+        )
+        add_to_summary(summary, record)
+        summary.save()
+    return record
+
+
+def backfill_records(batch_size=1000):
+    """
+    Record evaluated interviews that have no ScoreRecord yet (oldest first)
+
+    Returns:
+        Number of records added
+    """
+    pending = (InterviewSession.objects
+               .filter(evaluation__isnull=False, completed_at__isnull=False, score_record__isnull=True)
+               .order_by("completed_at", "pk"))
+    added = 0
+    for interview in pending.iterator(chunk_size=batch_size):
+        if record_evaluation(interview, interview.evaluation) is not None:
+            added += 1
+    return added
+
+
+def rebuild_summary(user_id, batch_size=2000):
+    """
+    Recompute a user's ScoreSummary from their ScoreRecords
+
+    Returns:
+        The saved ScoreSummary
+    """
+    with transaction.atomic():
+        _locked_summary(user_id)
+        summary = ScoreSummary(user_id=user_id)
+        records = (ScoreRecord.objects.filter(user_id=user_id).order_by("recorded_at", "pk")
+                   .only("overall_score", "category_scores", "weak_topics", "recorded_at"))
+        for record in records.iterator(chunk_size=batch_size):
+            add_to_summary(summary, record)
+        summary.save()
+    return summary
+
+
+def progress_overview(user):
+    """
+    Everything the dashboard shows about a user's scores, from one query
+
+    Returns:
+        Dictionary with sessions, average, best, last, change (last minus
+        the average), streak (0 once a day has been missed), longest_streak,
+        trend (list of {"score", "percent"}), categories (list of
+        {"name", "average", "best", "sessions"}, weakest first) and focus
+        (recommended topic names), or None if the user has not finished an
+        interview
+    """
+    summary = ScoreSummary.objects.filter(user=user).first()
+    if summary is None or not summary.sessions:
+        return None
+    average = summary.average_score
+    streak = summary.current_streak
+    if summary.last_active_date < timezone.localdate() - timedelta(days=1):
+        streak = 0
+    categories = [
+        {"name": name, "average": round(totals["total"] / totals["sessions"], 1), "best": totals["best"],
+         "sessions": totals["sessions"]}
+        for name, totals in summary.categories.items()
+    ]
+    categories.sort(key=lambda category: category["average"])
+    return {
+        "sessions": summary.sessions,
+        "average": round(average, 1),
+        "best": summary.best_score,
+        "last": summary.last_score,
+        "change": round(summary.last_score - average, 1),
+        "streak": streak,
+        "longest_streak": summary.longest_streak,
+        # Scores are out of 10
+        "trend": [{"score": score, "percent": max(0, min(100, round(score * 10)))} for score in summary.recent_scores],
+        "categories": categories,
+        "focus": rank_topics(weakness_vector(summary), settings.RECOMMENDED_TOPICS)
+        if settings.RECOMMENDER_ENABLED else [],
+    }
@@ -0,0 +1,282 @@
+"""
+Weak-area recommendations from interview feedback
+
+Questions, expected key points and the evaluator's feedback are mapped onto
+a fixed topic vocabulary by keyword. Each finished interview contributes a
+weakness signal (topics of low-scoring questions and of the suggested
+improvements, weighted by how low the scores were), stored sparsely on its
+ScoreRecord. The user's ScoreSummary keeps the decayed sum of those signals
+as a float32 vector with one entry per topic, so older interviews count for
+less (settings.WEAKNESS_DECAY per interview).
+
+Candidates are scored against a topic index: one row per topic, the topic
+itself plus half weight on related topics, normalized. A single
+matrix-vector product gives the cosine similarity of every topic to the
+user's weakness vector, so a weak SQL answer also lifts Databases. The top
+topics become focus areas for question generation and target skills for
+roadmaps.
+
+numpy is imported by the functions that need it, and the index is built on
+first use, so importing this module (which every page does through
+interview.progress) stays cheap.
+"""
+import re
+from functools import lru_cache
+
+from django.conf import settings
+
+from .models import ScoreSummary
+
+# (name, kind, keywords); keywords are lowercase words or two-word phrases.
+# Add new topics at the end: stored vectors are indexed by position.
+TOPICS = [
+    ("Data Structures", "technical", ("data structure", "data structures", "array", "arrays", "linked list",
+                                      "hash", "hashmap", "tree", "trees", "graph", "graphs", "heap", "stack",
+                                      "queue")),
+    ("Algorithms", "technical", ("algorithm", "algorithms", "complexity", "big o", "sorting", "binary search",
+                                 "recursion", "dynamic programming")),
+    ("SQL", "technical", ("sql", "query", "queries", "join", "joins", "postgresql", "mysql")),
+    ("Databases", "technical", ("database", "databases", "schema", "transaction", "transactions", "normalization",
+                                "nosql", "mongodb", "replication", "sharding", "indexing")),
+    ("APIs", "technical", ("api", "apis", "rest", "restful", "graphql", "endpoint", "endpoints", "http", "grpc")),
+    ("System Design", "technical", ("system design", "architecture", "scalability", "scalable", "distributed",
+                                    "microservices", "load balancer", "load balancing", "throughput")),
+    ("Caching", "technical", ("cache", "caching", "redis", "cdn", "memcached")),
+    ("Concurrency", "technical", ("concurrency", "concurrent", "thread", "threads", "async", "asynchronous",
+                                  "lock", "locks", "race condition", "parallel")),
+    ("Performance", "technical", ("performance", "latency", "optimization", "optimize", "profiling", "memory",
+                                  "bottleneck", "bottlenecks")),
+    ("Testing", "technical", ("test", "tests", "testing", "unit test", "unit tests", "tdd", "coverage")),
+    ("Debugging", "technical", ("debug", "debugging", "troubleshoot", "troubleshooting", "root cause",
+                                "logging", "logs")),
+    ("Security", "technical", ("security", "authentication", "authorization", "encryption", "oauth",
+                               "vulnerability", "vulnerabilities", "xss", "injection", "csrf")),
+    ("Cloud", "technical", ("cloud", "aws", "azure", "gcp", "serverless")),
+    ("DevOps", "technical", ("devops", "ci", "pipeline", "pipelines", "deployment", "deployments", "docker",
+                             "kubernetes", "terraform", "monitoring", "observability")),
+    ("Object-Oriented Design", "technical", ("object oriented", "oop", "inheritance", "polymorphism",
+                                             "design pattern", "design patterns", "solid", "encapsulation")),
+    ("Python", "technical", ("python", "django", "flask", "pandas", "numpy")),
+    ("JavaScript", "technical", ("javascript", "typescript", "nodejs", "npm")),
+    ("Frontend", "technical", ("frontend", "react", "css", "html", "dom", "browser", "accessibility",
+                               "responsive")),
+    ("Machine Learning", "technical", ("machine learning", "neural", "deep learning", "training",
+                                       "feature engineering", "overfitting", "ml")),
+    ("Statistics", "technical", ("statistics", "statistical", "probability", "hypothesis", "regression",
+                                 "a/b", "significance")),
+    ("Data Analysis", "technical", ("data analysis", "analytics", "visualization", "excel", "etl",
+                                    "data pipeline")),
+    ("Version Control", "technical", ("git", "version control", "branching", "code review", "pull request")),
+    ("Problem Solving", "both", ("problem solving", "trade off", "trade offs", "tradeoff", "tradeoffs",
+                                 "edge case", "edge cases", "reasoning", "assumptions")),
+    ("Communication", "behavioral", ("communication", "communicate", "clarity", "concise", "explain",
+                                     "explanation", "presentation", "stakeholder", "stakeholders")),
+    ("Structured Answers", "behavioral", ("star", "structure", "structured", "situation", "specific examples",
+                                          "concrete", "example", "examples")),
+    ("Quantifying Impact", "behavioral", ("impact", "measurable", "metrics", "quantify", "quantifiable",
+                                          "outcome", "outcomes", "results")),
+    ("Teamwork", "behavioral", ("team", "teamwork", "collaboration", "collaborate", "cross functional")),
+    ("Leadership", "behavioral", ("leadership", "mentor", "mentoring", "ownership", "initiative",
+                                  "influence")),
+    ("Conflict Resolution", "behavioral", ("conflict", "conflicts", "disagreement", "disagreements",
+                                           "difficult conversation", "negotiation")),
+    ("Product Sense", "both", ("product", "customer", "customers", "prioritization", "prioritize",
+                               "requirements", "user experience")),
+    ("Career Goals", "behavioral", ("career", "goals", "motivation", "aspirations", "growth mindset")),
+]
+
+RELATED = [
+    ("Data Structures", "Algorithms"), ("SQL", "Databases"), ("Databases", "System Design"),
+    ("Caching", "System Design"), ("Caching", "Performance"), ("APIs", "System Design"), ("APIs", "Security"),
+    ("Concurrency", "Performance"), ("Testing", "Debugging"), ("Cloud", "DevOps"), ("DevOps", "System Design"),
+    ("JavaScript", "Frontend"), ("Machine Learning", "Statistics"), ("Statistics", "Data Analysis"),
+    ("Data Analysis", "SQL"), ("Python", "Testing"), ("Object-Oriented Design", "System Design"),
+    ("Problem Solving", "Algorithms"), ("Communication", "Structured Answers"),
+    ("Structured Answers", "Quantifying Impact"), ("Teamwork", "Conflict Resolution"), ("Teamwork", "Leadership"),
+    ("Leadership", "Communication"), ("Product Sense", "Communication"),
+]
+
+TOPIC_NAMES = [name for name, kind, keywords in TOPICS]
+_POSITIONS = {name: i for i, name in enumerate(TOPIC_NAMES)}
+_KEYWORDS = {keyword: _POSITIONS[name] for name, kind, keywords in TOPICS for keyword in keywords}
+_WORD = re.compile(r"[a-z][a-z0-9+#/]*")
+
+
+@lru_cache(maxsize=None)
+def _index():
+    """The normalized topic index, and which topics suit which interview types"""
+    import numpy as np
+
+    index = np.eye(len(TOPICS), dtype=np.float32)
+    for a, b in RELATED:
+        index[_POSITIONS[a], _POSITIONS[b]] = index[_POSITIONS[b], _POSITIONS[a]] = 0.5
+    allowed = {
+        "technical": np.array([kind != "behavioral" for name, kind, keywords in TOPICS]),
+        "system-design": np.array([kind != "behavioral" for name, kind, keywords in TOPICS]),
+        "behavioral": np.array([kind != "technical" for name, kind, keywords in TOPICS]),
+    }
+    return index / np.linalg.norm(index, axis=1, keepdims=True), allowed
+
+
+def text_vector(texts):
+    """
+    Topic counts of some text, normalized to sum to 1
+
+    Args:
+        texts: Iterable of strings (non-strings are skipped)
+
+    Returns:
+        float32 array with one entry per topic (all zeros if nothing matched)
+    """
+    import numpy as np
+
+    hits = []
+    for text in texts:
+        if not isinstance(text, str):
+            continue
+        words = _WORD.findall(text.lower().replace("-", " "))
+        for i, word in enumerate(words):
+            position = _KEYWORDS.get(word)
+            if position is not None:
+                hits.append(position)
+            if i:
+                position = _KEYWORDS.get(f"{words[i - 1]} {word}")
+                if position is not None:
+                    hits.append(position)
+    vector = np.bincount(hits, minlength=len(TOPICS)).astype(np.float32)
+    total = vector.sum()
+    return vector / total if total else vector
+
+
+def _strings(value):
+    if isinstance(value, str):
+        return [value]
+    if isinstance(value, list):
+        return [item for item in value if isinstance(item, str)]
+    return []
+
+
+def _weakness(score):
+    try:
+        return min(1.0, max(0.0, 1 - float(score) / 10))
+    except (TypeError, ValueError):
+        return 0.5
+
+
+def evaluation_weakness(interview, evaluation):
+    """
+    The weak topics one evaluated interview points at
+
+    Each answered question adds its topics (question, key points and the
+    feedback's improvements and tips) weighted by 1 - score/10; the overall
+    improvements add theirs weighted by 1 - overall score/10.
+
+    Args:
+        interview: The evaluated InterviewSession (answers already stored)
+        evaluation: Its evaluation dictionary
+
+    Returns:
+        {topic name: weight} for the topics with any weight
+    """
+    if not isinstance(evaluation, dict):
+        return {}
+    import numpy as np
+
+    feedback = evaluation.get("question_feedback") or []
+    signal = np.zeros(len(TOPICS), dtype=np.float32)
+    answers = interview.answers or []
+    for i, answer in enumerate(answers):
+        index = answer.get("question_index") if isinstance(answer, dict) else None
+        if not isinstance(index, int) or not 0 <= index < len(interview.questions):
+            continue
+        question = interview.questions[index] if isinstance(interview.questions[index], dict) else {}
+        entry = feedback[i] if i < len(feedback) and isinstance(feedback[i], dict) else {}
+        texts = (_strings(question.get("question")) + _strings(question.get("key_points"))
+                 + _strings(entry.get("improvements")) + _strings(entry.get("tips")))
+        signal += _weakness(entry.get("score")) * text_vector(texts) / len(answers)
+    overall = evaluation.get("overall_feedback")
+    if isinstance(overall, dict):
+        signal += _weakness(evaluation.get("overall_score")) * text_vector(_strings(overall.get("improvements")))
+    return {TOPIC_NAMES[i]: round(float(signal[i]), 4) for i in np.flatnonzero(signal >= 0.0001)}
+
+
+def weakness_vector(summary):
+    """A ScoreSummary's stored weakness as a float32 array (zeros if none yet)"""
+    import numpy as np
+
+    vector = np.zeros(len(TOPICS), dtype=np.float32)
+    stored = np.frombuffer(summary.weakness or b"", dtype=np.float32)
+    # Topics added since the vector was stored start at zero
+    size = min(len(stored), len(vector))
+    vector[:size] = stored[:size]
+    return vector
+
+
+def add_weakness(summary, weak_topics):
+    """Decay a summary's weakness vector by one interview and add a new signal (in memory)"""
+    vector = weakness_vector(summary) * settings.WEAKNESS_DECAY
+    for name, weight in weak_topics.items():
+        position = _POSITIONS.get(name)
+        if position is not None:
+            vector[position] += weight
+    summary.weakness = vector.tobytes()
+
+
+def rank_topics(weakness, limit=3, interview_type=None):
+    """
+    The topics closest to a weakness vector
+
+    Args:
+        weakness: float32 array from weakness_vector()
+        limit: Number of topics to return
+        interview_type: Only consider topics that suit this interview type
+
+    Returns:
+        Topic names, most similar first (fewer than limit, or none, when the
+        vector has little or no weight)
+    """
+    import numpy as np
+
+    norm = np.linalg.norm(weakness)
+    if not norm:
+        return []
+    index, allowed_by_type = _index()
+    scores = index @ (weakness / norm)
+    allowed = allowed_by_type.get(interview_type)
+    if allowed is not None:
+        scores = np.where(allowed, scores, 0)
+    limit = min(limit, len(scores))
+    top = np.argpartition(-scores, limit - 1)[:limit]
+    top = top[np.argsort(-scores[top])]
+    return [TOPIC_NAMES[i] for i in top if scores[i] > 0]
+
+
+def user_weakness(user):
+    """
+    A user's weakness vector, from one query
+
+    Returns:
+        float32 array, all zeros for users without evaluated interviews or
+        when the recommender is off
+    """
+    import numpy as np
+
+    summary = None
+    if settings.RECOMMENDER_ENABLED and user.is_authenticated:
+        summary = ScoreSummary.objects.filter(user=user).only("weakness").first()
+    return weakness_vector(summary) if summary is not None else np.zeros(len(TOPICS), dtype=np.float32)
+
+
+def recommend_topics(user, limit=None, interview_type=None):
+    """
+    Focus areas for a user's next interview or roadmap
+
+    Args:
+        user: The user
+        limit: Number of topics (default settings.RECOMMENDED_TOPICS)
+        interview_type: Only recommend topics that suit this interview type
+
+    Returns:
+        Topic names, weakest first; empty for users without evaluated interviews
+    """
+    return rank_topics(user_weakness(user), limit or settings.RECOMMENDED_TOPICS, interview_type)
@@ -0,0 +1,69 @@
+"""
+Interview workflow shared by the HTML views and the JSON API
+"""
+from django.utils import timezone
+
+from core.ai_utils import generate_interview_questions, evaluate_interview_answers
+from core.prewarm import consume_questions
+from .models import InterviewSession
+from .progress import record_evaluation
+from .recommender import recommend_topics
+
+# Upper bound on a single answer, to keep stored payloads reasonable
+MAX_ANSWER_LENGTH = 10000
+
+
+def start_interview(user, role, interview_type, experience_level, num_questions=5):
+    """
+    Generate questions for a new interview and store it
+
+    Args:
+        user: The interviewee
+        role: Job title/role
+        interview_type: technical, behavioral, system-design or mixed
+        experience_level: entry, mid or senior
+        num_questions: Number of questions to generate
+
+    Returns:
+        The new InterviewSession
+    """
+    # Use a prewarmed question set if one is waiting (generated with the focus
+    # areas of that time), otherwise generate now around the user's weak areas
+    questions = consume_questions(user, role, interview_type, experience_level)
+    if questions is None:
+        questions = generate_interview_questions(
+            role=role,
+            interview_type=interview_type,
+            experience_level=experience_level,
+            num_questions=num_questions,
+            focus_areas=recommend_topics(user, interview_type=interview_type)
+        )
+
+    return InterviewSession.objects.create(
+        user=user,
+        role=role,
+        interview_type=interview_type,
+        experience_level=experience_level,
+        questions=questions,
+    )
+
+
+def finish_interview(interview, answers):
+    """
+    Evaluate the answers to an interview and store the result
+
+    Args:
+        interview: The InterviewSession being answered
+        answers: List of {"question_index": int, "answer": str}
+
+    Returns:
+        The evaluation dictionary
+    """
+    evaluation = evaluate_interview_answers(interview.questions, answers, interview.role, interview.interview_type)
+
+    interview.answers = answers
+    interview.evaluation = evaluation
+    interview.completed_at = timezone.now()
+    interview.save(update_fields=["answers", "evaluation", "completed_at", "updated_at"])
+    record_evaluation(interview, evaluation)
+    return evaluation
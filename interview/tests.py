@@ -1,3 +1,250 @@
-from django.test import TestCase
+import json
+from datetime import timedelta
+from io import StringIO
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.contrib.messages import get_messages
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from .models import InterviewSession, ScoreRecord, ScoreSummary
+from .progress import progress_overview, rebuild_summary, record_evaluation, score_evaluation
+from .recommender import TOPIC_NAMES, rank_topics, weakness_vector
+
+QUESTIONS = [
+    {"question": "How would you index a slow SQL query with joins?", "key_points": ["query plan"],
+     "category": "technical"},
+    {"question": "Tell me about a conflict in your team", "key_points": ["STAR"], "category": "behavioral"},
+]
+# Render pages without collectstatic's manifest
+STORAGES = {**settings.STORAGES, "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"}}
+SUMMARY_FIELDS = ["sessions", "best_score", "last_score", "last_recorded_at", "current_streak", "longest_streak",
+                  "last_active_date", "recent_scores", "categories"]
+
+
+def _evaluation(overall, first, second):
+    return {
+        "overall_score": overall,
+        "overall_feedback": {"improvements": ["Explain trade-offs in caching"]},
+        "question_feedback": [
+            {"score": first, "improvements": ["Discuss transaction isolation"], "tips": []},
+            {"score": second, "improvements": [], "tips": ["Quantify the outcome"]},
+        ],
+    }
+
+
+def _interview(user, evaluation, completed_at):
+    return InterviewSession.objects.create(
+        user=user, role="Backend Engineer", interview_type="mixed", experience_level="mid",
+        questions=QUESTIONS, answers=[{"question_index": 0, "answer": "a"}, {"question_index": 1, "answer": "b"}],
+        evaluation=evaluation, completed_at=completed_at,
+    )
+
+
+@override_settings(SESSION_GC_INTERVAL=0)
+class SubmitAnswersTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user("candidate")
+        self.client.force_login(self.user)
+        self.client.post(reverse("interview:simulate"), {"role": "Backend Engineer", "interview_mode": "single"})
+        questions = self.client.get(reverse("interview:single_page"), {"format": "json"}).json()["questions"]
+        self.answers = [f"Answer {i}" for i in range(len(questions))]
+
+    def _submit(self, answers):
+        return self.client.post(reverse("interview:submit_answers"), json.dumps({"answers": answers}),
+                                content_type="application/json")
+
+    def test_every_answer_is_stored_in_one_request(self):
+        response = self._submit(self.answers)
+        self.assertEqual(response.json(), {"redirect": reverse("interview:complete")})
+        self.assertEqual(self.client.session["user_answers"][1], {"question_index": 1, "answer": "Answer 1"})
+        self.assertEqual(self.client.session["current_question"], len(self.answers))
+
+    def test_invalid_answers_are_rejected_and_nothing_is_stored(self):
+        for answers in (self.answers[1:], [1] * len(self.answers), ["x" * 10001] * len(self.answers)):
+            response = self._submit(answers)
+            self.assertEqual(response.status_code, 400)
+            self.assertIn("error", response.json())
+        self.assertEqual(self.client.session["user_answers"], [])
+
+    def test_form_posts_without_javascript_are_accepted(self):
+        response = self.client.post(reverse("interview:submit_answers"), {"answers": self.answers})
+        self.assertRedirects(response, reverse("interview:complete"), fetch_redirect_response=False)
+        self.assertEqual(len(self.client.session["user_answers"]), len(self.answers))
+
+        self.client.post(reverse("interview:simulate"), {"role": "Backend Engineer", "interview_mode": "single"})
+        response = self.client.post(reverse("interview:submit_answers"), {"answers": self.answers[:1]})
+        self.assertRedirects(response, reverse("interview:single_page"), fetch_redirect_response=False)
+        self.assertEqual([str(m) for m in get_messages(response.wsgi_request)],
+                         [f"Expected {len(self.answers)} answers."])
+
+
+class ScoreEvaluationTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("candidate")
+
+    def test_scores_are_averaged_per_category(self):
+        interview = _interview(self.user, None, None)
+        self.assertEqual(score_evaluation(interview, _evaluation(7, 4, 9)), (7, {"technical": 4, "behavioral": 9}))
+
+    def test_overall_falls_back_to_the_question_average(self):
+        interview = _interview(self.user, None, None)
+        evaluation = _evaluation(None, 4, 7)
+        self.assertEqual(score_evaluation(interview, evaluation)[0], 5.5)
+
+    def test_unusable_evaluations_score_nothing(self):
+        interview = _interview(self.user, None, None)
+        self.assertIsNone(score_evaluation(interview, "not a dict"))
+        self.assertIsNone(score_evaluation(interview, {"question_feedback": [{"score": "n/a"}]}))
+
+
+@override_settings(RECOMMENDER_ENABLED=True, SCORE_TREND_LENGTH=3)
+class ProgressSummaryTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("candidate")
+        now = timezone.now()
+        # Two consecutive days, a gap, then three more consecutive days (one with two interviews)
+        days = [9, 8, 5, 4, 4, 3]
+        scores = [(6, 5, 8), (4, 3, 6), (8, 7, 9), (5, 2, 9), (7, 6, 8), (9, 9, 9)]
+        self.interviews = [_interview(self.user, _evaluation(*score), now - timedelta(days=day))
+                           for day, score in zip(days, scores)]
+
+    def _record_all(self):
+        for interview in self.interviews:
+            record_evaluation(interview, interview.evaluation)
+        return ScoreSummary.objects.get(user=self.user)
+
+    def test_incremental_summary_matches_a_rebuild(self):
+        incremental = self._record_all()
+        self.assertEqual(incremental.sessions, 6)
+        self.assertEqual(incremental.best_score, 9)
+        self.assertEqual(incremental.last_score, 9)
+        self.assertEqual(incremental.recent_scores, [5, 7, 9])
+        self.assertEqual((incremental.current_streak, incremental.longest_streak), (3, 3))
+        self.assertEqual(incremental.categories["behavioral"]["sessions"], 6)
+
+        rebuilt = rebuild_summary(self.user.pk)
+        for field in SUMMARY_FIELDS:
+            self.assertEqual(getattr(rebuilt, field), getattr(incremental, field), field)
+        self.assertAlmostEqual(rebuilt.total_score, incremental.total_score)
+        self.assertEqual(bytes(rebuilt.weakness), bytes(incremental.weakness))
+
+    def test_recording_an_interview_twice_counts_it_once(self):
+        self.assertIsNotNone(record_evaluation(self.interviews[0], self.interviews[0].evaluation))
+        self.assertIsNone(record_evaluation(self.interviews[0], self.interviews[0].evaluation))
+        self.assertEqual(ScoreRecord.objects.count(), 1)
+        self.assertEqual(ScoreSummary.objects.get(user=self.user).sessions, 1)
+
+    def test_rebuild_progress_backfills_the_same_summary(self):
+        incremental = self._record_all()
+        ScoreRecord.objects.all().delete()
+        ScoreSummary.objects.all().delete()
+
+        call_command("rebuild_progress", stdout=StringIO())
+        backfilled = ScoreSummary.objects.get(user=self.user)
+        for field in SUMMARY_FIELDS:
+            self.assertEqual(getattr(backfilled, field), getattr(incremental, field), field)
+        self.assertEqual(bytes(backfilled.weakness), bytes(incremental.weakness))
+
+        # Running it again changes nothing
+        call_command("rebuild_progress", stdout=StringIO())
+        self.assertEqual(ScoreRecord.objects.count(), 6)
+        self.assertEqual(ScoreSummary.objects.get(user=self.user).sessions, 6)
+
+    def test_overview_reads_the_summary(self):
+        self.assertIsNone(progress_overview(self.user))
+        self._record_all()
+        overview = progress_overview(self.user)
+        self.assertEqual(overview["sessions"], 6)
+        self.assertEqual(overview["best"], 9)
+        # The last interview was three days ago, so the streak is broken
+        self.assertEqual(overview["streak"], 0)
+        self.assertEqual([category["name"] for category in overview["categories"]], ["technical", "behavioral"])
+        self.assertIn("SQL", overview["focus"])
+
+
+class RecommenderTests(TestCase):
+    def _weakness(self, **weights):
+        vector = weakness_vector(ScoreSummary())
+        for name, weight in weights.items():
+            vector[TOPIC_NAMES.index(name.replace("_", " "))] = weight
+        return vector
+
+    def test_related_topics_rank_after_the_weak_one(self):
+        self.assertEqual(rank_topics(self._weakness(SQL=1.0), limit=2), ["SQL", "Databases"])
+
+    def test_interview_type_filters_topics(self):
+        weakness = self._weakness(SQL=1.0, Teamwork=0.5)
+        self.assertNotIn("Teamwork", rank_topics(weakness, limit=5, interview_type="technical"))
+        self.assertEqual(rank_topics(weakness, limit=1, interview_type="behavioral"), ["Teamwork"])
+
+    def test_no_weakness_recommends_nothing(self):
+        self.assertEqual(rank_topics(self._weakness()), [])
+
+    def test_stored_vectors_from_fewer_topics_are_padded(self):
+        summary = ScoreSummary(weakness=self._weakness(Data_Structures=0.5)[:3].tobytes())
+        vector = weakness_vector(summary)
+        self.assertEqual(len(vector), len(TOPIC_NAMES))
+        self.assertEqual(vector[0], 0.5)
+
+
+@override_settings(AI_PROVIDER_ORDER=["stub"], PREWARM_ENABLED=False, SESSION_GC_INTERVAL=0, STORAGES=STORAGES,
+                   RATELIMIT_ENABLED=True, AI_RATE_LIMITS={"evaluation": {"user": (1, 300), "ip": (30, 300)}})
+class CompleteViewTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user("candidate")
+        self.client.force_login(self.user)
+
+    def _start(self, answered=2, mode=None):
+        interview = _interview(self.user, None, None)
+        session = self.client.session
+        session["interview_id"] = interview.pk
+        session["user_answers"] = interview.answers[:answered]
+        if mode:
+            session["interview_mode"] = mode
+        session.save()
+        return interview
+
+    def test_reloading_results_does_not_take_rate_limit_tokens(self):
+        interview = self._start()
+        for _ in range(3):
+            self.assertEqual(self.client.get(reverse("interview:complete")).status_code, 200)
+        interview.refresh_from_db()
+        self.assertIsNotNone(interview.evaluation)
+        self.assertEqual(ScoreRecord.objects.filter(interview=interview).count(), 1)
+
+        # The one token went on the first evaluation, so a new one is limited
+        self._start()
+        self.assertEqual(self.client.get(reverse("interview:complete")).status_code, 429)
+
+    def test_unanswered_questions_are_not_evaluated(self):
+        interview = self._start(answered=1)
+        self.assertRedirects(self.client.get(reverse("interview:complete")), reverse("interview:question"),
+                             fetch_redirect_response=False)
+        self._start(answered=0, mode="single")
+        self.assertRedirects(self.client.get(reverse("interview:complete")), reverse("interview:single_page"),
+                             fetch_redirect_response=False)
+
+        interview.refresh_from_db()
+        self.assertIsNone(interview.evaluation)
+        self.assertFalse(ScoreRecord.objects.exists())
+
+    def test_evaluated_interviews_take_no_more_answers(self):
+        interview = self._start()
+        self.client.get(reverse("interview:complete"))
+        for view in ("interview:question", "interview:single_page"):
+            self.assertRedirects(self.client.get(reverse(view)), reverse("interview:complete"),
+                                 fetch_redirect_response=False)
+        response = self.client.post(reverse("interview:submit_answers"), json.dumps({"answers": ["new", "new"]}),
+                                    content_type="application/json")
+        self.assertEqual(response.status_code, 409)
+
+        interview.refresh_from_db()
+        self.assertEqual(interview.answers[1]["answer"], "b")
+        self.assertEqual(self.client.session["user_answers"][1]["answer"], "b")
@@ -7,5 +7,9 @@ urlpatterns = [
     path("", views.home, name="home"),
     path("simulate/", views.simulate, name="simulate"),
     path("question/", views.question, name="question"),
+    path("all/", views.single_page, name="single_page"),
+    path("submit/", views.submit_answers, name="submit_answers"),
     path("complete/", views.complete, name="complete"),
+    path("<int:pk>/export/<slug:fmt>/", views.export_report, name="export_report"),
+    path("<int:pk>/report/<slug:digest>.<slug:fmt>", views.download_report, name="download_report"),
 ]
@@ -1,44 +1,70 @@
-from django.shortcuts import render, redirect
+import json
+
+from django.shortcuts import render, redirect, get_object_or_404
+from django.urls import reverse
+from django.http import Http404, JsonResponse
+from django.contrib import messages
 from django.contrib.auth.decorators import login_required
-from core.ai_utils import generate_interview_questions, evaluate_interview_answers
+from django.views.decorators.http import require_POST
+from core.ratelimit import ai_rate_limit, charging, check_rate_limits
+from core.reports import FORMATS, report_response, request_report
+from .models import InterviewSession
+from .services import MAX_ANSWER_LENGTH, start_interview, finish_interview
+
+# Interview progress kept in the session; the questions stay on the InterviewSession row
+INTERVIEW_SESSION_KEYS = ['interview_id', 'current_question', 'user_answers', 'interview_mode']
+# Earlier versions also copied the whole interview into the session
+LEGACY_SESSION_KEYS = ['interview_questions', 'interview_role', 'interview_type', 'interview_level']
+
+def _current_interview(request):
+    """The interview in progress in this session, or None"""
+    for key in LEGACY_SESSION_KEYS:
+        # Shrinks sessions written by earlier versions the next time they are saved
+        request.session.pop(key, None)
+    interview_id = request.session.get('interview_id')
+    if interview_id is None:
+        return None
+    return InterviewSession.objects.filter(pk=interview_id, user=request.user).first()
 
 def home(request):
     return render(request, "interview/home.html")
 
 @login_required
+@ai_rate_limit("interview", methods=("POST",))
 def simulate(request):
     if request.method == "POST":
-        role = request.POST.get("role")
+        role = request.POST.get("role", "")
         interview_type = request.POST.get("interview_type", "mixed")
         experience_level = request.POST.get("experience_level", "mid")
         
         # Generate AI-powered interview questions
-        questions = generate_interview_questions(
-            role=role,
-            interview_type=interview_type,
-            experience_level=experience_level,
-            num_questions=5
-        )
+        interview = start_interview(request.user, role, interview_type, experience_level)
         
-        # Store questions in session
-        request.session['interview_questions'] = questions
-        request.session['interview_role'] = role
-        request.session['interview_type'] = interview_type
-        request.session['interview_level'] = experience_level
+        # Track progress in session
         request.session['current_question'] = 0
         request.session['user_answers'] = []
+        request.session['interview_id'] = interview.pk
         
+        # Single-page mode is requested by main.js; the multi-page flow is the fallback
+        if request.POST.get("interview_mode") == "single":
+            request.session['interview_mode'] = 'single'
+            return redirect('interview:single_page')
+        request.session.pop('interview_mode', None)
         return redirect('interview:question')
     
     # Clear any existing interview session
-    for key in ['interview_questions', 'interview_role', 'interview_type', 'interview_level', 'current_question', 'user_answers']:
+    for key in INTERVIEW_SESSION_KEYS + LEGACY_SESSION_KEYS:
         request.session.pop(key, None)
     
     return render(request, "interview/simulate.html", {"asked": False})
 
 @login_required
 def question(request):
-    questions = request.session.get('interview_questions')
+    interview = _current_interview(request)
+    if interview is not None and interview.evaluation is not None:
+        # Answers cannot change once evaluated
+        return redirect('interview:complete')
+    questions = interview.questions if interview else None
     current_index = request.session.get('current_question', 0)
     
     if not questions or current_index >= len(questions):
@@ -67,22 +93,117 @@ def question(request):
         'question': questions[current_index],
         'question_number': current_index + 1,
         'total_questions': len(questions),
-        'role': request.session.get('interview_role'),
-        'interview_type': request.session.get('interview_type'),
-        'experience_level': request.session.get('interview_level'),
+        'role': interview.role,
+        'interview_type': interview.interview_type,
+        'experience_level': interview.experience_level,
     }
     
     return render(request, "interview/question.html", context)
 
+@login_required
+def single_page(request):
+    """Render every question at once; navigation and drafts happen client-side"""
+    interview = _current_interview(request)
+    if interview is None or not interview.questions:
+        return redirect('interview:simulate')
+    if interview.evaluation is not None:
+        return redirect('interview:complete')
+    questions = interview.questions
+    
+    if request.GET.get('format') == 'json':
+        return JsonResponse({
+            'interview_id': interview.pk,
+            'questions': questions,
+            'submit_url': reverse('interview:submit_answers'),
+        })
+    
+    context = {
+        'questions': questions,
+        'question_number': 1,
+        'total_questions': len(questions),
+        'interview_id': interview.pk,
+        'role': interview.role,
+        'interview_type': interview.interview_type,
+        'experience_level': interview.experience_level,
+    }
+    
+    return render(request, "interview/single_page.html", context)
+
+@require_POST
+@login_required
+def submit_answers(request):
+    """
+    Store every answer of a single-page interview in one request
+    
+    Accepts either a JSON body {"answers": [...]} sent by main.js or a regular
+    form post with one "answers" field per question.
+    """
+    is_json = request.content_type == 'application/json'
+    interview = _current_interview(request)
+    questions = interview.questions if interview else None
+    
+    if is_json:
+        try:
+            answers = json.loads(request.body).get('answers')
+        except (ValueError, AttributeError):
+            answers = None
+    else:
+        answers = request.POST.getlist('answers')
+    
+    evaluated = interview is not None and interview.evaluation is not None
+    error = None
+    if not questions:
+        error = 'No interview in progress.'
+    elif evaluated:
+        error = 'This interview has already been evaluated.'
+    elif not isinstance(answers, list) or len(answers) != len(questions):
+        error = f'Expected {len(questions)} answers.'
+    elif not all(isinstance(answer, str) for answer in answers):
+        error = 'Answers must be text.'
+    elif any(len(answer) > MAX_ANSWER_LENGTH for answer in answers):
+        error = f'Answers are limited to {MAX_ANSWER_LENGTH} characters.'
+    
+    if error:
+        if is_json:
+            return JsonResponse({'error': error}, status=409 if evaluated else 400)
+        messages.error(request, error)
+        if evaluated:
+            return redirect('interview:complete')
+        return redirect('interview:single_page' if questions else 'interview:simulate')
+    
+    request.session['user_answers'] = [
+        {'question_index': i, 'answer': answer} for i, answer in enumerate(answers)
+    ]
+    request.session['current_question'] = len(questions)
+    
+    if is_json:
+        return JsonResponse({'redirect': reverse('interview:complete')})
+    return redirect('interview:complete')
+
 @login_required
 def complete(request):
-    questions = request.session.get('interview_questions', [])
+    interview = _current_interview(request)
+    if interview is None:
+        return redirect('interview:simulate')
+    questions = interview.questions
     answers = request.session.get('user_answers', [])
-    role = request.session.get('interview_role', 'Professional')
-    interview_type = request.session.get('interview_type', 'mixed')
     
-    # Evaluate the answers using AI
-    evaluation = evaluate_interview_answers(questions, answers, role, interview_type)
+    if interview.evaluation is not None:
+        # Already evaluated; reloading the results page must not call the AI again
+        evaluation = interview.evaluation
+        answers = interview.answers
+    elif len(answers) < len(questions):
+        # Unanswered questions would be evaluated as blanks; go back to them
+        if request.session.get('interview_mode') == 'single':
+            return redirect('interview:single_page')
+        return redirect('interview:question')
+    else:
+        # Only an evaluation that calls the AI takes a rate limit token
+        limited = check_rate_limits(request, "evaluation")
+        if limited is not None:
+            return limited
+        with charging(request.user):
+            evaluation = finish_interview(interview, answers)
     
     # Combine questions with their answers and feedback
     qa_feedback = []
@@ -97,12 +218,32 @@ def complete(request):
             })
     
     context = {
+        'interview_id': interview.pk,
         'total_questions': len(questions),
         'answered_questions': len(answers),
-        'role': role,
+        'role': interview.role,
         'overall_score': evaluation.get('overall_score', 0),
         'overall_feedback': evaluation.get('overall_feedback', {}),
         'qa_feedback': qa_feedback,
     }
     
     return render(request, "interview/complete.html", context)
+
+@login_required
+def export_report(request, pk, fmt):
+    """Find or start rendering an evaluated interview's report; the page polls until it is ready"""
+    if fmt not in FORMATS:
+        raise Http404("Unknown format")
+    interview = get_object_or_404(InterviewSession, pk=pk, user=request.user, evaluation__isnull=False)
+    digest, status = request_report('interview', interview, fmt)
+    if status == 'failed':
+        return JsonResponse({'status': status, 'error': 'The report could not be rendered. Please try again in a minute.'},
+                            status=500)
+    url = reverse('interview:download_report', args=[pk, digest, fmt])
+    return JsonResponse({'status': status, 'url': url}, status=200 if status == 'ready' else 202)
+
+@login_required
+def download_report(request, pk, digest, fmt):
+    """Stream a rendered interview report"""
+    interview = get_object_or_404(InterviewSession, pk=pk, user=request.user, evaluation__isnull=False)
+    return report_response(request, 'interview', interview, digest, fmt, f"interview-report-{pk}")
@@ -1,6 +1,17 @@
 from django.contrib import admin
+from core.bulk import export_action
+from core.pagination import EstimatedCountPaginator
 from .models import Resume
 
 @admin.register(Resume)
 class ResumeAdmin(admin.ModelAdmin):
     list_display = ("id", "owner", "file", "uploaded_at")
+    list_select_related = ("owner",)
+    # An exact (case-sensitive) match can use the unique index on auth_user.username
+    search_fields = ("owner__username__exact",)
+    raw_id_fields = ("owner",)
+    # Newest first by primary key, so the table is never sorted as a whole
+    ordering = ("-id",)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    actions = [export_action("resumes", "csv"), export_action("resumes", "jsonl")]
@@ -0,0 +1,29 @@
+# Generated by Django 5.0 on 2026-10-19 14:47
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resume', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='resume',
+            options={'ordering': ['-uploaded_at']},
+        ),
+        migrations.AlterField(
+            model_name='resume',
+            name='owner',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='resumes', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='resume',
+            index=models.Index(fields=['owner', '-uploaded_at'], name='resume_resu_owner_i_de1426_idx'),
+        ),
+    ]
@@ -4,11 +4,16 @@ from django.contrib.auth import get_user_model
 User = get_user_model()
 
 class Resume(models.Model):
-    owner = models.ForeignKey(User, on_delete=models.CASCADE, related_name="resumes")
+    # Indexed by the (owner, -uploaded_at) index below
+    owner = models.ForeignKey(User, on_delete=models.CASCADE, related_name="resumes", db_index=False)
     file = models.FileField(upload_to="resumes/")
     uploaded_at = models.DateTimeField(auto_now_add=True)
     title = models.CharField(max_length=255, blank=True)
 
+    class Meta:
+        ordering = ["-uploaded_at"]
+        indexes = [models.Index(fields=["owner", "-uploaded_at"])]
+
     def __str__(self):
         return self.title or self.file.name
 
@@ -1,11 +1,15 @@
+from django.conf import settings
+from django.core.paginator import Paginator
 from django.shortcuts import render, redirect
 from django.contrib.auth.decorators import login_required
 from .forms import ResumeUploadForm
 
 @login_required
 def home(request):
-    resumes = request.user.resumes.all()
-    return render(request, "resume/home.html", {"resumes": resumes})
+    # Newest first, a page at a time, off the (owner, -uploaded_at) index
+    paginator = Paginator(request.user.resumes.all(), settings.RESUMES_PER_PAGE)
+    page = paginator.get_page(request.GET.get("page"))
+    return render(request, "resume/home.html", {"resumes": page, "page_obj": page})
 
 @login_required
 def upload_resume(request):
@@ -1,3 +1,7 @@
 from django.contrib import admin
+from .models import Roadmap
 
-# Register your models here.
+@admin.register(Roadmap)
+class RoadmapAdmin(admin.ModelAdmin):
+    list_display = ("id", "user", "job_role", "experience_years", "created_at")
+    list_select_related = ("user",)
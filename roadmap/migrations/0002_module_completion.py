@@ -0,0 +1,18 @@
+# Generated by Django 5.0 on 2026-10-19 14:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('roadmap', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='roadmap',
+            name='completed_modules',
+            field=models.JSONField(blank=True, default=list),
+        ),
+    ]
@@ -1,3 +1,23 @@
 from django.db import models
+from django.contrib.auth import get_user_model
 
-# Create your models here.
+User = get_user_model()
+
+class Roadmap(models.Model):
+    """A generated learning roadmap and the inputs it was generated from"""
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="roadmaps")
+    job_role = models.CharField(max_length=255)
+    experience_years = models.IntegerField(default=0)
+    target_skills = models.JSONField(default=list, blank=True)
+    content = models.JSONField(default=dict)
+    # Keys of the content modules the user has finished; those are never regenerated
+    completed_modules = models.JSONField(default=list, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [models.Index(fields=["user", "-created_at"])]
+
+    def __str__(self):
+        return f"{self.job_role} roadmap - {self.user}"
@@ -0,0 +1,224 @@
+"""
+Roadmap generation shared by the HTML views and the JSON API
+
+Roadmaps are addressable by module: every module in content["modules"] has a
+"key", "skill:<skill>" for a module dedicated to one target skill and
+"core:<n>" for the others. update_roadmap() compares new inputs with the
+user's stored roadmap for the same role and regenerates only the modules they
+affect, each from a small targeted prompt (batched, see core/batching.py):
+
+- an added skill gets a new module, placed after the existing skill modules;
+- a removed skill loses its module;
+- a different experience level (entry/mid/senior) rewrites every module that
+  is not completed, or the whole roadmap in one prompt if none is;
+- other changes of experience years regenerate nothing.
+
+Modules the user has completed are kept as they are in every case.
+"""
+from core.ai_utils import experience_level_for_years, generate_learning_roadmap
+from core.batching import generate_batch
+from core.prewarm import consume_roadmap
+from interview.recommender import recommend_topics
+from .models import Roadmap
+
+
+def clean_skills(target_skills):
+    """Strip skills and drop empty and (case-insensitively) repeated ones, keeping their order"""
+    skills, seen = [], set()
+    for skill in target_skills or []:
+        skill = " ".join(str(skill).split())
+        if skill and skill.lower() not in seen:
+            seen.add(skill.lower())
+            skills.append(skill)
+    return skills
+
+
+def skill_key(skill):
+    """Key of the module dedicated to a skill"""
+    return f"skill:{' '.join(skill.lower().split())}"
+
+
+def _modules(content):
+    modules = content.get("modules") if isinstance(content, dict) else None
+    return modules if isinstance(modules, list) and all(isinstance(m, dict) for m in modules) else None
+
+
+def assign_module_keys(content, target_skills):
+    """
+    Give every module of a roadmap's content a stable key, in place
+
+    Modules the generator tagged with one of target_skills get that skill's
+    key; the others are numbered "core:<n>". Modules that already have a
+    key keep it.
+
+    Args:
+        content: Roadmap content ({"modules": [...]})
+        target_skills: The skills the roadmap was generated for
+
+    Returns:
+        The same content
+    """
+    modules = _modules(content) or []
+    wanted = {skill_key(skill): skill for skill in target_skills}
+    used = {module["key"] for module in modules if module.get("key")}
+    number = 0
+    for module in modules:
+        if module.get("key"):
+            continue
+        tag = module.pop("skill", None)
+        key = skill_key(tag) if isinstance(tag, str) and tag.strip() else None
+        if key in wanted and key not in used:
+            module["skill"] = wanted[key]
+        else:
+            while f"core:{number}" in used:
+                number += 1
+            key = f"core:{number}"
+        module["key"] = key
+        used.add(key)
+    return content
+
+
+def _module_request(job_role, experience_years, skill=None, module=None):
+    request = {"job_role": job_role, "experience_years": experience_years, "skill": skill}
+    if module is not None:
+        # The prompt only needs what the module covers
+        request["module"] = {field: module.get(field) for field in ("title", "topics") if module.get(field)}
+    return request
+
+
+def _add_skill_modules(modules, job_role, experience_years, skills, stats=None):
+    """Generate one module per skill and insert them after the last skill module"""
+    requests = [_module_request(job_role, experience_years, skill=skill) for skill in skills]
+    generated = generate_batch("roadmap_module", requests, stats=stats)
+    position = max((i + 1 for i, module in enumerate(modules) if module["key"].startswith("skill:")),
+                   default=len(modules))
+    for skill, module in zip(skills, generated):
+        modules.insert(position, dict(module, key=skill_key(skill), skill=skill))
+        position += 1
+
+
+def create_roadmap(user, job_role, experience_years, target_skills=None, stats=None):
+    """
+    Generate a learning roadmap and store it
+
+    Args:
+        user: The learner
+        job_role: Target job role
+        experience_years: Years of experience
+        target_skills: Optional list of skills to focus on; without them
+            the roadmap focuses on the user's weakest interview topics
+        stats: Optional dictionary that receives completion and token counts
+
+    Returns:
+        The new Roadmap
+    """
+    target_skills = clean_skills(target_skills)
+    # Prewarmed roadmaps are generated with the recommended topics, not chosen skills
+    content = None if target_skills else consume_roadmap(user, job_role, experience_years)
+    if not target_skills:
+        target_skills = recommend_topics(user)
+    return Roadmap.objects.create(
+        user=user,
+        job_role=job_role,
+        experience_years=experience_years,
+        target_skills=target_skills,
+        content=generate_roadmap_content(job_role, experience_years, target_skills, content, stats),
+    )
+
+
+def generate_roadmap_content(job_role, experience_years, target_skills, content=None, stats=None):
+    """Generate (unless given) a whole roadmap's content, with keyed modules and one per target skill"""
+    if content is None:
+        attempts = []
+        content = generate_learning_roadmap(
+            job_role=job_role,
+            experience_years=experience_years,
+            target_skills=target_skills if target_skills else None,
+            attempts=attempts
+        )
+        if stats is not None:
+            stats["completions"] = stats.get("completions", 0) + len(attempts)
+            stats["tokens"] = stats.get("tokens", 0) + sum(a["prompt_tokens"] + a["completion_tokens"]
+                                                           for a in attempts)
+
+    modules = _modules(assign_module_keys(content, target_skills))
+    if modules is not None:
+        # Skills the generator did not give a module of their own get one now
+        keys = {module["key"] for module in modules}
+        missing = [skill for skill in target_skills if skill_key(skill) not in keys]
+        if missing:
+            _add_skill_modules(modules, job_role, experience_years, missing, stats)
+    return content
+
+
+def update_roadmap(user, job_role, experience_years, target_skills=None, stats=None):
+    """
+    Bring the user's roadmap for a role in line with new inputs
+
+    Only the modules the change affects are regenerated (see the module
+    docstring); without a stored roadmap for the role a new one is generated.
+
+    Args:
+        user: The learner
+        job_role: Target job role
+        experience_years: Years of experience
+        target_skills: Optional list of skills to focus on; without them
+            the user's weakest interview topics are used
+        stats: Optional dictionary that receives completion and token counts
+
+    Returns:
+        Tuple of (Roadmap, created)
+    """
+    roadmap = (Roadmap.objects.filter(user=user, job_role__iexact=job_role.strip())
+               .order_by("-updated_at").first())
+    if roadmap is None or _modules(roadmap.content) is None:
+        return create_roadmap(user, job_role, experience_years, target_skills, stats), True
+
+    target_skills = clean_skills(target_skills) or recommend_topics(user)
+    # Roadmaps stored before modules had keys get them now
+    content = assign_module_keys(roadmap.content, roadmap.target_skills)
+    completed = set(roadmap.completed_modules)
+    wanted = {skill_key(skill) for skill in target_skills}
+
+    modules = [
+        module for module in content["modules"]
+        if not module["key"].startswith("skill:") or module["key"] in wanted or module["key"] in completed
+    ]
+
+    level_changed = experience_level_for_years(experience_years) != experience_level_for_years(roadmap.experience_years)
+    if level_changed and not completed.intersection(module["key"] for module in modules):
+        # Rewriting every module one by one costs more than one whole-roadmap prompt
+        content = generate_roadmap_content(job_role, experience_years, target_skills, stats=stats)
+        modules = _modules(content) or []
+    elif level_changed:
+        stale = [i for i, module in enumerate(modules) if module["key"] not in completed]
+        requests = [_module_request(job_role, experience_years, module=modules[i]) for i in stale]
+        for i, module in zip(stale, generate_batch("roadmap_module", requests, stats=stats)):
+            # Fields the new version lacks (all of them offline) stay as they were
+            modules[i] = {**modules[i], **module, "key": modules[i]["key"]}
+
+    keys = {module["key"] for module in modules}
+    added = [skill for skill in target_skills if skill_key(skill) not in keys]
+    if added:
+        _add_skill_modules(modules, job_role, experience_years, added, stats)
+
+    roadmap.job_role = job_role
+    roadmap.experience_years = experience_years
+    roadmap.target_skills = target_skills
+    roadmap.content = dict(content, modules=modules) if _modules(content) is not None else content
+    roadmap.save(update_fields=["job_role", "experience_years", "target_skills", "content", "updated_at"])
+    return roadmap, False
+
+
+def set_module_completed(roadmap, key, completed=True):
+    """
+    Mark one module of a roadmap as completed or not
+
+    Returns:
+        False if the roadmap has no module with that key
+    """
+    if key not in {module.get("key") for module in _modules(roadmap.content) or []}:
+        return False
+    roadmap.completed_modules = [k for k in roadmap.completed_modules if k != key] + ([key] if completed else [])
+    roadmap.save(update_fields=["completed_modules", "updated_at"])
+    return True
@@ -1,3 +1,144 @@
-from django.test import TestCase
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.urls import reverse
 
-# Create your tests here.
+from .models import Roadmap
+from .services import assign_module_keys, create_roadmap, set_module_completed, update_roadmap
+
+JOB_ROLE = "Backend Engineer"
+
+
+def _stats():
+    return {"completions": 0, "tokens": 0, "single_calls": 0}
+
+
+def _keys(roadmap):
+    return [module["key"] for module in roadmap.content["modules"]]
+
+
+class AssignModuleKeysTests(TestCase):
+    def test_tagged_modules_get_skill_keys_and_the_rest_are_numbered(self):
+        content = {"modules": [{"title": "Basics"}, {"title": "Queries", "skill": " sql "}, {"title": "More"}]}
+        assign_module_keys(content, ["SQL"])
+        self.assertEqual([m["key"] for m in content["modules"]], ["core:0", "skill:sql", "core:1"])
+        self.assertEqual(content["modules"][1]["skill"], "SQL")
+
+    def test_existing_keys_are_kept_and_never_reused(self):
+        content = {"modules": [{"title": "Old", "key": "core:0"}, {"title": "New"}]}
+        assign_module_keys(content, [])
+        self.assertEqual([m["key"] for m in content["modules"]], ["core:0", "core:1"])
+
+    def test_untargeted_and_repeated_skill_tags_become_core_modules(self):
+        content = {"modules": [{"title": "A", "skill": "SQL"}, {"title": "B", "skill": "sql"},
+                               {"title": "C", "skill": "Docker"}]}
+        assign_module_keys(content, ["SQL"])
+        self.assertEqual([m["key"] for m in content["modules"]], ["skill:sql", "core:0", "core:1"])
+        self.assertNotIn("skill", content["modules"][2])
+
+
+@override_settings(AI_PROVIDER_ORDER=["stub"], PREWARM_ENABLED=False, RATELIMIT_ENABLED=False, SESSION_GC_INTERVAL=0)
+class UpdateRoadmapTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("learner")
+        # Mid level (3-4 years)
+        self.roadmap = create_roadmap(self.user, JOB_ROLE, 3, ["SQL", "Docker"])
+
+    def test_every_target_skill_gets_a_module(self):
+        self.assertEqual(_keys(self.roadmap)[-2:], ["skill:sql", "skill:docker"])
+        self.assertEqual(len(set(_keys(self.roadmap))), len(_keys(self.roadmap)))
+
+    def test_years_within_the_same_level_regenerate_nothing(self):
+        before = self.roadmap.content["modules"]
+        stats = _stats()
+        roadmap, created = update_roadmap(self.user, JOB_ROLE, 4, ["SQL", "Docker"], stats=stats)
+        self.assertFalse(created)
+        self.assertEqual(roadmap.pk, self.roadmap.pk)
+        self.assertEqual(stats, _stats())
+        self.assertEqual(roadmap.content["modules"], before)
+        self.assertEqual(roadmap.experience_years, 4)
+
+    def test_added_skill_gets_one_module_and_removed_skill_loses_its_module(self):
+        before = {module["key"]: module for module in self.roadmap.content["modules"]}
+        stats = _stats()
+        roadmap, created = update_roadmap(self.user, JOB_ROLE.lower(), 3, ["SQL", "Kafka"], stats=stats)
+        self.assertFalse(created)
+        self.assertEqual(_keys(roadmap)[-2:], ["skill:sql", "skill:kafka"])
+        self.assertNotIn("skill:docker", _keys(roadmap))
+        self.assertEqual(stats["completions"] + stats["single_calls"], 1)
+        for module in roadmap.content["modules"]:
+            if module["key"] in before:
+                self.assertEqual(module, before[module["key"]])
+        self.assertEqual(Roadmap.objects.filter(user=self.user).count(), 1)
+
+    def test_removing_a_completed_skill_keeps_its_module(self):
+        self.assertTrue(set_module_completed(self.roadmap, "skill:docker"))
+        roadmap, created = update_roadmap(self.user, JOB_ROLE, 3, ["SQL"])
+        self.assertIn("skill:docker", _keys(roadmap))
+        self.assertEqual(roadmap.completed_modules, ["skill:docker"])
+
+    def test_level_change_rewrites_only_modules_that_are_not_completed(self):
+        completed = self.roadmap.content["modules"][0]
+        completed["title"] = "Finished module"
+        self.roadmap.save()
+        set_module_completed(self.roadmap, completed["key"])
+
+        stats = _stats()
+        roadmap, created = update_roadmap(self.user, JOB_ROLE, 8, ["SQL", "Docker"], stats=stats)
+        self.assertEqual(_keys(roadmap), _keys(self.roadmap))
+        self.assertEqual(roadmap.content["modules"][0], completed)
+        self.assertEqual(roadmap.completed_modules, [completed["key"]])
+        self.assertNotEqual(roadmap.content["modules"][1], self.roadmap.content["modules"][1])
+        # Rewritten in batches, not one prompt per module
+        self.assertLess(stats["completions"] + stats["single_calls"], len(_keys(roadmap)) - 1)
+
+    def test_level_change_without_completed_modules_regenerates_the_whole_roadmap(self):
+        self.roadmap.content["modules"][0]["title"] = "Stale module"
+        self.roadmap.save()
+        roadmap, created = update_roadmap(self.user, JOB_ROLE, 8, ["SQL", "Docker"])
+        self.assertFalse(created)
+        self.assertNotEqual(roadmap.content["modules"][0]["title"], "Stale module")
+        self.assertEqual(_keys(roadmap)[-2:], ["skill:sql", "skill:docker"])
+
+    def test_other_roles_get_a_new_roadmap(self):
+        roadmap, created = update_roadmap(self.user, "Data Engineer", 3, ["SQL"])
+        self.assertTrue(created)
+        self.assertEqual(Roadmap.objects.filter(user=self.user).count(), 2)
+
+    def test_roadmaps_stored_without_keys_get_them_on_update(self):
+        for module in self.roadmap.content["modules"]:
+            module.pop("key")
+            module.pop("skill", None)
+        self.roadmap.save()
+        roadmap, created = update_roadmap(self.user, JOB_ROLE, 3, ["SQL", "Docker"])
+        self.assertTrue(all(_keys(roadmap)))
+        self.assertEqual(len(set(_keys(roadmap))), len(_keys(roadmap)))
+
+
+@override_settings(AI_PROVIDER_ORDER=["stub"], PREWARM_ENABLED=False, RATELIMIT_ENABLED=False,
+                   SESSION_GC_INTERVAL=0)
+class ModuleCompletionTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("learner", password="x")
+        self.roadmap = create_roadmap(self.user, JOB_ROLE, 3, ["SQL"])
+
+    def test_set_module_completed(self):
+        self.assertTrue(set_module_completed(self.roadmap, "core:1"))
+        self.assertTrue(set_module_completed(self.roadmap, "core:1"))
+        self.assertEqual(self.roadmap.completed_modules, ["core:1"])
+        self.assertTrue(set_module_completed(self.roadmap, "core:1", completed=False))
+        self.assertEqual(self.roadmap.completed_modules, [])
+        self.assertFalse(set_module_completed(self.roadmap, "core:99"))
+
+    def test_complete_module_view_only_changes_the_users_own_roadmaps(self):
+        url = reverse("roadmap:complete_module", args=[self.roadmap.pk])
+        self.client.force_login(self.user)
+        response = self.client.post(url, {"key": "skill:sql", "completed": "1"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["completed_modules"], ["skill:sql"])
+        self.assertEqual(self.client.post(url, {"key": "nope"}).status_code, 404)
+
+        other = User.objects.create_user("other")
+        self.client.force_login(other)
+        self.assertEqual(self.client.post(url, {"key": "skill:sql", "completed": "0"}).status_code, 404)
+        self.roadmap.refresh_from_db()
+        self.assertEqual(self.roadmap.completed_modules, ["skill:sql"])
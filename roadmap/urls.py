@@ -5,4 +5,7 @@ app_name = 'roadmap'
 
 urlpatterns = [
     path('', views.home, name='home'),
+    path('<int:pk>/complete/', views.complete_module, name='complete_module'),
+    path('<int:pk>/export/<slug:fmt>/', views.export_report, name='export_report'),
+    path('<int:pk>/report/<slug:digest>.<slug:fmt>', views.download_report, name='download_report'),
 ]
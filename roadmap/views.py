@@ -1,8 +1,15 @@
-from django.shortcuts import render
+from django.shortcuts import render, get_object_or_404
 from django.contrib.auth.decorators import login_required
-from core.ai_utils import generate_learning_roadmap
+from django.http import Http404, JsonResponse
+from django.urls import reverse
+from django.views.decorators.http import require_POST
+from core.ratelimit import ai_rate_limit
+from core.reports import FORMATS, report_response, request_report
+from .models import Roadmap
+from .services import set_module_completed, update_roadmap
 
 @login_required
+@ai_rate_limit("roadmap", methods=("POST",))
 def home(request):
     # Get user profile to personalize roadmap
     profile = request.user.profile if hasattr(request.user, 'profile') else None
@@ -12,28 +19,67 @@ def home(request):
     experience_years = profile.experience_years if profile else 0
     
     if request.method == 'POST':
-        # Generate roadmap only when user submits the form
+        # Generate or update the roadmap only when user submits the form
         job_role = request.POST.get('job_role', job_role)
         experience_years = int(request.POST.get('experience_years', experience_years))
-        target_skills = request.POST.getlist('target_skills', [])
+        # Skills come as repeated fields or comma-separated in one field
+        target_skills = [
+            skill for value in request.POST.getlist('target_skills', []) for skill in value.split(',')
+        ]
         
-        roadmap = generate_learning_roadmap(
+        # Only the modules the change affects are regenerated
+        roadmap, created = update_roadmap(
+            user=request.user,
             job_role=job_role,
             experience_years=experience_years,
-            target_skills=target_skills if target_skills else None
+            target_skills=target_skills
         )
-        
-        context = {
-            'roadmap': roadmap,
-            'job_role': job_role,
-            'generated': True
-        }
+        generated = True
     else:
-        # On initial page load, don't generate roadmap - show form only
-        context = {
-            'roadmap': None,
-            'job_role': job_role,
-            'generated': False
-        }
+        # On page load, show the latest roadmap without generating anything
+        roadmap = Roadmap.objects.filter(user=request.user).order_by('-updated_at').first()
+        generated = False
+        if roadmap is not None:
+            job_role = roadmap.job_role
+            experience_years = roadmap.experience_years
+    
+    context = {
+        'roadmap': roadmap.content if roadmap else None,
+        'roadmap_id': roadmap.pk if roadmap else None,
+        'completed_modules': roadmap.completed_modules if roadmap else [],
+        'target_skills': ', '.join(roadmap.target_skills) if roadmap else '',
+        'job_role': job_role,
+        'experience_years': experience_years,
+        'generated': generated
+    }
     
     return render(request, "roadmap/home.html", context)
+
+@login_required
+@require_POST
+def complete_module(request, pk):
+    """Mark a module of one of the user's roadmaps as completed (completed=1) or not (completed=0)"""
+    roadmap = get_object_or_404(Roadmap, pk=pk, user=request.user)
+    completed = request.POST.get('completed', '1') == '1'
+    if not set_module_completed(roadmap, request.POST.get('key', ''), completed):
+        return JsonResponse({'error': 'No such module'}, status=404)
+    return JsonResponse({'completed': completed, 'completed_modules': roadmap.completed_modules})
+
+@login_required
+def export_report(request, pk, fmt):
+    """Find or start rendering a roadmap's report; the page polls until it is ready"""
+    if fmt not in FORMATS:
+        raise Http404("Unknown format")
+    roadmap = get_object_or_404(Roadmap, pk=pk, user=request.user)
+    digest, status = request_report('roadmap', roadmap, fmt)
+    if status == 'failed':
+        return JsonResponse({'status': status, 'error': 'The report could not be rendered. Please try again in a minute.'},
+                            status=500)
+    url = reverse('roadmap:download_report', args=[pk, digest, fmt])
+    return JsonResponse({'status': status, 'url': url}, status=200 if status == 'ready' else 202)
+
+@login_required
+def download_report(request, pk, digest, fmt):
+    """Stream a rendered roadmap report"""
+    roadmap = get_object_or_404(Roadmap, pk=pk, user=request.user)
+    return report_response(request, 'roadmap', roadmap, digest, fmt, f"roadmap-{pk}")
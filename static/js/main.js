@@ -12,6 +12,13 @@ document.addEventListener('DOMContentLoaded', function() {
     
     // Initialize form validation
     initializeFormValidation();
+    
+    // Initialize single-page interview mode
+    initializeInterviewMode();
+    initializeSinglePageInterview();
+    
+    // Initialize report download buttons
+    initializeReportDownloads();
 });
 
 // Message dismissal functionality
@@ -136,7 +143,7 @@ function initializeFormValidation() {
 }
 
 // Show form error message
-function showFormError(message) {
+function showFormError(message, form = document.querySelector('form')) {
     const existingError = document.querySelector('.form-error-message');
     if (existingError) {
         existingError.remove();
@@ -146,12 +153,184 @@ function showFormError(message) {
     errorDiv.className = 'form-error-message error-message';
     errorDiv.textContent = message;
     
-    const form = document.querySelector('form');
     if (form) {
         form.insertBefore(errorDiv, form.firstChild);
     }
 }
 
+// Ask the simulate view for the single-page interview when JavaScript is available
+function initializeInterviewMode() {
+    document.querySelectorAll('input[name="interview_mode"]').forEach(input => {
+        input.value = 'single';
+    });
+}
+
+// Single-page interview: step through questions locally and submit all answers at once
+function initializeSinglePageInterview() {
+    const form = document.querySelector('.single-page-interview');
+    if (!form) {
+        return;
+    }
+    
+    const steps = Array.from(form.querySelectorAll('.question-step'));
+    const textareas = steps.map(step => step.querySelector('textarea'));
+    const prevButton = form.querySelector('.step-prev');
+    const nextButton = form.querySelector('.step-next');
+    const submitButton = form.querySelector('.step-submit');
+    const currentLabel = document.querySelector('.progress-text .current');
+    const progressBar = document.querySelector('.progress-bar');
+    const draftKey = form.dataset.draftKey;
+    let current = 0;
+    
+    // Restore drafts saved by an earlier visit to this interview
+    let drafts = [];
+    try {
+        drafts = JSON.parse(localStorage.getItem(draftKey)) || [];
+    } catch (e) {
+        drafts = [];
+    }
+    
+    function saveDrafts() {
+        try {
+            localStorage.setItem(draftKey, JSON.stringify(textareas.map(t => t.value)));
+        } catch (e) {
+            // Storage may be full or disabled; drafts are a convenience only
+        }
+    }
+    
+    function updateCount(textarea) {
+        const counter = textarea.closest('.question-step').querySelector('.char-count');
+        counter.textContent = textarea.value.length + ' characters';
+    }
+    
+    function showStep(index) {
+        current = index;
+        steps.forEach((step, i) => {
+            step.hidden = i !== index;
+        });
+        prevButton.hidden = index === 0;
+        nextButton.hidden = index === steps.length - 1;
+        submitButton.hidden = index !== steps.length - 1;
+        if (currentLabel) {
+            currentLabel.textContent = 'Question ' + (index + 1);
+        }
+        if (progressBar) {
+            progressBar.style.width = ((index + 1) / steps.length * 100) + '%';
+        }
+        textareas[index].focus();
+    }
+    
+    textareas.forEach((textarea, i) => {
+        if (drafts[i]) {
+            textarea.value = drafts[i];
+        }
+        updateCount(textarea);
+        textarea.addEventListener('input', function() {
+            updateCount(textarea);
+            saveDrafts();
+        });
+    });
+    
+    prevButton.addEventListener('click', () => showStep(current - 1));
+    nextButton.addEventListener('click', () => showStep(current + 1));
+    
+    form.addEventListener('submit', function(event) {
+        event.preventDefault();
+        
+        fetch(form.action, {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+                'X-CSRFToken': form.querySelector('[name="csrfmiddlewaretoken"]').value
+            },
+            body: JSON.stringify({ answers: textareas.map(t => t.value) })
+        })
+            .then(response => {
+                if (response.ok) {
+                    return response.json().then(data => {
+                        localStorage.removeItem(draftKey);
+                        window.location.href = data.redirect;
+                    });
+                }
+                // The server rejected the answers (or rate limited us): say why and let the
+                // user try again. Validation errors are JSON, rate limits are plain text.
+                return response.text().then(text => {
+                    let message = text;
+                    try {
+                        message = JSON.parse(text).error || message;
+                    } catch (e) {
+                        // Not JSON, keep the text
+                    }
+                    showFormError(message || 'Could not submit answers.', form);
+                    submitButton.disabled = false;
+                    if (submitButton.hasAttribute('data-original-text')) {
+                        submitButton.innerHTML = submitButton.getAttribute('data-original-text');
+                    }
+                });
+            })
+            .catch(() => {
+                // Network or parse failure: fall back to a regular form post of the same answers
+                form.submit();
+            });
+    });
+    
+    showStep(0);
+}
+
+// Report downloads: buttons carry their export URL in data-report-url
+function initializeReportDownloads() {
+    document.querySelectorAll('[data-report-url]').forEach(button => {
+        button.addEventListener('click', () => downloadReport(button));
+    });
+}
+
+function downloadReport(button) {
+    // Reports are rendered in the background; poll until the file is ready,
+    // backing off from 1 to 5 seconds and giving up after about two minutes
+    const label = button.textContent;
+    const error = button.parentElement.querySelector('.download-error');
+    let delay = 1000;
+    let polls = 0;
+    button.disabled = true;
+    button.textContent = 'Preparing…';
+    error.hidden = true;
+    
+    function stop(message) {
+        button.disabled = false;
+        button.textContent = label;
+        if (message) {
+            error.textContent = message;
+            error.hidden = false;
+        }
+    }
+    
+    function poll() {
+        polls += 1;
+        fetch(button.dataset.reportUrl)
+            .then(response => response.json().then(data => {
+                if (response.status === 202) {
+                    if (polls >= 30) {
+                        stop('The report is taking longer than usual. Please try again shortly.');
+                        return;
+                    }
+                    setTimeout(poll, delay);
+                    delay = Math.min(delay * 1.5, 5000);
+                    return;
+                }
+                if (response.ok) {
+                    stop();
+                    window.location = data.url;
+                } else {
+                    stop(data.error || 'The report could not be prepared.');
+                }
+            }))
+            .catch(() => {
+                stop('The report could not be prepared. Please check your connection and try again.');
+            });
+    }
+    poll();
+}
+
 // Progress bar animation
 function animateProgressBars() {
     const progressBars = document.querySelectorAll('.progress-fill');